@@ -6,7 +6,7 @@ from django import forms
 from django.contrib.auth import get_user_model
 from django.utils.translation import ugettext_lazy as _
 
-FIELDS = ['first_name', 'last_name', 'email', 'institution', 'username', ]
+FIELDS = ['first_name', 'last_name', 'email', 'institution', 'username', 'notification_preference', ]
 
 WIDGETS = {
             'first_name': forms.TextInput(
@@ -24,6 +24,9 @@ WIDGETS = {
             'username': forms.TextInput(
                 attrs={'class': "form-control", 'tabindex': '5', 'readonly': True, },
             ),
+            'notification_preference': forms.Select(
+                attrs={'class': "form-control", 'tabindex': '6'},
+            ),
         }
 
 LABELS = {
@@ -32,6 +35,7 @@ LABELS = {
     'email': _('Email'),
     'institution': _('Institution'),
     'username': _('Username'),
+    'notification_preference': _('Finished job notifications'),
 }
 
 
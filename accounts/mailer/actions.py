@@ -9,7 +9,7 @@ from . import templates, email
 
 def email_verify_request(to_addresses, first_name, last_name, link):
     """
-    Sends out the email address verification email
+    Queues the email address verification email
     :param to_addresses: A list of addresses, in this case the user
     :param first_name: String
     :param last_name: String
@@ -30,4 +30,4 @@ def email_verify_request(to_addresses, first_name, last_name, link):
         to_addresses=to_addresses,
         template=templates.VERIFY_EMAIL_ADDRESS['message'],
         context=context,
-    ).send_email()
+    ).queue_email()
@@ -2,6 +2,9 @@
 Distributed under the MIT License. See LICENSE.txt for more info.
 """
 
+import json
+from functools import lru_cache
+
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
 from django.template import Template
@@ -9,17 +12,66 @@ from django.template.context import Context
 from django.utils.html import strip_tags
 from django.utils.safestring import mark_safe
 
+from ..models import OutboxEmail
+
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Most compiled email templates kept in the process
+COMPILED_TEMPLATE_CACHE_SIZE = 64
+
+
+class CompiledTemplate:
+    """
+    Class holding an email template compiled once, along with its plain text variant
+    """
+
+    def __init__(self, template):
+        """
+        Compiles a template
+        :param template: A template of the email body
+        """
+        self.html_template = Template(template)
+
+        # the tags are stripped from the template rather than from every rendered email
+        self.text_template = Template(strip_tags(template))
+
+    def render(self, context):
+        """
+        Renders the template
+        :param context: A dictionary to render the template variables
+        :return: tuple of the html content and the plain text content
+        """
+        context = Context(context)
+        return self.html_template.render(context), mark_safe(self.text_template.render(context))
+
+    def render_many(self, contexts):
+        """
+        Renders the template for several contexts, for batch and digest emails
+        :param contexts: A list of dictionaries to render the template variables
+        :return: list of tuples of the html content and the plain text content
+        """
+        return [self.render(context) for context in contexts]
+
+
+@lru_cache(maxsize=COMPILED_TEMPLATE_CACHE_SIZE)
+def get_compiled_template(template):
+    """
+    Finds the compiled template of a template, compiling it the first time it is used in the process
+    :param template: A template of the email body
+    :return: CompiledTemplate instance
+    """
+    return CompiledTemplate(template)
+
 
 class Email:
     """
     Class for sending emails
     """
 
-    def __init__(self, subject, to_addresses, template, context=None, from_address=None, cc=None, bcc=None):
+    def __init__(self, subject, to_addresses, template, context=None, from_address=None, cc=None, bcc=None,
+                 text_content=None):
         """
         Initializes an Email object
         :param subject: Subject of the email
@@ -29,22 +81,59 @@ class Email:
         :param from_address: Sender of the email (email address)
         :param cc: A list of email addresses
         :param bcc: A list of email addresses
+        :param text_content: Plain text variant of a template that is already rendered, None to strip its tags
         """
         self.subject = subject
         self.to_addresses = to_addresses
 
         if type(context) == dict:
-            context = Context(context)
-            self.html_content = Template(template).render(context)
+            self.html_content, self.text_content = get_compiled_template(template).render(context)
         else:
             self.html_content = template
-
-        self.text_content = mark_safe(strip_tags(self.html_content))
+            self.text_content = text_content if text_content is not None else mark_safe(strip_tags(template))
 
         self.from_address = settings.EMAIL_FROM if not from_address else from_address
         self.cc = cc
         self.bcc = bcc
 
+    @classmethod
+    def from_contexts(cls, template, messages, from_address=None):
+        """
+        Builds several emails of the same template, rendering the compiled template for every context
+        :param template: A template of the email body
+        :param messages: A list of (subject, to_addresses, context) tuples, one per email
+        :param from_address: Sender of the emails (email address)
+        :return: list of Email instances
+        """
+        contents = get_compiled_template(template).render_many([context for _, _, context in messages])
+
+        return [
+            cls(subject, to_addresses, html_content, from_address=from_address, text_content=text_content)
+            for (subject, to_addresses, _), (html_content, text_content) in zip(messages, contents)
+        ]
+
+    def as_outbox_email(self):
+        """
+        Builds the outbox entry of the email, without saving it
+        :return: OutboxEmail instance
+        """
+        return OutboxEmail(
+            subject=self.subject,
+            from_address=self.from_address,
+            to_addresses=json.dumps(self.to_addresses),
+            cc=json.dumps(self.cc) if self.cc else None,
+            bcc=json.dumps(self.bcc) if self.bcc else None,
+            text_content=self.text_content,
+            html_content=self.html_content,
+        )
+
+    def queue_email(self):
+        """
+        Queues the email in the outbox, it is sent by the email worker once the current transaction is committed
+        :return: Nothing
+        """
+        self.as_outbox_email().save()
+
     def send_email(self):
         """
         Sends the actual email
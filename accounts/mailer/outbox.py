@@ -0,0 +1,171 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import json
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils import timezone
+
+from ..models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+# Emails sent over one connection to the mail server.
+# This can be overridden using EMAIL_BATCH_SIZE in the settings.
+EMAIL_BATCH_SIZE = 50
+
+# Most emails sent in a minute, so that the mail server does not throttle the site.
+# This can be overridden using EMAIL_RATE_LIMIT in the settings.
+EMAIL_RATE_LIMIT = 120
+
+# Attempts at sending an email before it is given up, and the seconds waited after the first failed attempt, doubled
+# after every further failed attempt up to the maximum.
+# These can be overridden using EMAIL_MAXIMUM_ATTEMPTS, EMAIL_RETRY_DELAY and EMAIL_MAXIMUM_RETRY_DELAY in the
+# settings.
+EMAIL_MAXIMUM_ATTEMPTS = 8
+EMAIL_RETRY_DELAY = 60
+EMAIL_MAXIMUM_RETRY_DELAY = 60 * 60
+
+# Seconds a worker has to send the emails it has claimed before another worker can claim them
+EMAIL_CLAIM_TIMEOUT = 60 * 10
+
+
+def get_outbox_setting(name, default):
+    """
+    Finds a setting of the outbox
+    :param name: name of the setting
+    :param default: value if the setting is not set
+    :return: the value of the setting
+    """
+    try:
+        return getattr(settings, name)
+    except AttributeError:
+        return default
+
+
+def get_retry_delay(attempt_count):
+    """
+    Finds the seconds to wait before the next attempt, doubling after every failed attempt
+    :param attempt_count: number of failed attempts so far
+    :return: delay in seconds
+    """
+    delay = get_outbox_setting('EMAIL_RETRY_DELAY', EMAIL_RETRY_DELAY) * 2 ** (attempt_count - 1)
+    return min(delay, get_outbox_setting('EMAIL_MAXIMUM_RETRY_DELAY', EMAIL_MAXIMUM_RETRY_DELAY))
+
+
+def get_message(outbox_email, connection):
+    """
+    Builds the message of a queued email
+    :param outbox_email: instance of OutboxEmail
+    :param connection: connection to the mail server the message is sent over
+    :return: EmailMultiAlternatives instance
+    """
+    message = EmailMultiAlternatives(
+        subject=outbox_email.subject,
+        body=outbox_email.text_content,
+        from_email=outbox_email.from_address,
+        to=json.loads(outbox_email.to_addresses),
+        bcc=json.loads(outbox_email.bcc) if outbox_email.bcc else None,
+        cc=json.loads(outbox_email.cc) if outbox_email.cc else None,
+        reply_to=[outbox_email.from_address, ],
+        connection=connection,
+    )
+
+    # set the email as an HTML email
+    message.attach_alternative(outbox_email.html_content, 'text/html')
+
+    return message
+
+
+def claim_outbox_emails(limit):
+    """
+    Claims the queued emails that are due, oldest first, so that no other worker sends them
+    :param limit: most emails to claim
+    :return: list of the claimed OutboxEmail instances
+    """
+    now = timezone.now()
+    claim = uuid.uuid4().hex
+
+    due = OutboxEmail.objects.filter(sent_time__isnull=True, next_attempt_time__lte=now) \
+        .order_by('next_attempt_time', 'id') \
+        .values_list('id', flat=True)[:limit]
+
+    # the attempt time is pushed back, so that the emails are claimed again if this worker dies while sending them
+    OutboxEmail.objects.filter(
+        id__in=list(due),
+        sent_time__isnull=True,
+        next_attempt_time__lte=now,
+    ).update(
+        claim=claim,
+        next_attempt_time=now + timedelta(seconds=EMAIL_CLAIM_TIMEOUT),
+    )
+
+    return list(OutboxEmail.objects.filter(claim=claim, sent_time__isnull=True).order_by('id'))
+
+
+def record_failure(outbox_email, error):
+    """
+    Records a failed attempt at sending an email, the email is retried later unless it has run out of attempts
+    :param outbox_email: instance of OutboxEmail
+    :param error: the error raised by the mail server
+    :return: Nothing
+    """
+    logger.info("Unable to send email {}: {}".format(outbox_email.id, error))
+
+    outbox_email.attempt_count += 1
+    outbox_email.claim = None
+    outbox_email.last_error = str(error) or error.__class__.__name__
+
+    if outbox_email.attempt_count >= get_outbox_setting('EMAIL_MAXIMUM_ATTEMPTS', EMAIL_MAXIMUM_ATTEMPTS):
+        outbox_email.sent_time = timezone.now()
+        outbox_email.failed = True
+    else:
+        outbox_email.next_attempt_time = timezone.now() + timedelta(
+            seconds=get_retry_delay(outbox_email.attempt_count)
+        )
+
+    outbox_email.save()
+
+
+def drain_outbox(limit=None):
+    """
+    Sends a batch of the queued emails that are due over a single connection to the mail server
+    :param limit: most emails to send, None for the batch size
+    :return: the number of emails attempted
+    """
+    batch_size = get_outbox_setting('EMAIL_BATCH_SIZE', EMAIL_BATCH_SIZE)
+    outbox_emails = claim_outbox_emails(batch_size if limit is None else min(limit, batch_size))
+    if not outbox_emails:
+        return 0
+
+    try:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+    except Exception as e:
+        # the mail server is not reachable, none of the emails can be sent
+        for outbox_email in outbox_emails:
+            record_failure(outbox_email, e)
+        return len(outbox_emails)
+
+    try:
+        for outbox_email in outbox_emails:
+            # every email is sent on its own, so that a rejected address does not fail the rest of the batch
+            try:
+                connection.send_messages([get_message(outbox_email, connection)])
+            except Exception as e:
+                record_failure(outbox_email, e)
+                continue
+
+            outbox_email.attempt_count += 1
+            outbox_email.claim = None
+            outbox_email.sent_time = timezone.now()
+            outbox_email.save()
+    finally:
+        connection.close()
+
+    return len(outbox_emails)
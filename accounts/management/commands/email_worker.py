@@ -0,0 +1,36 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...mailer.outbox import EMAIL_RATE_LIMIT, drain_outbox, get_outbox_setting
+
+# Seconds the worker sleeps when there is nothing to send
+POLL_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = 'Sends the queued emails, retrying the failed ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the outbox once and exit')
+
+    def handle(self, *args, **options):
+        rate_limit = get_outbox_setting('EMAIL_RATE_LIMIT', EMAIL_RATE_LIMIT)
+
+        while True:
+            start_time = time.monotonic()
+            attempted = drain_outbox(limit=rate_limit)
+
+            if options['once']:
+                break
+
+            if not attempted:
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            # no more than the rate limit in a minute, however fast the mail server is
+            time.sleep(max(attempted * 60 / rate_limit - (time.monotonic() - start_time), 0))
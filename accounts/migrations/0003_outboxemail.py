@@ -0,0 +1,38 @@
+# Generated by Django 2.1.5 on 2018-11-26 14:02
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_verification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255)),
+                ('from_address', models.CharField(max_length=255)),
+                ('to_addresses', models.TextField()),
+                ('cc', models.TextField(blank=True, null=True)),
+                ('bcc', models.TextField(blank=True, null=True)),
+                ('text_content', models.TextField()),
+                ('html_content', models.TextField()),
+                ('creation_time', models.DateTimeField(auto_now_add=True)),
+                ('next_attempt_time', models.DateTimeField(default=django.utils.timezone.now)),
+                ('claim', models.CharField(blank=True, max_length=32, null=True)),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('sent_time', models.DateTimeField(blank=True, null=True)),
+                ('failed', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='outboxemail',
+            index=models.Index(fields=['sent_time', 'next_attempt_time'], name='accounts_ou_sent_ti_838105_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1.5 on 2018-11-27 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='notification_preference',
+            field=models.CharField(choices=[('Immediate', 'An email for every job'), ('Hourly', 'An hourly digest'), ('Daily', 'A daily digest'), ('Campaign', 'A digest for every campaign')], default='Immediate', max_length=10),
+        ),
+    ]
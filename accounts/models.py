@@ -2,9 +2,11 @@
 Distributed under the MIT License. See LICENSE.txt for more info.
 """
 
+import json
 import uuid
 
 from django.db import models
+from django.utils import timezone
 
 from django.contrib.auth.models import AbstractUser
 
@@ -38,6 +40,20 @@ class User(AbstractUser):
     ]
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, blank=False, default=UNVERIFIED)
 
+    # how the user is notified of the jobs that finish
+    IMMEDIATE = 'Immediate'
+    HOURLY = 'Hourly'
+    DAILY = 'Daily'
+    CAMPAIGN = 'Campaign'
+    NOTIFICATION_CHOICES = [
+        (IMMEDIATE, 'An email for every job'),
+        (HOURLY, 'An hourly digest'),
+        (DAILY, 'A daily digest'),
+        (CAMPAIGN, 'A digest for every campaign'),
+    ]
+    notification_preference = models.CharField(max_length=10, choices=NOTIFICATION_CHOICES, blank=False,
+                                               default=IMMEDIATE)
+
     def is_admin(self):
         """
         Checks whether a user is an admin or not
@@ -78,3 +94,43 @@ class Verification(models.Model):
 
     def __str__(self):
         return u'%s' % self.information
+
+
+class OutboxEmail(models.Model):
+    """
+    Model to queue an outgoing email, written in the same transaction as the change it is about and sent by the email
+    worker
+    """
+    subject = models.CharField(max_length=255)
+    from_address = models.CharField(max_length=255)
+
+    # json lists of email addresses
+    to_addresses = models.TextField()
+    cc = models.TextField(null=True, blank=True)
+    bcc = models.TextField(null=True, blank=True)
+
+    text_content = models.TextField()
+    html_content = models.TextField()
+
+    creation_time = models.DateTimeField(auto_now_add=True)
+
+    # the email is not attempted before this, it is pushed back after every failed attempt
+    next_attempt_time = models.DateTimeField(default=timezone.now)
+
+    # set by the worker that is sending the email, so that two workers do not send the same email
+    claim = models.CharField(max_length=32, null=True, blank=True)
+
+    attempt_count = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+
+    # set once the email has been sent, or once it has run out of attempts
+    sent_time = models.DateTimeField(null=True, blank=True)
+    failed = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['sent_time', 'next_attempt_time']),
+        ]
+
+    def __str__(self):
+        return u'%s (%s)' % (self.subject, ', '.join(json.loads(self.to_addresses)))
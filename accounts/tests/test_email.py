@@ -5,7 +5,7 @@ Distributed under the MIT License. See LICENSE.txt for more info.
 from django.test import TestCase
 from django.core import mail
 
-from ..mailer.email import Email
+from ..mailer.email import Email, get_compiled_template
 
 
 class TestEmail(TestCase):
@@ -28,3 +28,26 @@ class TestEmail(TestCase):
         email = Email(subject, to_addresses, template, context, from_address=from_address)
         email.send_email()
         self.assertEqual([(x.to, x.body) for x in mail.outbox], [(['testto@localhost.com', ], 'hi,This is message')])
+
+    def test_compiled_template(self):
+        """
+        tests whether a template is compiled once and renders the same content as an email
+        :return: Nothing
+        """
+        template = '<p>hi,</p><p>This is {{message}}</p>'
+        self.assertIs(get_compiled_template(template), get_compiled_template(template))
+
+        contents = get_compiled_template(template).render_many([{'message': 'one'}, {'message': 'two'}])
+        self.assertEqual(contents, [
+            ('<p>hi,</p><p>This is one</p>', 'hi,This is one'),
+            ('<p>hi,</p><p>This is two</p>', 'hi,This is two'),
+        ])
+
+        emails = Email.from_contexts(template, [
+            ('Subject One', ['one@localhost.com'], {'message': 'one'}),
+            ('Subject Two', ['two@localhost.com'], {'message': 'two'}),
+        ], from_address='testfrom@localhost.com')
+        self.assertEqual([(x.subject, x.to_addresses, x.text_content) for x in emails], [
+            ('Subject One', ['one@localhost.com'], 'hi,This is one'),
+            ('Subject Two', ['two@localhost.com'], 'hi,This is two'),
+        ])
@@ -0,0 +1,53 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django.test import TestCase, override_settings
+from django.core import mail
+
+from ..mailer.email import Email
+from ..mailer.outbox import EMAIL_RETRY_DELAY, drain_outbox
+from ..models import OutboxEmail
+
+
+class TestOutbox(TestCase):
+    """
+    Class to test queueing and sending emails through the outbox
+    """
+
+    def setUp(self):
+        Email('Test Subject', ['testto@localhost.com'], '<p>This is {{message}}</p>', {'message': 'message'},
+              from_address='testfrom@localhost.com').queue_email()
+
+    def test_drain(self):
+        """
+        tests whether a queued email is sent once by the worker
+        :return: Nothing
+        """
+        # nothing is sent until the outbox is drained
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(drain_outbox(), 1)
+        self.assertEqual([(x.to, x.body) for x in mail.outbox], [(['testto@localhost.com', ], 'This is message')])
+        self.assertNotEqual(OutboxEmail.objects.get().sent_time, None)
+
+        # a sent email is not sent again
+        self.assertEqual(drain_outbox(), 0)
+        self.assertEqual(len(mail.outbox), 1)
+
+    @override_settings(EMAIL_BACKEND='accounts.tests.missing.EmailBackend')
+    def test_retry(self):
+        """
+        tests whether an email is retried later if the mail server can not be reached
+        :return: Nothing
+        """
+        self.assertEqual(drain_outbox(), 1)
+
+        outbox_email = OutboxEmail.objects.get()
+        self.assertEqual(outbox_email.sent_time, None)
+        self.assertEqual(outbox_email.attempt_count, 1)
+        self.assertGreater((outbox_email.next_attempt_time - outbox_email.creation_time).total_seconds(),
+                           EMAIL_RETRY_DELAY - 1)
+
+        # not due yet
+        self.assertEqual(drain_outbox(), 0)
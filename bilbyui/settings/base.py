@@ -127,6 +127,9 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, "../accounts/static/"),
 ]
 
+# Local store of the posterior samples fetched from the clusters
+POSTERIOR_SAMPLES_DIR = os.path.join(BASE_DIR, '../posterior_samples/')
+
 EMAIL_FROM = 'ssaleheen@swin.edu.au'
 
 PASSWORD_RESET_TIMEOUT_DAYS = 1
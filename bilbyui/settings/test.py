@@ -8,5 +8,7 @@ DATABASES = {
 
 TEST_OUTPUT_DIR = os.path.join(BASE_DIR, '..', 'test_output')
 
+POSTERIOR_SAMPLES_DIR = os.path.join(TEST_OUTPUT_DIR, 'posterior_samples')
+
 LOGGING['loggers']['django']['handlers'] = ['file']
 LOGGING['loggers']['bilbyweb']['handlers'] = ['file']
@@ -13,6 +13,7 @@ from .models import (
     Prior,
     Sampler,
     SamplerParameter,
+    SubmissionPriority,
 )
 
 
@@ -99,3 +100,9 @@ class SamplerParameter(admin.ModelAdmin):
 
     get_sampler.admin_order_field = 'sampler'  # Allows column order sorting
     get_sampler.short_description = 'sampler'  # Renames column head
+
+
+@admin.register(SubmissionPriority)
+class SubmissionPriority(admin.ModelAdmin):
+    list_display = ('user', 'weight', 'maximum_active_jobs',)
+    search_fields = ['user__username', 'user__first_name', 'user__last_name', ]
@@ -0,0 +1,142 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django import forms
+from django.utils.translation import ugettext_lazy as _
+
+from ..models import Campaign, Job, SignalParameter
+from ..utility.display_names import (
+    GRID,
+    GRID_DISPLAY,
+    UNIFORM,
+    UNIFORM_DISPLAY,
+)
+
+DISTRIBUTION_CHOICES = [
+    (GRID, GRID_DISPLAY),
+    (UNIFORM, UNIFORM_DISPLAY),
+]
+
+# Number of injection parameters that can be swept at once
+SWEEP_PARAMETER_COUNT = 3
+
+
+class CampaignForm(forms.Form):
+    """
+    Names a parameter sweep campaign and sets how its jobs are drawn and submitted
+    """
+    name = forms.CharField(
+        label=_('Campaign Name'),
+        max_length=200,
+        widget=forms.TextInput(attrs={'class': 'form-control'}),
+    )
+    description = forms.CharField(
+        label=_('Description'),
+        required=False,
+        widget=forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
+    )
+    draws = forms.IntegerField(
+        label=_('Random Draws per Grid Point'),
+        min_value=1,
+        initial=1,
+        widget=forms.NumberInput(attrs={'class': 'form-control'}),
+    )
+    seed = forms.IntegerField(
+        label=_('Random Seed'),
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-control'}),
+    )
+    maximum_active_jobs = forms.IntegerField(
+        label=_('Jobs Running at the Same Time'),
+        min_value=1,
+        widget=forms.NumberInput(attrs={'class': 'form-control'}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        self.user = kwargs.pop('user', None)
+        super(CampaignForm, self).__init__(*args, **kwargs)
+
+    def clean_name(self):
+        """
+        Checks that neither the campaign nor the jobs it generates clash with existing names of the user
+        :return: the name
+        """
+        name = self.cleaned_data.get('name')
+
+        if Campaign.objects.filter(user=self.user, name=name).exists():
+            raise forms.ValidationError(_('You already have a campaign with this name'))
+
+        if Job.objects.filter(user=self.user, name__startswith=name + '_').exists():
+            raise forms.ValidationError(_('You already have jobs named after this campaign'))
+
+        return name
+
+
+class SweepParameterForm(forms.Form):
+    """
+    Sweeps an injection parameter over a grid or draws it at random between two bounds
+    """
+    name = forms.ChoiceField(
+        choices=[('', _('No Parameter'))] + SignalParameter.NAME_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'}),
+    )
+    distribution = forms.ChoiceField(
+        choices=DISTRIBUTION_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-control'}),
+    )
+    minimum = forms.FloatField(
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Minimum', 'step': 'any'}),
+    )
+    maximum = forms.FloatField(
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Maximum', 'step': 'any'}),
+    )
+    number = forms.IntegerField(
+        required=False,
+        min_value=1,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Grid Points'}),
+    )
+
+    def clean(self):
+        """
+        Checks the bounds of a swept parameter, and the number of values of a grid parameter
+        :return: the cleaned data
+        """
+        data = super(SweepParameterForm, self).clean()
+        if not data.get('name'):
+            return data
+
+        if data.get('minimum') is None or data.get('maximum') is None:
+            raise forms.ValidationError(_('Both bounds are required'))
+
+        if data.get('minimum') > data.get('maximum'):
+            raise forms.ValidationError(_('The minimum must not be greater than the maximum'))
+
+        if data.get('distribution') == GRID and not data.get('number'):
+            raise forms.ValidationError(_('The number of grid points is required'))
+
+        return data
+
+    def as_sweep_parameter(self):
+        """
+        Generates the sweep specification of the parameter
+        :return: Dictionary of the parameter, None if no parameter is swept
+        """
+        data = self.cleaned_data
+        if not data.get('name'):
+            return None
+
+        return dict(
+            name=data.get('name'),
+            distribution=data.get('distribution'),
+            minimum=data.get('minimum'),
+            maximum=data.get('maximum'),
+            number=data.get('number') or 1,
+        )
+
+
+SweepParameterFormSet = forms.formset_factory(
+    SweepParameterForm, extra=SWEEP_PARAMETER_COUNT, max_num=SWEEP_PARAMETER_COUNT)
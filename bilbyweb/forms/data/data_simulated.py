@@ -5,6 +5,8 @@ Distributed under the MIT License. See LICENSE.txt for more info.
 import ast
 from collections import OrderedDict
 
+from django.core.validators import MaxValueValidator
+
 from ...utility.display_names import SIMULATED_DATA
 from ..dynamic import field
 from ...models import DataParameter, Data
@@ -18,6 +20,8 @@ from ...utility.display_names import (
     SAMPLING_FREQUENCY_DISPLAY,
     START_TIME,
     START_TIME_DISPLAY,
+    RANDOM_SEED,
+    RANDOM_SEED_DISPLAY,
     HANFORD,
     HANFORD_DISPLAY,
     LIVINGSTON,
@@ -62,6 +66,17 @@ DATA_FIELDS_PROPERTIES = OrderedDict([
         'initial': None,
         'required': True,
     }),
+    # the jobs with the same seed and data settings share the same noise realisation, and the simulated data cached
+    # on the cluster, every job without a seed gets a noise realisation of its own
+    (RANDOM_SEED, {
+        'type': field.POSITIVE_INTEGER,
+        'label': RANDOM_SEED_DISPLAY,
+        'placeholder': '42',
+        'initial': None,
+        'required': False,
+        # numpy only accepts 32 bit seeds
+        'validators': [MaxValueValidator(2 ** 32 - 1)],
+    }),
 ])
 
 
@@ -83,6 +98,11 @@ class SimulatedDataParameterForm(DynamicForm):
         # find the data first
         data = Data.objects.get(job=self.job)
         for name, value in self.cleaned_data.items():
+            # the seed is optional, a cleared seed is not kept
+            if value is None:
+                DataParameter.objects.filter(data=data, name=name).delete()
+                continue
+
             DataParameter.objects.update_or_create(
                 data=data,
                 name=name,
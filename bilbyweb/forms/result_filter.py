@@ -0,0 +1,88 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django import forms
+from django.utils.translation import ugettext_lazy as _
+
+from ..models import ResultIndex
+from ..utility.display_names import (
+    CHIRP_MASS,
+    CHIRP_MASS_DISPLAY,
+    MASS1,
+    MASS1_DISPLAY,
+    MASS2,
+    MASS2_DISPLAY,
+    LUMINOSITY_DISTANCE,
+    LUMINOSITY_DISTANCE_DISPLAY,
+    IOTA,
+    IOTA_DISPLAY,
+    PSI,
+    PSI_DISPLAY,
+    PHASE,
+    PHASE_DISPLAY,
+    GEOCENT_TIME,
+    GEOCENT_TIME_DISPLAY,
+    RA,
+    RA_DISPLAY,
+    DEC,
+    DEC_DISPLAY,
+)
+
+PARAMETER_CHOICES = [
+    ('', _('Any Parameter')),
+    (CHIRP_MASS, CHIRP_MASS_DISPLAY),
+    (MASS1, MASS1_DISPLAY),
+    (MASS2, MASS2_DISPLAY),
+    (LUMINOSITY_DISTANCE, LUMINOSITY_DISTANCE_DISPLAY),
+    (IOTA, IOTA_DISPLAY),
+    (PSI, PSI_DISPLAY),
+    (PHASE, PHASE_DISPLAY),
+    (GEOCENT_TIME, GEOCENT_TIME_DISPLAY),
+    (RA, RA_DISPLAY),
+    (DEC, DEC_DISPLAY),
+]
+
+# Number of filters shown for the public jobs
+RESULT_FILTER_COUNT = 3
+
+
+class ResultFilterForm(forms.Form):
+    """
+    Filters jobs on the range of the posterior median of a parameter
+    """
+    parameter = forms.ChoiceField(
+        choices=PARAMETER_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'}),
+    )
+    minimum = forms.FloatField(
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Minimum Median', 'step': 'any'}),
+    )
+    maximum = forms.FloatField(
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Maximum Median', 'step': 'any'}),
+    )
+
+    def filter(self, jobs):
+        """
+        Filters the jobs whose posterior median lies in the range
+        :param jobs: queryset of Job
+        :return: filtered queryset of Job
+        """
+        data = self.cleaned_data
+        if not data.get('parameter'):
+            return jobs
+
+        results = ResultIndex.objects.filter(parameter=data.get('parameter'))
+        if data.get('minimum') is not None:
+            results = results.filter(median__gte=data.get('minimum'))
+        if data.get('maximum') is not None:
+            results = results.filter(median__lte=data.get('maximum'))
+
+        # a sub query, so that all the filters are looked up with the index in a single query
+        return jobs.filter(id__in=results.values('job'))
+
+
+ResultFilterFormSet = forms.formset_factory(ResultFilterForm, extra=RESULT_FILTER_COUNT, max_num=RESULT_FILTER_COUNT)
@@ -5,19 +5,62 @@ Distributed under the MIT License. See LICENSE.txt for more info.
 from django import forms
 from django.utils.translation import ugettext_lazy as _
 from ...models import Sampler
+from ...utility.display_names import (
+    FAST_LIKELIHOOD,
+    FAST_LIKELIHOOD_DISPLAY,
+    WARM_START,
+    WARM_START_DISPLAY,
+    COMPARE_SAMPLERS,
+    COMPARE_SAMPLERS_DISPLAY,
+    SAMPLER_PRESET,
+    SAMPLER_PRESET_DISPLAY,
+    QUICK_LOOK,
+    QUICK_LOOK_DISPLAY,
+    STANDARD_RUN,
+    STANDARD_RUN_DISPLAY,
+    PUBLICATION,
+    PUBLICATION_DISPLAY,
+    DYNESTY,
+    NESTLE,
+    EMCEE,
+)
+from ...utility.warm_start import get_warm_start_parent
+from .sampler_dynesty import DYNESTY_PRESETS
+from .sampler_nestle import NESTLE_PRESETS
+from .sampler_emcee import EMCEE_PRESETS
 
 FIELDS = [
     'sampler_choice',
+    FAST_LIKELIHOOD,
+    WARM_START,
 ]
 
 WIDGETS = {
     'sampler_choice': forms.Select(
         attrs={'class': 'form-control'},
     ),
+    FAST_LIKELIHOOD: forms.CheckboxInput(),
+    WARM_START: forms.CheckboxInput(),
 }
 
 LABELS = {
     'sampler_choice': _('Sampler'),
+    FAST_LIKELIHOOD: _(FAST_LIKELIHOOD_DISPLAY),
+    WARM_START: _(WARM_START_DISPLAY),
+}
+
+PRESET_CHOICES = [
+    ('', '---------'),
+    (QUICK_LOOK, QUICK_LOOK_DISPLAY),
+    (STANDARD_RUN, STANDARD_RUN_DISPLAY),
+    (PUBLICATION, PUBLICATION_DISPLAY),
+]
+
+# Sampler parameter values for each preset, these are filled in the sampler parameter forms in the UI
+SAMPLER_PRESETS = {
+    DYNESTY: DYNESTY_PRESETS,
+    NESTLE: NESTLE_PRESETS,
+    EMCEE: EMCEE_PRESETS,
 }
 
 
@@ -25,11 +68,38 @@ class SamplerForm(forms.ModelForm):
     """
     Sampler class
     """
+
+    # presets are not stored, they only fill in the sampler parameters
+    sampler_preset = forms.ChoiceField(
+        label=_(SAMPLER_PRESET_DISPLAY),
+        choices=PRESET_CHOICES,
+        required=False,
+        widget=forms.Select(
+            attrs={'class': 'form-control'},
+        ),
+    )
+
+    # run on the same data and likelihood in the same allocation, with the standard preset
+    compare_samplers = forms.MultipleChoiceField(
+        label=_(COMPARE_SAMPLERS_DISPLAY),
+        choices=Sampler.SAMPLER_CHOICES,
+        required=False,
+        widget=forms.CheckboxSelectMultiple(),
+    )
+
     def __init__(self, *args, **kwargs):
         self.request = kwargs.pop('request', None)
         self.job = kwargs.pop('job', None)
+        self.presets = SAMPLER_PRESETS
         super(SamplerForm, self).__init__(*args, **kwargs)
 
+        if self.instance and self.instance.pk:
+            self.initial[COMPARE_SAMPLERS] = self.instance.compare_sampler_list
+
+        # only a job copied from a finished job can start from its posterior
+        if not (self.job and get_warm_start_parent(self.job)):
+            del self.fields[WARM_START]
+
     class Meta:
         model = Sampler
         fields = FIELDS
@@ -53,5 +123,11 @@ class SamplerForm(forms.ModelForm):
             job=self.job,
             defaults={
                 'sampler_choice': data.get('sampler_choice'),
+                FAST_LIKELIHOOD: data.get(FAST_LIKELIHOOD),
+                WARM_START: data.get(WARM_START, False),
+                # the sampler of the job is not run twice
+                COMPARE_SAMPLERS: str([
+                    sampler for sampler in data.get(COMPARE_SAMPLERS, []) if sampler != data.get('sampler_choice')
+                ]),
             },
         )
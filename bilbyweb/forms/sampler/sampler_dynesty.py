@@ -11,6 +11,15 @@ from ..dynamic.form import DynamicForm
 from ...utility.display_names import (
     NUMBER_OF_LIVE_POINTS,
     NUMBER_OF_LIVE_POINTS_DISPLAY,
+    DLOGZ,
+    DLOGZ_DISPLAY,
+    WALK_LENGTH,
+    WALK_LENGTH_DISPLAY,
+    MAXIMUM_MCMC_STEPS,
+    MAXIMUM_MCMC_STEPS_DISPLAY,
+    QUICK_LOOK,
+    STANDARD_RUN,
+    PUBLICATION,
 )
 
 DYNESTY_FIELDS_PROPERTIES = OrderedDict([
@@ -21,8 +30,50 @@ DYNESTY_FIELDS_PROPERTIES = OrderedDict([
         'initial': None,
         'required': True,
     }),
+    (DLOGZ, {
+        'type': field.POSITIVE_FLOAT,
+        'label': DLOGZ_DISPLAY,
+        'placeholder': '0.1',
+        'initial': None,
+        'required': False,
+    }),
+    (WALK_LENGTH, {
+        'type': field.POSITIVE_INTEGER,
+        'label': WALK_LENGTH_DISPLAY,
+        'placeholder': '100',
+        'initial': None,
+        'required': False,
+    }),
+    (MAXIMUM_MCMC_STEPS, {
+        'type': field.POSITIVE_INTEGER,
+        'label': MAXIMUM_MCMC_STEPS_DISPLAY,
+        'placeholder': '5000',
+        'initial': None,
+        'required': False,
+    }),
 ])
 
+DYNESTY_PRESETS = {
+    QUICK_LOOK: {
+        NUMBER_OF_LIVE_POINTS: 250,
+        DLOGZ: 1.0,
+        WALK_LENGTH: 25,
+        MAXIMUM_MCMC_STEPS: 1000,
+    },
+    STANDARD_RUN: {
+        NUMBER_OF_LIVE_POINTS: 1000,
+        DLOGZ: 0.1,
+        WALK_LENGTH: 100,
+        MAXIMUM_MCMC_STEPS: 5000,
+    },
+    PUBLICATION: {
+        NUMBER_OF_LIVE_POINTS: 2000,
+        DLOGZ: 0.01,
+        WALK_LENGTH: 200,
+        MAXIMUM_MCMC_STEPS: 10000,
+    },
+}
+
 
 class SamplerDynestyParameterForm(DynamicForm):
     """
@@ -11,6 +11,13 @@ from ..dynamic.form import DynamicForm
 from ...utility.display_names import (
     NUMBER_OF_STEPS,
     NUMBER_OF_STEPS_DISPLAY,
+    NUMBER_OF_WALKERS,
+    NUMBER_OF_WALKERS_DISPLAY,
+    BURN_IN_AUTOCORRELATION_TIMES,
+    BURN_IN_AUTOCORRELATION_TIMES_DISPLAY,
+    QUICK_LOOK,
+    STANDARD_RUN,
+    PUBLICATION,
 )
 
 EMCEE_FIELDS_PROPERTIES = OrderedDict([
@@ -21,8 +28,40 @@ EMCEE_FIELDS_PROPERTIES = OrderedDict([
         'initial': None,
         'required': True,
     }),
+    (NUMBER_OF_WALKERS, {
+        'type': field.POSITIVE_INTEGER,
+        'label': NUMBER_OF_WALKERS_DISPLAY,
+        'placeholder': '100',
+        'initial': None,
+        'required': False,
+    }),
+    (BURN_IN_AUTOCORRELATION_TIMES, {
+        'type': field.POSITIVE_FLOAT,
+        'label': BURN_IN_AUTOCORRELATION_TIMES_DISPLAY,
+        'placeholder': '3',
+        'initial': None,
+        'required': False,
+    }),
 ])
 
+EMCEE_PRESETS = {
+    QUICK_LOOK: {
+        NUMBER_OF_STEPS: 500,
+        NUMBER_OF_WALKERS: 50,
+        BURN_IN_AUTOCORRELATION_TIMES: 2,
+    },
+    STANDARD_RUN: {
+        NUMBER_OF_STEPS: 1000,
+        NUMBER_OF_WALKERS: 100,
+        BURN_IN_AUTOCORRELATION_TIMES: 3,
+    },
+    PUBLICATION: {
+        NUMBER_OF_STEPS: 5000,
+        NUMBER_OF_WALKERS: 200,
+        BURN_IN_AUTOCORRELATION_TIMES: 5,
+    },
+}
+
 
 class SamplerEmceeParameterForm(DynamicForm):
     """
@@ -11,6 +11,11 @@ from ..dynamic.form import DynamicForm
 from ...utility.display_names import (
     NUMBER_OF_LIVE_POINTS,
     NUMBER_OF_LIVE_POINTS_DISPLAY,
+    DLOGZ,
+    DLOGZ_DISPLAY,
+    QUICK_LOOK,
+    STANDARD_RUN,
+    PUBLICATION,
 )
 
 NESTLE_FIELDS_PROPERTIES = OrderedDict([
@@ -21,8 +26,30 @@ NESTLE_FIELDS_PROPERTIES = OrderedDict([
         'initial': None,
         'required': True,
     }),
+    (DLOGZ, {
+        'type': field.POSITIVE_FLOAT,
+        'label': DLOGZ_DISPLAY,
+        'placeholder': '0.1',
+        'initial': None,
+        'required': False,
+    }),
 ])
 
+NESTLE_PRESETS = {
+    QUICK_LOOK: {
+        NUMBER_OF_LIVE_POINTS: 250,
+        DLOGZ: 1.0,
+    },
+    STANDARD_RUN: {
+        NUMBER_OF_LIVE_POINTS: 1000,
+        DLOGZ: 0.1,
+    },
+    PUBLICATION: {
+        NUMBER_OF_LIVE_POINTS: 2000,
+        DLOGZ: 0.01,
+    },
+}
+
 
 class SamplerNestleParameterForm(DynamicForm):
     """
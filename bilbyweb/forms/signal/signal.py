@@ -16,6 +16,9 @@ from ...utility.display_names import (
     SKIP,
     SAME_MODEL,
     SAME_MODEL_DISPLAY,
+    WAVEFORM_APPROXIMANT,
+    WAVEFORM_APPROXIMANT_DISPLAY,
+    IMRPHENOMPV2,
 )
 from ...models import (
     Signal,
@@ -42,6 +45,13 @@ SIGNAL_FIELDS_PROPERTIES = OrderedDict([
         'choices': Signal.SIGNAL_CHOICES[1:],
         'required': True,
     }),
+    (WAVEFORM_APPROXIMANT, {
+        'type': field.SELECT,
+        'label': WAVEFORM_APPROXIMANT_DISPLAY,
+        'choices': Signal.WAVEFORM_APPROXIMANT_CHOICES,
+        'initial': IMRPHENOMPV2,
+        'required': True,
+    }),
 ])
 
 
@@ -96,6 +106,7 @@ class SignalForm(DynamicForm):
             defaults={
                 'signal_choice': data.get('signal_choice'),
                 'signal_model': data.get('signal_model'),
+                'waveform_approximant': data.get(WAVEFORM_APPROXIMANT),
             }
         )
 
@@ -121,5 +132,8 @@ class SignalForm(DynamicForm):
 
                 # setting up the signal model choice field
                 self.fields[SIGNAL_MODEL].initial = signal.signal_model
+
+                # setting up the waveform approximant choice field
+                self.fields[WAVEFORM_APPROXIMANT].initial = signal.waveform_approximant
             except Signal.DoesNotExist:
                 return
@@ -9,6 +9,8 @@ from .dynamic.form import DynamicForm
 from .dynamic import field
 
 from ..utility.job import BilbyJob
+from ..utility.submission import submit_job
+from ..utility.display_names import REUSE_RESULT, REUSE_RESULT_DISPLAY
 
 
 logger = logging.getLogger(__name__)
@@ -21,6 +23,12 @@ FIELDS_PROPERTIES = OrderedDict([
         'initial': None,
         'required': True,
     }),
+    (REUSE_RESULT, {
+        'type': field.CHECKBOX,
+        'label': REUSE_RESULT_DISPLAY,
+        'initial': True,
+        'required': False,
+    }),
 ])
 
 
@@ -42,11 +50,7 @@ class SubmitJobForm(DynamicForm):
         self.full_clean()
         data = self.cleaned_data
 
-        # the json representation of the job is to be saved in the Job model
-        self.job.json_representation = data.get('json_representation')
-
-        # Submit the job to HPC
-        self.job.submit(self.job.json_representation)
+        submit_job(self.job, data.get('json_representation'), self.request.user, data.get(REUSE_RESULT))
 
         # remove the draft job from the session as it is not draft anymore
         self.request.session['draft_job'] = None
@@ -60,7 +64,7 @@ class SubmitJobForm(DynamicForm):
         if job:
             bilby_job = BilbyJob(job_id=job.id)
 
-            # as currently it is the only field, we are not using a loop like other forms
+            # the only field populated from the database, so we are not using a loop like other forms
             self.fields['json_representation'].initial = bilby_job.as_json()
 
 
@@ -0,0 +1,28 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...utility.digest import send_due_digests
+
+# Seconds between two checks for the digests whose window has ended
+POLL_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = 'Queues the digests of the finished job notifications whose window has ended'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Queue the due digests once and exit')
+
+    def handle(self, *args, **options):
+        while True:
+            send_due_digests()
+
+            if options['once']:
+                break
+
+            time.sleep(POLL_INTERVAL)
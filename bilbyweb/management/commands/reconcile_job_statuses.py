@@ -0,0 +1,28 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+
+from ...utility.reconcile import reconcile_job_statuses
+
+
+class Command(BaseCommand):
+    help = 'Applies a batch of job statuses, given as a json object of the new job status keyed by job id'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help='Path of the json file, - to read it from stdin')
+
+    def handle(self, *args, **options):
+        if options['path'] == '-':
+            statuses = json.load(sys.stdin)
+        else:
+            with open(options['path']) as f:
+                statuses = json.load(f)
+
+        changed = reconcile_job_statuses({int(job_id): int(status) for job_id, status in statuses.items()})
+
+        self.stdout.write('{} of {} job(s) changed status'.format(len(changed), len(statuses)))
@@ -0,0 +1,44 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...utility.placement import CLUSTER_POLL_INTERVAL, get_placement_setting, poll_cluster_loads
+from ...utility.submission import drain_submission_queue
+from ...utility.summary import index_completed_jobs
+
+# Seconds the worker sleeps when there is nothing to submit
+POLL_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = 'Submits the queued jobs to the cluster, retrying the failed submissions, and indexes the results of the ' \
+           'completed jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+
+    def handle(self, *args, **options):
+        cluster_poll_interval = get_placement_setting('CLUSTER_POLL_INTERVAL', CLUSTER_POLL_INTERVAL)
+        last_cluster_poll = None
+
+        while True:
+            # the loads of the clusters the jobs are placed by
+            if last_cluster_poll is None or time.monotonic() - last_cluster_poll >= cluster_poll_interval:
+                poll_cluster_loads()
+                last_cluster_poll = time.monotonic()
+
+                # the results of the jobs completed since the last poll, for the result filters
+                index_completed_jobs()
+
+            attempted = drain_submission_queue()
+
+            if options['once']:
+                break
+
+            # more requests may be due straight away after a batch
+            if not attempted:
+                time.sleep(POLL_INTERVAL)
@@ -0,0 +1,18 @@
+# Generated by Django 2.1.5 on 2018-11-02 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bilbyweb', '0004_remove_job_submission_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='signal',
+            name='waveform_approximant',
+            field=models.CharField(choices=[('IMRPhenomPv2', 'IMRPhenomPv2 (precessing, highest cost)'), ('IMRPhenomD', 'IMRPhenomD (aligned spin, medium cost)'), ('TaylorF2', 'TaylorF2 (inspiral only, lowest cost)')], default='IMRPhenomPv2', max_length=50),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1.5 on 2018-11-05 14:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bilbyweb', '0005_signal_waveform_approximant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sampler',
+            name='fast_likelihood',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1.5 on 2018-11-09 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bilbyweb', '0006_sampler_fast_likelihood'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='resume_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1.5 on 2018-11-12 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bilbyweb', '0007_job_resume_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='posterior_summary',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 2.1.5 on 2018-11-14 15:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bilbyweb', '0008_job_posterior_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultIndex',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('parameter', models.CharField(max_length=50)),
+                ('median', models.FloatField()),
+                ('lower', models.FloatField(blank=True, null=True)),
+                ('upper', models.FloatField(blank=True, null=True)),
+                ('log_evidence', models.FloatField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_result_index', to='bilbyweb.Job')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='resultindex',
+            index=models.Index(fields=['parameter', 'median'], name='bilbyweb_re_paramet_6df4b8_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='resultindex',
+            unique_together={('job', 'parameter')},
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 2.1.5 on 2018-11-16 11:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bilbyweb', '0009_resultindex'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='children', to='bilbyweb.Job'),
+        ),
+        migrations.AddField(
+            model_name='sampler',
+            name='warm_start',
+            field=models.BooleanField(default=False),
+        ),
+    ]
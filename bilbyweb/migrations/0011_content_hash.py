@@ -0,0 +1,24 @@
+# Generated by Django 2.1.5 on 2018-11-19 14:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bilbyweb', '0010_warm_start'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='reused_from',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reused_by', to='bilbyweb.Job'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.1.5 on 2018-11-20 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bilbyweb', '0011_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='sampler_summaries',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='sampler',
+            name='compare_samplers',
+            field=models.CharField(blank=True, default='[]', max_length=50),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 2.1.5 on 2018-11-21 09:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('bilbyweb', '0012_compare_samplers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Campaign',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('creation_time', models.DateTimeField(auto_now_add=True)),
+                ('sweep', models.TextField()),
+                ('launched', models.BooleanField(default=False)),
+                ('maximum_active_jobs', models.PositiveIntegerField(default=20)),
+                ('base_job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='base_campaign', to='bilbyweb.Job')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_campaign', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='campaign',
+            unique_together={('user', 'name')},
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='campaign',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='campaign_job', to='bilbyweb.Campaign'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 2.1.5 on 2018-11-22 11:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bilbyweb', '0013_campaign'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionAttempt',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempt_time', models.DateTimeField(auto_now_add=True)),
+                ('latency', models.FloatField()),
+                ('error', models.TextField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SubmissionRequest',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submission_parameters', models.TextField(blank=True, null=True)),
+                ('creation_time', models.DateTimeField(auto_now_add=True)),
+                ('next_attempt_time', models.DateTimeField()),
+                ('claim', models.CharField(blank=True, max_length=32, null=True)),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('completion_time', models.DateTimeField(blank=True, null=True)),
+                ('failed', models.BooleanField(default=False)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_submission_request', to='bilbyweb.Job')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='submissionattempt',
+            name='request',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='request_attempt', to='bilbyweb.SubmissionRequest'),
+        ),
+        migrations.AddIndex(
+            model_name='submissionrequest',
+            index=models.Index(fields=['completion_time', 'next_attempt_time'], name='bilbyweb_su_complet_0de215_idx'),
+        ),
+    ]
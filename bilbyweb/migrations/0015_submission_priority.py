@@ -0,0 +1,26 @@
+# Generated by Django 2.1.5 on 2018-11-23 10:14
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('bilbyweb', '0014_submission_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionPriority',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weight', models.PositiveIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)])),
+                ('maximum_active_jobs', models.PositiveIntegerField(blank=True, null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='user_submission_priority', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
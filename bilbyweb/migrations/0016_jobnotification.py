@@ -0,0 +1,32 @@
+# Generated by Django 2.1.5 on 2018-11-27 10:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('bilbyweb', '0015_submission_priority'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobNotification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=20)),
+                ('creation_time', models.DateTimeField(auto_now_add=True)),
+                ('sent_time', models.DateTimeField(blank=True, null=True)),
+                ('campaign', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='campaign_job_notification', to='bilbyweb.Campaign')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_notification', to='bilbyweb.Job')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_job_notification', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobnotification',
+            index=models.Index(fields=['sent_time', 'user'], name='bilbyweb_jo_sent_ti_f96ef5_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1.5 on 2018-11-28 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bilbyweb', '0016_jobnotification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='status_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1.5 on 2018-11-29 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bilbyweb', '0017_job_status_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='summary_attempt_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -2,8 +2,12 @@
 Distributed under the MIT License. See LICENSE.txt for more info.
 """
 
+import ast
+
 from django.conf import settings
-from django.db import models
+from django.core.validators import MinValueValidator
+from django.db import models, transaction
+from django.db.models.base import DEFERRED
 
 from django_hpc_job_controller.models import HpcJob
 
@@ -28,6 +32,35 @@ class Job(HpcJob):
     last_updated = models.DateTimeField(auto_now_add=True)
     json_representation = models.TextField(null=True, blank=True)
 
+    # number of times the job has been resubmitted to resume from its checkpoint
+    resume_count = models.PositiveIntegerField(default=0)
+
+    # incremented on every change of status, the pages watching the job ask for the jobs whose version has changed
+    status_version = models.PositiveIntegerField(default=0)
+
+    # posterior summary (summary.json) of a finished job, fetched once from the cluster
+    posterior_summary = models.TextField(null=True, blank=True)
+
+    # failed attempts at fetching the posterior summary of a completed job, it is given up after a few of them
+    summary_attempt_count = models.PositiveIntegerField(default=0)
+
+    # posterior summaries of the samplers run alongside the sampler of the job, keyed by sampler, fetched once
+    sampler_summaries = models.TextField(null=True, blank=True)
+
+    # the job this job was copied from
+    parent = models.ForeignKey('self', related_name='children', null=True, blank=True, on_delete=models.SET_NULL)
+
+    # hash of the parameters of the job, identical for jobs that produce the same result
+    content_hash = models.CharField(max_length=64, null=True, blank=True, db_index=True)
+
+    # the completed job whose result is reused instead of running this job
+    reused_from = models.ForeignKey('self', related_name='reused_by', null=True, blank=True,
+                                    on_delete=models.SET_NULL)
+
+    # the parameter sweep campaign the job was generated for
+    campaign = models.ForeignKey('Campaign', related_name='campaign_job', null=True, blank=True,
+                                 on_delete=models.SET_NULL)
+
     @property
     def status_display(self):
         """
@@ -52,6 +85,119 @@ class Job(HpcJob):
             return DISPLAY_NAME_MAP_HPC_JOB[self.job_status]
         return "unknown"
 
+    @property
+    def result_job(self):
+        """
+        Finds the job whose outputs on the cluster are the result of this job
+        :return: Job instance
+        """
+        return self.reused_from or self
+
+    # values of the fields as loaded from the database keyed by attribute name, None for a job that was not loaded
+    _loaded_values = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+
+        # snapshot of the loaded values, so that the changes can be found on save without reading the job again
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not DEFERRED
+        }
+        return instance
+
+    def take_snapshot(self, fields=None):
+        """
+        Records the current values of fields as the values stored in the database
+        :param fields: names of the fields, None for all the fields
+        :return: Nothing
+        """
+        if self._loaded_values is None:
+            self._loaded_values = dict()
+
+        for field in self._meta.concrete_fields:
+            if fields is None or field.name in fields or field.attname in fields:
+                if field.attname in self.__dict__:
+                    self._loaded_values[field.attname] = getattr(self, field.attname)
+
+    def get_loaded_value(self, field_name):
+        """
+        Finds the value a field had when the job was loaded from or last saved to the database
+        :param field_name: name of the field
+        :return: the value, DEFERRED if it is not known
+        """
+        if self._loaded_values is None:
+            return DEFERRED
+        return self._loaded_values.get(self._meta.get_field(field_name).attname, DEFERRED)
+
+    def get_changed_fields(self):
+        """
+        Finds the fields that have changed since the job was loaded from or last saved to the database
+        :return: list of the field names, None if the job was not loaded from the database
+        """
+        if self._loaded_values is None:
+            return None
+
+        return [
+            field.name for field in self._meta.concrete_fields
+            if not field.primary_key and field.attname in self._loaded_values and
+            getattr(self, field.attname) != self._loaded_values[field.attname]
+        ]
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self.take_snapshot(fields)
+
+    def has_status_changed(self):
+        """
+        Checks whether the status of the job has changed since it was loaded from or last saved to the database
+        :return: True if it has changed or it is not known, False otherwise
+        """
+        return self.job_status != self.get_loaded_value('job_status') or \
+            self.extra_status != self.get_loaded_value('extra_status')
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        saves_status = update_fields is None or bool({'job_status', 'extra_status'} & set(update_fields))
+
+        # every change of status is counted, so that the pages watching the job only fetch the jobs that have changed
+        counted_in_database = False
+        if self.pk and saves_status and self.has_status_changed():
+            if self._loaded_values is None:
+                # the version of a job that was not loaded from the database is not known, it is counted there
+                self.status_version = models.F('status_version') + 1
+                counted_in_database = True
+            else:
+                self.status_version += 1
+
+            if update_fields is not None:
+                kwargs['update_fields'] = list(update_fields) + ['status_version']
+
+        # the emails queued by the signals are only sent if the job is saved
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+        if counted_in_database:
+            self.refresh_from_db(fields=['status_version'])
+        self.take_snapshot(kwargs.get('update_fields'))
+
+    def save_changes(self):
+        """
+        Saves only the fields that have changed since the job was loaded, and the last updated time
+        :return: Nothing
+        """
+        changed_fields = self.get_changed_fields()
+        self.save(update_fields=None if changed_fields is None else changed_fields + ['last_updated'])
+
+    def choose_cluster(self, parameters):
+        """
+        Chooses the cluster the job is submitted to, called by HpcJob.submit
+        :param parameters: json of the submission parameters of the job
+        :return: instance of HpcCluster
+        """
+        from bilbyweb.utility.placement import choose_cluster
+        return choose_cluster(self, parameters)
+
     @property
     def bilby_job(self):
         """
@@ -81,6 +227,153 @@ class Job(HpcJob):
         )
 
 
+class Campaign(models.Model):
+    """
+    Model to group the jobs generated by sweeping the injection parameters of a draft job
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='user_campaign', on_delete=models.CASCADE)
+    name = models.CharField(max_length=200, blank=False, null=False)
+    description = models.TextField(blank=True, null=True)
+    creation_time = models.DateTimeField(auto_now_add=True)
+
+    # the draft job the jobs of the campaign were generated from
+    base_job = models.ForeignKey(Job, related_name='base_campaign', null=True, blank=True,
+                                 on_delete=models.SET_NULL)
+
+    # json of the sweep specification the jobs were generated from
+    sweep = models.TextField()
+
+    # the jobs are only submitted once the campaign is launched, and no more than this many at a time
+    launched = models.BooleanField(default=False)
+    maximum_active_jobs = models.PositiveIntegerField(default=20)
+
+    class Meta:
+        unique_together = (
+            ('user', 'name'),
+        )
+
+    def __str__(self):
+        return '{}'.format(self.name)
+
+
+class SubmissionRequest(models.Model):
+    """
+    Model to queue the submission of a job to the cluster, the queue is drained by the submission worker
+    """
+    job = models.ForeignKey(Job, related_name='job_submission_request', on_delete=models.CASCADE)
+
+    # json of the parameters for the cluster that are not part of the job itself
+    submission_parameters = models.TextField(null=True, blank=True)
+
+    creation_time = models.DateTimeField(auto_now_add=True)
+
+    # the request is not attempted before this, it is pushed back after every failed attempt
+    next_attempt_time = models.DateTimeField()
+
+    # set by the worker that is attempting the request, so that two workers do not submit the same job
+    claim = models.CharField(max_length=32, null=True, blank=True)
+
+    attempt_count = models.PositiveIntegerField(default=0)
+
+    # set once the job has been submitted, or once the request has run out of attempts
+    completion_time = models.DateTimeField(null=True, blank=True)
+    failed = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['completion_time', 'next_attempt_time']),
+        ]
+
+    def __str__(self):
+        return 'Submission of {}'.format(self.job)
+
+
+class SubmissionPriority(models.Model):
+    """
+    Model to set the share of the cluster a user gets when the submission queue is shared between users, set by the
+    admins
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, related_name='user_submission_priority',
+                                on_delete=models.CASCADE)
+
+    # queued jobs are released in proportion to the weights of the users waiting
+    weight = models.PositiveIntegerField(default=1, validators=[MinValueValidator(1)])
+
+    # jobs of the user submitted to the cluster at the same time, None for the default of the site
+    maximum_active_jobs = models.PositiveIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return '{} ({})'.format(self.user.username, self.weight)
+
+
+class SubmissionAttempt(models.Model):
+    """
+    Model to record every attempt at submitting a job, and how long the cluster took to accept it
+    """
+    request = models.ForeignKey(SubmissionRequest, related_name='request_attempt', on_delete=models.CASCADE)
+    attempt_time = models.DateTimeField(auto_now_add=True)
+
+    # seconds taken by the submission, successful or not
+    latency = models.FloatField()
+
+    # None if the attempt succeeded
+    error = models.TextField(null=True, blank=True)
+
+    def __str__(self):
+        return '{} ({}s)'.format(self.request, self.latency)
+
+
+class JobNotification(models.Model):
+    """
+    Model to hold the notification of a finished job until it is sent to the job owner in a digest
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='user_job_notification', on_delete=models.CASCADE)
+    job = models.ForeignKey(Job, related_name='job_notification', on_delete=models.CASCADE)
+
+    # the campaign of the job, the jobs of a campaign are notified together once the campaign has finished
+    campaign = models.ForeignKey(Campaign, related_name='campaign_job_notification', null=True, blank=True,
+                                 on_delete=models.SET_NULL)
+
+    # status of the job when it finished
+    status = models.CharField(max_length=20)
+
+    creation_time = models.DateTimeField(auto_now_add=True)
+
+    # set once the notification has been queued in a digest
+    sent_time = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['sent_time', 'user']),
+        ]
+
+    def __str__(self):
+        return '{}: {} ({})'.format(self.job, self.status, self.user.username)
+
+
+class ResultIndex(models.Model):
+    """
+    Model to index the posterior summary of finished jobs, one row per parameter, so that results can be searched
+    """
+    job = models.ForeignKey(Job, related_name='job_result_index', on_delete=models.CASCADE)
+    parameter = models.CharField(max_length=50, blank=False, null=False)
+    median = models.FloatField()
+    lower = models.FloatField(null=True, blank=True)
+    upper = models.FloatField(null=True, blank=True)
+    log_evidence = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        unique_together = (
+            ('job', 'parameter'),
+        )
+        indexes = [
+            models.Index(fields=['parameter', 'median']),
+        ]
+
+    def __str__(self):
+        return '{}: {} ({})'.format(self.parameter, self.median, self.job)
+
+
 class Data(models.Model):
     """
     Model to store Data Information
@@ -134,6 +427,16 @@ class Signal(models.Model):
     signal_choice = models.CharField(max_length=50, choices=SIGNAL_CHOICES, default=SKIP)
     signal_model = models.CharField(max_length=50, choices=SIGNAL_CHOICES[1:])
 
+    # ordered from the most to the least expensive waveform model
+    WAVEFORM_APPROXIMANT_CHOICES = [
+        (IMRPHENOMPV2, IMRPHENOMPV2_DISPLAY),
+        (IMRPHENOMD, IMRPHENOMD_DISPLAY),
+        (TAYLORF2, TAYLORF2_DISPLAY),
+    ]
+
+    waveform_approximant = models.CharField(max_length=50, choices=WAVEFORM_APPROXIMANT_CHOICES,
+                                            default=IMRPHENOMPV2)
+
     def __str__(self):
         return '{} - ({}[{}])'.format(self.signal_choice, self.job.name, self.job.user.username)
 
@@ -209,9 +512,29 @@ class Sampler(models.Model):
 
     sampler_choice = models.CharField(max_length=15, choices=SAMPLER_CHOICES, default=DYNESTY)
 
+    # whether to use the ROQ likelihood when a suitable basis is available
+    fast_likelihood = models.BooleanField(default=False)
+
+    # whether to start from the posterior of the job this job was copied from
+    warm_start = models.BooleanField(default=False)
+
+    # other samplers run on the same data and likelihood in the same job, stored as a string of a list
+    compare_samplers = models.CharField(max_length=50, blank=True, default='[]')
+
     def __str__(self):
         return '{} ({})'.format(self.sampler_choice, self.job.name)
 
+    @property
+    def compare_sampler_list(self):
+        """
+        Finds the samplers run alongside the sampler of the job
+        :return: list of sampler names, never including the sampler of the job
+        """
+        samplers = ast.literal_eval(self.compare_samplers or '[]')
+        return [
+            sampler for sampler, _ in self.SAMPLER_CHOICES if sampler in samplers and sampler != self.sampler_choice
+        ]
+
     def as_json(self):
         return dict(
             id=self.id,
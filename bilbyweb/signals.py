@@ -2,19 +2,16 @@
 Distributed under the MIT License. See LICENSE.txt for more info.
 """
 
-from django.db.models.signals import pre_save
+from django.db.models.base import DEFERRED
+from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
 from bilbyweb.models import Job
-from bilbyweb.utility.display_names import (
-    COMPLETED,
-    ERROR,
-    WALL_TIME_EXCEEDED,
-    OUT_OF_MEMORY,
-)
 
-from .utility.email.email import email_notification_job_done
+from .utility.campaign import release_campaign_jobs
+from .utility.digest import notify_jobs_done
+from .utility.reconcile import NOTIFICATION_STATUSES, FINISHED_STATUSES, FINISHED_JOB_STATUSES
 
 
 @receiver(pre_save, sender=Job, dispatch_uid='update_last_updated')
@@ -39,16 +36,46 @@ def notify_job_owner(instance, **kwargs):
     """
     if instance.pk:
 
-        # finding the actual instance
-        old_instance = Job.objects.get(pk=instance.pk)
+        # the status the job was loaded with, the job is only read again if it was not loaded from the database
+        old_job_status = instance.get_loaded_value('job_status')
+        if old_job_status is DEFERRED:
+            old_job_status = Job.objects.values_list('job_status', flat=True).get(pk=instance.pk)
 
         # checking whether a status change happened
         # it should check on the actual number, not the status property as that will
         # cause problems for changing from public to private and vice versa
-        if instance.job_status != old_instance.job_status:
+        if instance.job_status != old_job_status:
 
             # checking whether we need to send a notification email
-            if instance.status in [COMPLETED, ERROR, WALL_TIME_EXCEEDED, OUT_OF_MEMORY]:
+            if instance.status in NOTIFICATION_STATUSES:
 
-                # sending email notification to the user
-                email_notification_job_done(instance)
+                # notifying the user, straight away or in a digest
+                notify_jobs_done([instance])
+
+
+@receiver(post_save, sender=Job, dispatch_uid='release_campaign_jobs')
+def release_waiting_campaign_jobs(instance, created, update_fields, **kwargs):
+    """
+    Signal to submit the waiting jobs of a campaign when one of its jobs finishes processing
+    :param instance: instance of Job
+    :param created: whether the job has just been created
+    :param update_fields: the fields saved, None for all of them
+    :param kwargs: keyward arguments
+    :return: Nothing
+    """
+    # a job reusing a result finishes while the campaign is submitting it, the campaign carries on by itself
+    if not instance.campaign_id or created or instance.reused_from_id:
+        return
+
+    if update_fields is not None and 'job_status' not in update_fields:
+        return
+
+    # the snapshot is taken after the signals, so it still has the status the job had before this save
+    # a job that was not loaded from the database has an unknown previous status, it may have just finished
+    old_job_status = instance.get_loaded_value('job_status')
+    if old_job_status is not DEFERRED and (old_job_status == instance.job_status or
+                                           old_job_status in FINISHED_JOB_STATUSES):
+        return
+
+    if instance.status in FINISHED_STATUSES:
+        release_campaign_jobs(instance.campaign)
@@ -0,0 +1,103 @@
+/**
+ * Polls the progress records of a running job and updates the progress bar and the estimated time remaining.
+ */
+
+// seconds between two polls, the wrapper does not write the progress more frequently than this
+var PROGRESS_POLL_INTERVAL = 30
+
+function formatDuration (seconds) {
+  if (!isFinite(seconds) || seconds < 0) {
+    return '-'
+  }
+
+  var hours = Math.floor(seconds / 3600)
+  var minutes = Math.floor((seconds % 3600) / 60)
+
+  if (hours > 0) {
+    return hours + 'h ' + minutes + 'm'
+  }
+  return minutes + 'm'
+}
+
+function formatNumber (value, digits) {
+  if (value === null || value === undefined) {
+    return '-'
+  }
+  return Number(value).toFixed(digits)
+}
+
+$(document).ready(function () {
+  var section = $('#job-progress')
+
+  if (section.length === 0) {
+    return
+  }
+
+  var url = section.data('url')
+  var targetDlogz = parseFloat(section.data('target-dlogz')) || 0.1
+
+  var offset = 0
+  var first = null
+  var latest = null
+
+  function update () {
+    section.find('.progress-iteration').html(latest.it)
+    section.find('.progress-dlogz').html(formatNumber(latest.dlogz, 3))
+    section.find('.progress-logz').html(formatNumber(latest.logz, 3))
+    section.find('.progress-efficiency').html(formatNumber(latest.eff, 2))
+    section.find('.progress-elapsed').html(formatDuration(latest.t))
+
+    if (first.dlogz === null || latest.dlogz === null) {
+      return
+    }
+
+    // nested samplers shrink the remaining dlogz roughly exponentially, so progress is measured in log(dlogz)
+    var start = Math.log(first.dlogz)
+    var current = Math.log(Math.max(latest.dlogz, targetDlogz))
+    var target = Math.log(targetDlogz)
+
+    var progress = start > target ? (start - current) / (start - target) : 1
+    progress = Math.min(Math.max(progress, 0), 1)
+
+    section.find('.progress-bar')
+      .css('width', (progress * 100).toFixed(1) + '%')
+      .attr('aria-valuenow', (progress * 100).toFixed(1))
+
+    var elapsed = latest.t - first.t
+    if (elapsed > 0 && start > current) {
+      var rate = (start - current) / elapsed
+      section.find('.progress-eta').html(formatDuration((current - target) / rate))
+    }
+  }
+
+  function poll () {
+    fetch(url + '?offset=' + offset, {credentials: 'same-origin'})
+      .then(function (response) {
+        return response.json()
+      })
+      .then(function (data) {
+        // the job has finished or has been stopped, reload to show the new status
+        if (data.status !== 'in_progress') {
+          window.location.reload()
+          return
+        }
+
+        offset = data.offset
+
+        if (data.records.length > 0) {
+          if (first === null) {
+            first = data.records[0]
+          }
+          latest = data.records[data.records.length - 1]
+          update()
+        }
+
+        setTimeout(poll, PROGRESS_POLL_INTERVAL * 1000)
+      })
+      .catch(function () {
+        setTimeout(poll, PROGRESS_POLL_INTERVAL * 1000)
+      })
+  }
+
+  poll()
+})
@@ -0,0 +1,63 @@
+/**
+ * Watches the statuses of the jobs shown by a page and updates the jobs whose status has changed.
+ */
+
+// seconds between two polls, the statuses of the jobs are not updated by the cluster more frequently than this
+var STATUS_POLL_INTERVAL = 15
+
+$(document).ready(function () {
+  var watcher = $('[data-status-url]')
+
+  if (watcher.length === 0) {
+    return
+  }
+
+  var url = watcher.data('status-url')
+
+  // a page showing the details of a single job is reloaded when its status changes
+  var reload = watcher.data('status-reload') !== undefined
+
+  function query () {
+    return watcher.find('[data-job-id]').addBack('[data-job-id]').map(function () {
+      return 'job=' + $(this).data('job-id') + ':' + $(this).attr('data-status-version')
+    }).get().join('&')
+  }
+
+  function update (job) {
+    var row = watcher.find('[data-job-id="' + job.id + '"]').addBack('[data-job-id="' + job.id + '"]')
+
+    row.attr('data-status-version', job.version)
+    row.removeClass(function (index, className) {
+      return (className.match(/(^|\s)text-\S+/g) || []).join(' ')
+    }).addClass('text-' + job.status_color)
+    row.find('.job-status-display').html(job.status_display)
+    row.find('.job-last-updated').html(job.last_updated)
+  }
+
+  function poll () {
+    var watched = query()
+    if (watched === '') {
+      return
+    }
+
+    fetch(url + '?' + watched, {credentials: 'same-origin'})
+      .then(function (response) {
+        return response.json()
+      })
+      .then(function (data) {
+        if (reload && data.jobs.length > 0) {
+          window.location.reload()
+          return
+        }
+
+        data.jobs.forEach(update)
+
+        setTimeout(poll, STATUS_POLL_INTERVAL * 1000)
+      })
+      .catch(function () {
+        setTimeout(poll, STATUS_POLL_INTERVAL * 1000)
+      })
+  }
+
+  setTimeout(poll, STATUS_POLL_INTERVAL * 1000)
+})
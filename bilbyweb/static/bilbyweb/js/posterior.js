@@ -0,0 +1,27 @@
+/**
+ * Updates the posterior plot of a finished job when the parameters are changed.
+ */
+
+$(document).ready(function () {
+  var section = $('#posterior-plot')
+
+  if (section.length === 0) {
+    return
+  }
+
+  function update () {
+    var x = section.find('#posterior-x').val()
+    var y = section.find('#posterior-y').val()
+
+    var url = section.data('url') + '?x=' + encodeURIComponent(x)
+    if (y && y !== x) {
+      url += '&y=' + encodeURIComponent(y)
+    }
+
+    section.find('#posterior-plot-image').attr('src', url)
+  }
+
+  section.find('select').on('change', update)
+
+  update()
+})
@@ -42,6 +42,23 @@ $(document).ready(function () {
       detached_div.insertBefore('#sampler-tab-navigation')
     }
 
+    // apply the selected preset to the newly selected sampler
+    $('#id_sampler-sampler_preset').change()
+  })
+
+  $('#id_sampler-sampler_preset').change(function () {
+    var presets = JSON.parse($('#sampler-presets').text())
+    var sampler = $selected.val()
+    var preset = $(this).val()
+
+    if (!preset || !presets[sampler] || !presets[sampler][preset]) {
+      return
+    }
+
+    // fill in the parameters of the selected sampler with the preset values
+    $.each(presets[sampler][preset], function (name, value) {
+      $('#id_sampler-' + sampler + '-' + name).val(value)
+    })
   })
 
   function hide_forms(divs) {
@@ -0,0 +1,130 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from unittest.mock import patch
+
+from django.test import (
+    TestCase,
+)
+
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from ..models import Job, Campaign, Data, DataParameter, Signal, SignalParameter, Prior, Sampler
+from ..utility.campaign import count_sweep_points, create_campaign, get_sweep_points
+from ..utility.display_names import (
+    GRID,
+    UNIFORM,
+    FIXED,
+    SIMULATED_DATA,
+    BINARY_BLACK_HOLE,
+    DYNESTY,
+    MASS1,
+    LUMINOSITY_DISTANCE,
+    PUBLIC,
+    RANDOM_SEED,
+)
+from .utility import TestData, get_members
+
+SWEEP = dict(
+    parameters=[
+        dict(name=MASS1, distribution=GRID, minimum=10., maximum=30., number=3),
+        dict(name=LUMINOSITY_DISTANCE, distribution=UNIFORM, minimum=100., maximum=1000., number=1),
+    ],
+    draws=2,
+    seed=42,
+)
+
+
+class TestSweepPoints(TestCase):
+    def test_sweep_points(self):
+        points = get_sweep_points(SWEEP)
+
+        # every grid value is drawn twice
+        self.assertEquals(len(points), count_sweep_points(SWEEP))
+        self.assertEquals(len(points), 6)
+        self.assertEquals([point[MASS1] for point in points], [10., 10., 20., 20., 30., 30.])
+
+        for point in points:
+            self.assertTrue(100. <= point[LUMINOSITY_DISTANCE] <= 1000.)
+
+        # the draws are seeded
+        self.assertEquals(points, get_sweep_points(SWEEP))
+
+
+class TestCreateCampaign(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def test_create_campaign(self):
+        base_job = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            description='a job description',
+        )
+
+        data = Data.objects.create(job=base_job, data_choice=SIMULATED_DATA)
+        DataParameter.objects.create(data=data, name=RANDOM_SEED, value='42')
+        signal = Signal.objects.create(job=base_job, signal_choice=BINARY_BLACK_HOLE, signal_model=BINARY_BLACK_HOLE)
+        SignalParameter.objects.create(signal=signal, name=MASS1, value=36.)
+        Prior.objects.create(job=base_job, name=MASS1, prior_choice=FIXED, fixed_value=36.)
+        Sampler.objects.create(job=base_job, sampler_choice=DYNESTY)
+
+        campaign = create_campaign(base_job, self.members[0], 'sweep', 'a campaign', SWEEP, 5)
+
+        jobs = Job.objects.filter(campaign=campaign).order_by('id')
+        self.assertEquals(jobs.count(), 6)
+        self.assertEquals(jobs[0].name, 'sweep_0001')
+        self.assertEquals(Campaign.objects.get(id=campaign.id).launched, False)
+
+        # every job has its own copy of the tables of the draft, with the swept values
+        self.assertEquals(Data.objects.filter(job__campaign=campaign).count(), 6)
+        self.assertEquals(Sampler.objects.filter(job__campaign=campaign).count(), 6)
+
+        # the jobs of a campaign share the noise realisation of the draft
+        self.assertEquals(
+            list(DataParameter.objects.filter(data__job__campaign=campaign, name=RANDOM_SEED)
+                 .values_list('value', flat=True)),
+            ['42'] * 6,
+        )
+        self.assertEquals(
+            list(SignalParameter.objects.filter(signal__job__campaign=campaign).order_by('signal__job_id')
+                 .values_list('value', flat=True)),
+            [10., 10., 20., 20., 30., 30.],
+        )
+        self.assertEquals(
+            list(Prior.objects.filter(job__campaign=campaign).order_by('job_id').values_list('fixed_value', flat=True)),
+            [10., 10., 20., 20., 30., 30.],
+        )
+
+
+class TestReleaseCampaignJobs(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def test_released_once_finished(self):
+        campaign = Campaign.objects.create(user=self.members[0], name='a campaign', sweep='{}', launched=True)
+        job = Job.objects.create(
+            user=self.members[0],
+            name='sweep_0001',
+            campaign=campaign,
+            job_status=JobStatus.RUNNING,
+        )
+
+        with patch('bilbyweb.signals.release_campaign_jobs') as release_campaign_jobs:
+            job.description = 'not a status change'
+            job.save()
+            release_campaign_jobs.assert_not_called()
+
+            job.job_status = JobStatus.COMPLETED
+            job.save()
+            release_campaign_jobs.assert_called_once()
+
+            # the job has already freed its slot
+            job.extra_status = PUBLIC
+            job.save_changes()
+            release_campaign_jobs.assert_called_once()
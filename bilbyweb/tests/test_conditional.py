@@ -0,0 +1,131 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django.test import (
+    TestCase,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from ..models import Job, SubmissionAttempt, SubmissionRequest
+from .utility import TestData, get_members
+
+
+class TestConditionalJobList(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            job_status=JobStatus.QUEUED,
+        )
+
+    def get_jobs(self, user, etag=None):
+        self.client.force_login(user)
+        if etag:
+            return self.client.get(reverse('jobs'), HTTP_IF_NONE_MATCH=etag)
+        return self.client.get(reverse('jobs'))
+
+    def test_not_modified(self):
+        response = self.get_jobs(self.members[0])
+        self.assertEquals(response.status_code, 200)
+        etag = response['ETag']
+
+        # nothing has changed since the page was cached
+        self.assertEquals(self.get_jobs(self.members[0], etag).status_code, 304)
+
+        self.job.job_status = JobStatus.RUNNING
+        self.job.save()
+
+        response = self.get_jobs(self.members[0], etag)
+        self.assertEquals(response.status_code, 200)
+        self.assertNotEquals(response['ETag'], etag)
+
+    def test_other_user(self):
+        etag = self.get_jobs(self.members[0])['ETag']
+
+        # the page of another user is not the page cached by the browser
+        self.assertEquals(self.get_jobs(self.members[1], etag).status_code, 200)
+
+
+class TestConditionalJob(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def setUp(self):
+        # a draft has no cluster, so its page is never rendered while the cluster is offline
+        self.job = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            job_status=JobStatus.DRAFT,
+        )
+        self.client.force_login(self.members[0])
+
+    def get_job(self, etag=None):
+        if etag:
+            return self.client.get(reverse('job', kwargs={'job_id': self.job.id}), HTTP_IF_NONE_MATCH=etag)
+        return self.client.get(reverse('job', kwargs={'job_id': self.job.id}))
+
+    def assert_modified(self, etag):
+        response = self.get_job(etag)
+        self.assertEquals(response.status_code, 200)
+        self.assertNotEquals(response['ETag'], etag)
+        self.assertEquals(self.get_job(response['ETag']).status_code, 304)
+        return response['ETag']
+
+    def test_not_modified(self):
+        response = self.get_job()
+        self.assertEquals(response.status_code, 200)
+        etag = response['ETag']
+
+        # nothing has changed since the page was cached
+        self.assertEquals(self.get_job(etag).status_code, 304)
+
+        self.job.description = 'a job description'
+        self.job.save()
+
+        self.assert_modified(etag)
+
+    def test_failed_submission_attempt(self):
+        etag = self.get_job()['ETag']
+
+        submission_request = SubmissionRequest.objects.create(
+            job=self.job,
+            next_attempt_time=timezone.now(),
+        )
+        etag = self.assert_modified(etag)
+
+        # a failed attempt changes the request and not the job
+        SubmissionRequest.objects.filter(id=submission_request.id).update(attempt_count=1)
+        SubmissionAttempt.objects.create(
+            request=submission_request,
+            latency=1.0,
+            error='the cluster is not connected',
+        )
+        self.assert_modified(etag)
+
+    def test_reused_job(self):
+        source = Job.objects.create(
+            user=self.members[0],
+            name='an identical job',
+            job_status=JobStatus.QUEUED,
+        )
+        self.job.reused_from = source
+        self.job.save()
+
+        etag = self.get_job()['ETag']
+
+        # the page shows the outputs of the source, which changes without the job changing
+        source.job_status = JobStatus.RUNNING
+        source.save()
+
+        self.assert_modified(etag)
@@ -2,6 +2,8 @@
 Distributed under the MIT License. See LICENSE.txt for more info.
 """
 
+import json
+
 from django.test import (
     TestCase,
     Client,
@@ -14,6 +16,7 @@ from ..models import (
     Data,
     DataParameter,
 )
+from ..utility.job import BilbyJob
 from .utility import TestData, get_admins, get_members, PASSWORD_MEMBER
 
 
@@ -123,3 +126,39 @@ class TestDataForm(TestCase):
         # check data parameters are created for the form
         data_parameter_created = DataParameter.objects.filter(data=data_created[0]).exists()
         self.assertEquals(data_parameter_created, True)
+
+    def test_data_form_random_seed(self):
+        job = Job.objects.create(
+            name='a job',
+            description='a job description',
+            user=self.members[0],
+        )
+
+        self.client.login(username=self.members[0].username, password=PASSWORD_MEMBER)
+
+        session = self.client.session
+        session['draft_job'] = {'id': job.pk, 'value': {}}
+        session.save()
+
+        data = {
+            'form-tab': 'data',
+            'data-data_choice': 'simulated',
+            'data-simulated-detector_choice': 'hanford',
+            'data-simulated-signal_duration': 2,
+            'data-simulated-sampling_frequency': 2,
+            'data-simulated-start_time': 2.1,
+            'data-simulated-random_seed': 42,
+        }
+        self.client.post(reverse('new_job'), data=data)
+
+        # the seed is passed to the cluster, which shares the data of the jobs with the same seed
+        data_dict = json.loads(BilbyJob(job_id=job.id).as_json()).get('data')
+        self.assertEquals(data_dict.get('random_seed'), '42')
+
+        # a cleared seed is not passed at all
+        data['data-simulated-random_seed'] = ''
+        self.client.post(reverse('new_job'), data=data)
+
+        data_dict = json.loads(BilbyJob(job_id=job.id).as_json()).get('data')
+        self.assertFalse('random_seed' in data_dict)
+        self.assertEquals(data_dict.get('signal_duration'), '2')
@@ -0,0 +1,65 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from datetime import timedelta
+
+from django.test import (
+    TestCase,
+)
+
+from accounts.models import User, OutboxEmail
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from ..models import Job, JobNotification
+from ..utility.digest import send_due_digests
+from .utility import TestData, get_members
+
+
+class TestDigest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def finish_jobs(self, count):
+        for index in range(count):
+            job = Job.objects.create(
+                user=self.user,
+                name='job {}'.format(index),
+                job_status=JobStatus.RUNNING,
+            )
+            job.job_status = JobStatus.COMPLETED
+            job.save()
+
+    def setUp(self):
+        self.user = User.objects.get(id=self.members[0].id)
+        self.user.notification_preference = User.HOURLY
+        self.user.save()
+
+    def test_hourly_digest(self):
+        self.finish_jobs(3)
+
+        # the notifications are held for the digest
+        self.assertEquals(OutboxEmail.objects.count(), 0)
+        self.assertEquals(JobNotification.objects.filter(sent_time__isnull=True).count(), 3)
+
+        # the window has not ended yet
+        self.assertEquals(send_due_digests(), 0)
+
+        JobNotification.objects.update(creation_time=JobNotification.objects.first().creation_time - timedelta(hours=1))
+
+        # a single email for all the jobs
+        self.assertEquals(send_due_digests(), 1)
+        self.assertEquals(OutboxEmail.objects.count(), 1)
+        self.assertIn('job 2', OutboxEmail.objects.get().text_content)
+
+        self.assertEquals(send_due_digests(), 0)
+
+    def test_immediate(self):
+        self.user.notification_preference = User.IMMEDIATE
+        self.user.save()
+
+        self.finish_jobs(2)
+        self.assertEquals(OutboxEmail.objects.count(), 2)
+        self.assertEquals(JobNotification.objects.count(), 0)
@@ -16,6 +16,7 @@ from django_hpc_job_controller.client.scheduler.status import JobStatus
 
 from ..models import (
     Job,
+    ResultIndex,
 )
 
 from .utility import (
@@ -439,3 +440,72 @@ class TestJobCancel(TestCase):
 
         # 404 page displayed
         self.assertTemplateUsed(response, 'bilbyweb/error_404.html')
+
+
+class TestPublicJobsFilter(TestCase):
+    client = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def test_filter_on_median(self):
+        """
+        Test public jobs are filtered on the posterior medians of their results
+        """
+        for name, chirp_mass, distance in [('near', 30, 400), ('far', 30, 2000), ('light', 10, 400)]:
+            job = Job.objects.create(
+                name=name,
+                description='a job description',
+                user=self.members[0],
+                extra_status=PUBLIC,
+            )
+            ResultIndex.objects.create(job=job, parameter='chirp_mass', median=chirp_mass)
+            ResultIndex.objects.create(job=job, parameter='luminosity_distance', median=distance)
+
+        self.client.force_login(self.members[1])
+
+        response = self.client.get(reverse('public_jobs'), {
+            'filter-TOTAL_FORMS': 3,
+            'filter-INITIAL_FORMS': 0,
+            'filter-0-parameter': 'chirp_mass',
+            'filter-0-minimum': 25,
+            'filter-0-maximum': 35,
+            'filter-1-parameter': 'luminosity_distance',
+            'filter-1-maximum': 1000,
+        })
+
+        self.assertEqual([bilby_job.job.name for bilby_job in response.context['jobs']], ['near'])
+
+
+class TestJobCompare(TestCase):
+    client = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def test_other_member(self):
+        """
+        Test other members cannot compare private jobs
+        """
+        jobs = [
+            Job.objects.create(
+                name=name,
+                description='a job description',
+                user=self.members[0],
+                job_status=JobStatus.COMPLETED,
+            )
+            for name in ['a job', 'another job']
+        ]
+
+        self.client.force_login(self.members[1])
+
+        response = self.client.get(reverse('compare_jobs'), {'job': [job.id for job in jobs]})
+
+        # 404 page displayed
+        self.assertTemplateUsed(response, 'bilbyweb/error_404.html')
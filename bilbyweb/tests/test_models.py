@@ -0,0 +1,58 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django.test import (
+    TestCase,
+)
+
+from accounts.models import OutboxEmail
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from ..models import Job
+from ..utility.display_names import PUBLIC
+from .utility import TestData, get_members
+
+
+class TestJobSnapshot(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def setUp(self):
+        self.job_id = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            job_status=JobStatus.RUNNING,
+        ).id
+
+    def test_changed_fields(self):
+        job = Job.objects.get(id=self.job_id)
+        self.assertEquals(job.get_changed_fields(), [])
+
+        job.extra_status = PUBLIC
+        self.assertEquals(job.get_changed_fields(), ['extra_status'])
+
+        # only the changed field and the last updated time are written
+        job.save_changes()
+        self.assertEquals(job.get_changed_fields(), [])
+        self.assertEquals(Job.objects.get(id=self.job_id).extra_status, PUBLIC)
+
+        # a job that was not loaded from the database has no snapshot
+        self.assertEquals(Job(id=self.job_id).get_changed_fields(), None)
+
+    def test_status_change_notification(self):
+        job = Job.objects.get(id=self.job_id)
+
+        job.description = 'not a status change'
+        job.save()
+        self.assertEquals(OutboxEmail.objects.count(), 0)
+
+        job.job_status = JobStatus.COMPLETED
+        job.save()
+        self.assertEquals(OutboxEmail.objects.count(), 1)
+
+        # the saved status is the snapshot now, saving again does not notify the owner again
+        job.save()
+        self.assertEquals(OutboxEmail.objects.count(), 1)
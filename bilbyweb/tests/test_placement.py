@@ -0,0 +1,32 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django.test import (
+    TestCase,
+)
+
+from ..utility.placement import DEFAULT_START_LATENCY, choose_cluster_id, get_expected_wait
+
+
+class TestPlacement(TestCase):
+    def test_expected_wait(self):
+        # a cluster that has not run any job is expected to start it after the default latency
+        self.assertEquals(get_expected_wait(dict(queued=0, running=0, start_latency=None)), DEFAULT_START_LATENCY)
+
+        # every running job takes its share of the queued jobs
+        self.assertEquals(get_expected_wait(dict(queued=9, running=4, start_latency=100)), 200)
+
+    def test_choose_cluster(self):
+        self.assertEquals(choose_cluster_id(dict()), None)
+
+        loads = {
+            1: dict(queued=20, running=10, start_latency=60),
+            2: dict(queued=2, running=10, start_latency=600),
+            3: dict(queued=0, running=0, start_latency=30),
+        }
+        self.assertEquals(choose_cluster_id(loads), 3)
+
+        # the queue of the idle cluster has built up
+        loads[3]['queued'] = 5
+        self.assertEquals(choose_cluster_id(loads), 1)
@@ -0,0 +1,51 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django.test import (
+    TestCase,
+)
+
+from accounts.models import OutboxEmail
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from ..models import Job
+from ..utility.reconcile import reconcile_job_statuses
+from .utility import TestData, get_members
+
+
+class TestReconcileJobStatuses(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def setUp(self):
+        self.jobs = [
+            Job.objects.create(
+                user=self.members[0],
+                name='job {}'.format(index),
+                job_status=JobStatus.RUNNING,
+            ) for index in range(3)
+        ]
+
+    def test_reconcile(self):
+        changed = reconcile_job_statuses({
+            self.jobs[0].id: JobStatus.COMPLETED,
+            self.jobs[1].id: JobStatus.ERROR,
+            self.jobs[2].id: JobStatus.RUNNING,
+        })
+
+        # the job already running has not changed
+        self.assertEquals(sorted(job.id for job in changed), [self.jobs[0].id, self.jobs[1].id])
+
+        self.assertEquals(Job.objects.get(id=self.jobs[0].id).job_status, JobStatus.COMPLETED)
+        self.assertEquals(Job.objects.get(id=self.jobs[1].id).job_status, JobStatus.ERROR)
+        self.assertNotEquals(Job.objects.get(id=self.jobs[1].id).job_finished_time, None)
+
+        # one notification for every finished job
+        self.assertEquals(OutboxEmail.objects.count(), 2)
+
+    def test_nothing_changed(self):
+        self.assertEquals(reconcile_job_statuses({job.id: JobStatus.RUNNING for job in self.jobs}), [])
+        self.assertEquals(OutboxEmail.objects.count(), 0)
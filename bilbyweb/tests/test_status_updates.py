@@ -0,0 +1,73 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django.test import (
+    TestCase,
+)
+from django.urls import reverse
+
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from ..models import Job
+from ..utility.reconcile import reconcile_job_statuses
+from .utility import TestData, get_members
+
+
+class TestJobStatuses(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            job_status=JobStatus.QUEUED,
+        )
+
+    def get_statuses(self, version):
+        self.client.force_login(self.members[0])
+        return self.client.get(
+            reverse('job_statuses'),
+            {'job': '{}:{}'.format(self.job.id, version)},
+        ).json()['jobs']
+
+    def test_status_version(self):
+        self.assertEquals(self.job.status_version, 0)
+
+        self.job.description = 'not a status change'
+        self.job.save()
+        self.assertEquals(Job.objects.get(id=self.job.id).status_version, 0)
+
+        self.job.job_status = JobStatus.RUNNING
+        self.job.save()
+        self.assertEquals(Job.objects.get(id=self.job.id).status_version, 1)
+
+        # the statuses reconciled in a batch are counted too
+        reconcile_job_statuses({self.job.id: JobStatus.COMPLETED})
+        self.assertEquals(Job.objects.get(id=self.job.id).status_version, 2)
+
+    def test_changed_statuses(self):
+        # nothing has changed since the page was rendered
+        self.assertEquals(self.get_statuses(0), [])
+
+        self.job.job_status = JobStatus.RUNNING
+        self.job.save()
+
+        statuses = self.get_statuses(0)
+        self.assertEquals(len(statuses), 1)
+        self.assertEquals(statuses[0]['id'], self.job.id)
+        self.assertEquals(statuses[0]['version'], 1)
+        self.assertEquals(statuses[0]['status_display'], self.job.status_display)
+
+        self.assertEquals(self.get_statuses(1), [])
+
+    def test_private_job_of_another_user(self):
+        self.job.job_status = JobStatus.RUNNING
+        self.job.save()
+
+        self.client.force_login(self.members[1])
+        response = self.client.get(reverse('job_statuses'), {'job': '{}:0'.format(self.job.id)})
+        self.assertEquals(response.json()['jobs'], [])
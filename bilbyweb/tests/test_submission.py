@@ -0,0 +1,154 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from unittest.mock import patch
+
+from django.test import (
+    TestCase,
+)
+
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from ..models import Job, SubmissionRequest, SubmissionAttempt
+from ..utility.job import get_resume_walltime
+from ..utility.submission import (
+    SUBMISSION_MAXIMUM_ATTEMPTS,
+    SUBMISSION_RETRY_DELAY,
+    SUBMISSION_MAXIMUM_RETRY_DELAY,
+    attempt_submission,
+    claim_submission_requests,
+    get_retry_delay,
+    order_submission_requests,
+    queue_job,
+)
+from .utility import TestData, get_members
+
+
+class TestSubmissionQueue(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            description='a job description',
+            json_representation='{}',
+        )
+
+    def test_queue_job(self):
+        queue_job(self.job)
+
+        # the job is pending straight away, the worker submits it later
+        self.assertEquals(Job.objects.get(id=self.job.id).job_status, JobStatus.PENDING)
+        self.assertEquals(len(claim_submission_requests()), 1)
+
+        # a claimed request is not claimed again
+        self.assertEquals(len(claim_submission_requests()), 0)
+
+    def test_retry_delay(self):
+        self.assertEquals(get_retry_delay(1), SUBMISSION_RETRY_DELAY)
+        self.assertEquals(get_retry_delay(3), 4 * SUBMISSION_RETRY_DELAY)
+        self.assertEquals(get_retry_delay(100), SUBMISSION_MAXIMUM_RETRY_DELAY)
+
+    def test_failed_attempts(self):
+        queue_job(self.job)
+        request = SubmissionRequest.objects.get(job=self.job)
+
+        with patch.object(Job, 'submit', side_effect=Exception('cluster not connected')):
+            attempt_submission(request)
+
+            # the failure is recorded and the request is retried later
+            request.refresh_from_db()
+            self.assertEquals(request.attempt_count, 1)
+            self.assertEquals(request.completion_time, None)
+            self.assertEquals(SubmissionAttempt.objects.get(request=request).error, 'cluster not connected')
+
+            for _ in range(SUBMISSION_MAXIMUM_ATTEMPTS - 1):
+                attempt_submission(request)
+
+        # the job is given up after the last attempt
+        self.assertTrue(request.failed)
+        self.assertEquals(Job.objects.get(id=self.job.id).job_status, JobStatus.ERROR)
+
+    def test_successful_attempt(self):
+        queue_job(self.job)
+        request = SubmissionRequest.objects.get(job=self.job)
+
+        with patch.object(Job, 'submit') as submit:
+            attempt_submission(request)
+
+        submit.assert_called_once()
+        self.assertNotEquals(request.completion_time, None)
+        self.assertEquals(SubmissionAttempt.objects.get(request=request).error, None)
+
+    def test_failed_attempt_after_save(self):
+        queue_job(self.job)
+        request = SubmissionRequest.objects.get(job=self.job)
+
+        def submit(job, *args, **kwargs):
+            job.save()
+            raise Exception('connection lost')
+
+        # the job stays pending in the queue, whatever the submission has saved before failing
+        with patch.object(Job, 'submit', autospec=True, side_effect=submit):
+            attempt_submission(request)
+
+        self.assertEquals(request.job.job_status, JobStatus.PENDING)
+        self.assertEquals(Job.objects.get(id=self.job.id).job_status, JobStatus.PENDING)
+
+    def test_resume(self):
+        queue_job(self.job, {'resume': {'walltime': get_resume_walltime(1)}})
+        request = SubmissionRequest.objects.get(job=self.job)
+
+        # a failed submission does not count as a resume
+        with patch.object(Job, 'submit', side_effect=Exception('cluster not connected')):
+            attempt_submission(request)
+        self.assertEquals(Job.objects.get(id=self.job.id).resume_count, 0)
+
+        with patch.object(Job, 'submit'):
+            attempt_submission(request)
+        self.assertEquals(Job.objects.get(id=self.job.id).resume_count, 1)
+
+
+class TestFairShare(TestCase):
+    def get_requests(self, user_requests):
+        requests = []
+        for user_id, count in user_requests:
+            requests.extend(
+                dict(id='{}{}'.format(user_id, index), user_id=user_id, array_key=None) for index in range(count)
+            )
+        return requests
+
+    def test_equal_shares(self):
+        # the first user queued everything first, but the users take turns
+        requests = self.get_requests([('a', 3), ('b', 2)])
+        ordered = order_submission_requests(requests, {'a': (1, 10), 'b': (1, 10)}, {'a': 0, 'b': 0})
+        self.assertEquals(ordered, ['a0', 'b0', 'a1', 'b1', 'a2'])
+
+    def test_weights_and_active_jobs(self):
+        requests = self.get_requests([('a', 4), ('b', 4)])
+
+        # twice the weight, twice the jobs
+        ordered = order_submission_requests(requests, {'a': (2, 10), 'b': (1, 10)}, {'a': 0, 'b': 0})
+        self.assertEquals(ordered[:6], ['a0', 'b0', 'a1', 'a2', 'b1', 'a3'])
+
+        # a user with jobs already on the cluster waits for the others to catch up
+        ordered = order_submission_requests(requests, {'a': (1, 10), 'b': (1, 10)}, {'a': 2, 'b': 0})
+        self.assertEquals(ordered[:3], ['b0', 'b1', 'a0'])
+
+    def test_maximum_active_jobs(self):
+        requests = self.get_requests([('a', 4), ('b', 1)])
+        ordered = order_submission_requests(requests, {'a': (1, 2), 'b': (1, 10)}, {'a': 1, 'b': 0}, limit=10)
+        self.assertEquals(ordered, ['b0', 'a0'])
+
+    def test_job_array(self):
+        requests = [dict(id=index, user_id='a', array_key='array') for index in range(3)] + \
+                   [dict(id=3, user_id='b', array_key=None)]
+
+        # the array is never split, even if it takes the user past the limit
+        ordered = order_submission_requests(requests, {'a': (1, 2), 'b': (1, 10)}, {'a': 0, 'b': 0}, limit=2)
+        self.assertEquals(ordered, [0, 1, 2])
@@ -2,11 +2,22 @@
 Distributed under the MIT License. See LICENSE.txt for more info.
 """
 
+import os
+import shutil
+from types import SimpleNamespace
+
+import numpy as np
 from django.test import (
     TestCase,
 )
 
 from ..utility.utils import get_readable_size
+from ..utility.likelihood import chirp_mass, find_roq_basis
+from ..utility.progress import get_progress_records
+from ..utility.samples import get_samples_directory, get_histogram
+from ..utility.compare import ks_statistics, js_divergences
+from ..utility.warm_start import narrow_prior_range
+from ..utility.display_names import IMRPHENOMPV2, IMRPHENOMD
 
 
 class TestGetReadableSize(TestCase):
@@ -155,3 +166,122 @@ class TestGetReadableSize(TestCase):
         unit = 'PBS'
         expected = '0.0 B'
         self.assertEquals(get_readable_size(size, unit), expected)
+
+
+class TestFindRoqBasis(TestCase):
+
+    def test_chirp_mass(self):
+        """
+        Testing the chirp mass of an equal mass binary
+        """
+        self.assertAlmostEquals(chirp_mass(30, 30), 30 / 2 ** 0.2)
+
+    def test_basis_found(self):
+        """
+        Testing a basis is found when the duration and chirp mass range are covered
+        """
+        self.assertEquals(find_roq_basis(4, 20, 30, IMRPHENOMPV2), '4s')
+        self.assertEquals(find_roq_basis(8, 8, 14, IMRPHENOMPV2), '8s')
+
+    def test_basis_not_found(self):
+        """
+        Testing no basis is found for uncovered durations, chirp mass ranges and approximants
+        """
+        self.assertEquals(find_roq_basis(2, 20, 30, IMRPHENOMPV2), None)
+        self.assertEquals(find_roq_basis(4, 10, 30, IMRPHENOMPV2), None)
+        self.assertEquals(find_roq_basis(4, 20, 30, IMRPHENOMD), None)
+
+
+class TestGetProgressRecords(TestCase):
+
+    def test_incremental_records(self):
+        """
+        Testing only the complete records after the offset are returned
+        """
+        content = b'{"it": 1}\n{"it": 2}\n{"it": 3'
+
+        offset, records = get_progress_records(content)
+        self.assertEquals(records, [{'it': 1}, {'it': 2}])
+        self.assertEquals(offset, len(b'{"it": 1}\n{"it": 2}\n'))
+
+        offset, records = get_progress_records(content + b'}\n', offset)
+        self.assertEquals(records, [{'it': 3}])
+
+    def test_replaced_file(self):
+        """
+        Testing an offset beyond the end of the file restarts from the beginning
+        """
+        offset, records = get_progress_records(b'{"it": 1}\n', 100)
+        self.assertEquals(records, [{'it': 1}])
+        self.assertEquals(offset, 10)
+
+
+class TestGetHistogram(TestCase):
+
+    def setUp(self):
+        # the histograms only need the id of the job to find its samples
+        self.job = SimpleNamespace(id=-1)
+
+        os.makedirs(get_samples_directory(self.job))
+        np.save(os.path.join(get_samples_directory(self.job), 'mass_1.npy'),
+                np.linspace(20, 40, 1000, dtype=np.float32))
+        np.save(os.path.join(get_samples_directory(self.job), 'mass_2.npy'),
+                np.linspace(10, 30, 1000, dtype=np.float32))
+
+    def tearDown(self):
+        shutil.rmtree(get_samples_directory(self.job))
+
+    def test_histogram(self):
+        """
+        Testing the one and two dimensional histograms contain every sample
+        """
+        histogram = get_histogram(self.job, 'mass_1', bins=10)
+        self.assertEquals(len(histogram['counts']), 10)
+        self.assertEquals(sum(histogram['counts']), 1000)
+
+        histogram = get_histogram(self.job, 'mass_1', 'mass_2', bins=10)
+        self.assertEquals(sum(map(sum, histogram['counts'])), 1000)
+
+    def test_unknown_parameter(self):
+        """
+        Testing only the stored parameters can be binned
+        """
+        self.assertRaises(KeyError, get_histogram, self.job, '../mass_1')
+
+
+class TestComparisonStatistics(TestCase):
+
+    def test_ks_statistics(self):
+        """
+        Testing the KS statistic of identical and disjoint samples
+        """
+        statistics = ks_statistics([np.arange(10.), np.arange(10.), np.arange(10.) + 100])
+        self.assertEquals(statistics[0][1], 0)
+        self.assertEquals(statistics[0][2], 1)
+        self.assertEquals(statistics[2][0], 1)
+
+    def test_js_divergences(self):
+        """
+        Testing the JS divergence of identical and disjoint distributions
+        """
+        divergences = js_divergences(np.array([[0.5, 0.5, 0], [0.5, 0.5, 0], [0, 0, 1]]))
+        self.assertAlmostEquals(divergences[0][1], 0)
+        self.assertAlmostEquals(divergences[0][2], 1)
+
+
+class TestNarrowPriorRange(TestCase):
+
+    def test_narrowed(self):
+        """
+        Testing the range spans the multiple of the credible interval around the median
+        """
+        values = {'median': 30, 'lower': 28, 'upper': 32}
+        self.assertEquals(narrow_prior_range(10, 80, values, 3), (24, 36))
+
+    def test_never_extended(self):
+        """
+        Testing the narrowed range stays inside the prior and falls back to the prior if there is no overlap
+        """
+        self.assertEquals(narrow_prior_range(29, 80, {'median': 30, 'lower': 28, 'upper': 32}, 3), (29, 36))
+        self.assertEquals(narrow_prior_range(50, 80, {'median': 30, 'lower': 28, 'upper': 32}, 3), (50, 80))
+        self.assertEquals(narrow_prior_range(10, 80, {'median': None}, 3), (10, 80))
@@ -2,13 +2,30 @@
 Distributed under the MIT License. See LICENSE.txt for more info.
 """
 
+import json
+from unittest.mock import patch
+
 from django.test import (
     TestCase,
 )
 
-from ..utility.job import BilbyJob
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from ..utility.job import BilbyJob, get_resume_walltime, DEFAULT_WALLTIME, MAXIMUM_WALLTIME
 
-from ..models import Job
+from ..models import Job, Signal, Sampler, SamplerParameter
+from ..utility.reuse import get_content_hash, find_reusable_job, reuse_job, delete_launched_job
+from ..utility.display_names import (
+    SKIP,
+    BINARY_BLACK_HOLE,
+    IMRPHENOMD,
+    DYNESTY,
+    NESTLE,
+    EMCEE,
+    NUMBER_OF_WALKERS,
+    STANDARD_RUN,
+)
+from ..forms.sampler.sampler_emcee import EMCEE_PRESETS
 from .utility import TestData, get_members
 
 
@@ -38,3 +55,185 @@ class TestBilbyJob(TestCase):
 
         b_job = BilbyJob(job_id=-1)
         self.assertEquals(b_job, None)
+
+    def test_as_json_waveform_approximant(self):
+        job = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            description='a job description',
+        )
+
+        Signal.objects.create(
+            job=job,
+            signal_choice=SKIP,
+            signal_model=BINARY_BLACK_HOLE,
+            waveform_approximant=IMRPHENOMD,
+        )
+
+        # approximant should be there even if there is no signal injection
+        signal_dict = json.loads(BilbyJob(job_id=job.id).as_json()).get('signal')
+        self.assertEquals(signal_dict, {'waveform_approximant': IMRPHENOMD})
+
+    def test_resume_action(self):
+        job = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            description='a job description',
+            job_status=JobStatus.WALL_TIME_EXCEEDED,
+            json_representation='{}',
+        )
+
+        sampler = Sampler.objects.create(
+            job=job,
+            sampler_choice=DYNESTY,
+        )
+
+        b_job = BilbyJob(job_id=job.id, light=True)
+        b_job.list_actions(self.members[0])
+        self.assertTrue('resume' in b_job.job_actions)
+
+        # other members cannot resume the job
+        b_job.list_actions(self.members[1])
+        self.assertFalse('resume' in b_job.job_actions)
+
+        # emcee does not support resuming
+        sampler.sampler_choice = EMCEE
+        sampler.save()
+        b_job.list_actions(self.members[0])
+        self.assertFalse('resume' in b_job.job_actions)
+
+    def test_resume_walltime(self):
+        self.assertEquals(get_resume_walltime(1), 2 * DEFAULT_WALLTIME)
+        self.assertEquals(get_resume_walltime(10), MAXIMUM_WALLTIME)
+
+    def test_posterior_summary(self):
+        job = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            description='a job description',
+        )
+
+        # nothing to display until the summary is fetched from the cluster
+        self.assertEquals(BilbyJob(job_id=job.id).posterior_summary, None)
+
+        job.posterior_summary = json.dumps({'number_of_samples': 1000})
+        job.save()
+        self.assertEquals(BilbyJob(job_id=job.id).posterior_summary, {'number_of_samples': 1000})
+
+    def test_as_json_compare_samplers(self):
+        job = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            description='a job description',
+        )
+
+        sampler = Sampler.objects.create(
+            job=job,
+            sampler_choice=DYNESTY,
+        )
+
+        # a single sampler job does not list the samplers
+        self.assertNotIn('samplers', json.loads(BilbyJob(job_id=job.id).as_json()))
+
+        # the job sampler is neither run twice nor listed as another sampler
+        sampler.compare_samplers = str([EMCEE, DYNESTY, NESTLE])
+        sampler.save()
+        self.assertEquals(sampler.compare_sampler_list, [NESTLE, EMCEE])
+
+        json_dict = json.loads(BilbyJob(job_id=job.id).as_json())
+        self.assertEquals([s['type'] for s in json_dict['samplers']], [DYNESTY, NESTLE, EMCEE])
+        self.assertEquals(json_dict['samplers'][0], json_dict['sampler'])
+
+    def test_as_json_warm_start_walkers(self):
+        parent = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            description='a job description',
+            job_status=JobStatus.COMPLETED,
+            posterior_summary=json.dumps({'parameters': {}}),
+        )
+        job = Job.objects.create(
+            user=self.members[0],
+            name='a warm started job',
+            description='a job description',
+            parent=parent,
+        )
+        sampler = Sampler.objects.create(
+            job=job,
+            sampler_choice=EMCEE,
+            warm_start=True,
+        )
+
+        # the walkers start from the samples of the parent, so the job always says how many walkers it runs
+        sampler_dict = json.loads(BilbyJob(job_id=job.id).as_json())['sampler']
+        self.assertEquals(sampler_dict[NUMBER_OF_WALKERS], str(EMCEE_PRESETS[STANDARD_RUN][NUMBER_OF_WALKERS]))
+
+        SamplerParameter.objects.create(sampler=sampler, name=NUMBER_OF_WALKERS, value='64')
+        sampler_dict = json.loads(BilbyJob(job_id=job.id).as_json())['sampler']
+        self.assertEquals(sampler_dict[NUMBER_OF_WALKERS], '64')
+
+        # a job started from the prior leaves the default to bilby
+        sampler.warm_start = False
+        sampler.save()
+        SamplerParameter.objects.filter(sampler=sampler).delete()
+        self.assertNotIn(NUMBER_OF_WALKERS, json.loads(BilbyJob(job_id=job.id).as_json())['sampler'])
+
+
+class TestResultReuse(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = TestData()
+        cls.members = get_members()
+
+    def test_content_hash(self):
+        # name, description and formatting do not change the hash
+        self.assertEquals(
+            get_content_hash('{"name": "a job", "description": "one", "data": {"a": 1, "b": 2}}'),
+            get_content_hash('{"data":{"b":2,"a":1},"name":"another job"}'),
+        )
+        self.assertNotEquals(
+            get_content_hash('{"data": {"a": 1}}'),
+            get_content_hash('{"data": {"a": 2}}'),
+        )
+
+    def test_find_reusable_job(self):
+        completed = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            content_hash='hash',
+            job_status=JobStatus.COMPLETED,
+        )
+
+        job = Job.objects.create(
+            user=self.members[0],
+            name='another job',
+            content_hash='hash',
+        )
+
+        self.assertEquals(find_reusable_job(job, self.members[0]), completed)
+
+        # private jobs of other users are not reused
+        self.assertEquals(find_reusable_job(job, self.members[1]), None)
+
+    def test_delete_reused_job(self):
+        source = Job.objects.create(
+            user=self.members[0],
+            name='a job',
+            job_status=JobStatus.COMPLETED,
+        )
+        job = Job.objects.create(
+            user=self.members[1],
+            name='another job',
+        )
+        reuse_job(job, source)
+
+        # the outputs of the source stay on the cluster for the job reusing them
+        with patch.object(Job, 'delete_job') as delete_job:
+            delete_launched_job(source)
+            delete_job.assert_not_called()
+            self.assertEquals(Job.objects.get(id=source.id).job_status, JobStatus.DELETED)
+
+            # they are deleted with the last job reusing them, which has nothing on the cluster itself
+            delete_launched_job(Job.objects.get(id=job.id))
+            delete_job.assert_called_once()
+            self.assertEquals(Job.objects.get(id=job.id).job_status, JobStatus.DELETED)
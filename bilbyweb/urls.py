@@ -6,7 +6,7 @@ from django.urls import path
 from django.contrib.auth.decorators import login_required
 
 from .views import common
-from .views.job import job, jobs
+from .views.job import job, jobs, campaign
 
 urlpatterns = [
     path('', common.index, name='index'),
@@ -14,6 +14,7 @@ urlpatterns = [
     path('new_job/', login_required(job.new_job), name='new_job'),
     path('edit_job/<job_id>/', login_required(jobs.edit_job), name='edit_job'),
     path('cancel_job/<job_id>/', login_required(jobs.cancel_job), name='cancel_job'),
+    path('resume_job/<job_id>/', login_required(jobs.resume_job), name='resume_job'),
     path('copy_job/<job_id>/', login_required(jobs.copy_job), name='copy_job'),
     path('delete_job/<job_id>/', login_required(jobs.delete_job), name='delete_job'),
     path('make_job_private/<job_id>/', login_required(jobs.make_job_private), name='make_job_private'),
@@ -27,6 +28,26 @@ urlpatterns = [
     path('drafts/', jobs.drafts, name='drafts'),
     path('all_drafts/', jobs.all_drafts, name='all_drafts'),
 
+    # Parameter sweep campaigns
+    path('new_campaign/<int:job_id>/', login_required(campaign.new_campaign), name='new_campaign'),
+    path('campaigns/', campaign.campaigns, name='campaigns'),
+    path('campaign/<int:campaign_id>/', login_required(campaign.view_campaign), name='campaign'),
+    path('launch_campaign/<int:campaign_id>/', login_required(campaign.launch_campaign), name='launch_campaign'),
+
+    # Job progress of running jobs
+    path('job_progress/<int:job_id>/', login_required(jobs.job_progress), name='job_progress'),
+
+    # Status changes of the jobs shown by a page
+    path('job_statuses/', login_required(jobs.job_statuses), name='job_statuses'),
+
+    # Posterior samples of finished jobs
+    path('posterior_histogram/<int:job_id>/', login_required(jobs.posterior_histogram), name='posterior_histogram'),
+    path('posterior_plot/<int:job_id>/', login_required(jobs.posterior_plot), name='posterior_plot'),
+
+    # Posterior comparison of finished jobs
+    path('compare_jobs/', login_required(jobs.compare_jobs), name='compare_jobs'),
+    path('compare_plot/', login_required(jobs.compare_plot), name='compare_plot'),
+
     # Job asset retrieval
     path('download_asset/<int:job_id>/<int:download>/<path:file_path>', login_required(jobs.download_asset),
          name='download_asset'),
@@ -0,0 +1,376 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import itertools
+import json
+import logging
+import random
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from .display_names import (
+    GRID,
+    UNIFORM,
+    FIXED,
+    WAITING,
+    DISPLAY_NAME_MAP,
+    DISPLAY_NAME_MAP_HPC_JOB,
+)
+from .job import BilbyJob
+from .submission import prepare_job, queue_job
+from ..models import (
+    Job,
+    Campaign,
+    Data,
+    DataParameter,
+    Signal,
+    SignalParameter,
+    Prior,
+    Sampler,
+    SamplerParameter,
+)
+
+logger = logging.getLogger(__name__)
+
+# Most jobs a campaign can generate
+MAXIMUM_CAMPAIGN_JOBS = 1000
+
+# Jobs of a campaign submitted to the cluster at the same time if the campaign does not set it.
+# This can be overridden using CAMPAIGN_MAXIMUM_ACTIVE_JOBS in the settings.
+CAMPAIGN_MAXIMUM_ACTIVE_JOBS = 20
+
+# Fewest jobs released together that are submitted as a job array, fewer are submitted on their own
+MINIMUM_ARRAY_SIZE = 2
+
+# Statuses of the jobs that have been submitted and not finished yet
+ACTIVE_JOB_STATUSES = [
+    JobStatus.PENDING,
+    JobStatus.SUBMITTING,
+    JobStatus.SUBMITTED,
+    JobStatus.QUEUED,
+    JobStatus.RUNNING,
+]
+
+
+def get_campaign_maximum_active_jobs():
+    """
+    Finds the default number of jobs of a campaign submitted to the cluster at the same time
+    :return: the number of jobs
+    """
+    try:
+        return settings.CAMPAIGN_MAXIMUM_ACTIVE_JOBS
+    except AttributeError:
+        return CAMPAIGN_MAXIMUM_ACTIVE_JOBS
+
+
+def get_campaign_sweep(campaign):
+    """
+    Reads the sweep specification of a campaign
+    :param campaign: instance of Campaign
+    :return: Dictionary of the sweep specification
+    """
+    return json.loads(campaign.sweep)
+
+
+def get_grid_values(minimum, maximum, number):
+    """
+    Spaces the values of a grid parameter evenly between its bounds, both included
+    :param minimum: lower bound
+    :param maximum: upper bound
+    :param number: number of values
+    :return: list of the values
+    """
+    if number == 1:
+        return [minimum]
+
+    step = (maximum - minimum) / (number - 1)
+    return [minimum + index * step for index in range(number)]
+
+
+def count_sweep_points(sweep):
+    """
+    Counts the jobs a sweep generates without generating them
+    :param sweep: Dictionary of the sweep specification
+    :return: number of jobs
+    """
+    count = 1
+    for parameter in sweep['parameters']:
+        if parameter['distribution'] == GRID:
+            count *= parameter['number']
+
+    if any(parameter['distribution'] == UNIFORM for parameter in sweep['parameters']):
+        count *= sweep.get('draws') or 1
+
+    return count
+
+
+def get_sweep_points(sweep):
+    """
+    Generates the injection parameters of every job of a sweep. Grid parameters take every combination of their values,
+    uniform parameters are drawn at random for every job, the number of draws per grid point is set by the sweep.
+    :param sweep: Dictionary of the swept parameters (name, distribution, minimum, maximum and number of grid values),
+                  the number of random draws and the seed of the draws
+    :return: list of dictionaries of parameter name to value, one per job
+    """
+    grid = [parameter for parameter in sweep['parameters'] if parameter['distribution'] == GRID]
+    uniform = [parameter for parameter in sweep['parameters'] if parameter['distribution'] == UNIFORM]
+
+    draws = (sweep.get('draws') or 1) if uniform else 1
+
+    # seeded, so that the same sweep always generates the same jobs
+    generator = random.Random(sweep.get('seed'))
+
+    points = []
+    for values in itertools.product(*[get_grid_values(p['minimum'], p['maximum'], p['number']) for p in grid]):
+        for _ in range(draws):
+            point = dict(zip([parameter['name'] for parameter in grid], values))
+            for parameter in uniform:
+                point[parameter['name']] = generator.uniform(parameter['minimum'], parameter['maximum'])
+            points.append(point)
+
+    return points
+
+
+def get_campaign_job_name(name, index):
+    """
+    Names a job of a campaign
+    :param name: name of the campaign
+    :param index: index of the job in the campaign, starting from 0
+    :return: name of the job
+    """
+    return '{}_{:04d}'.format(name, index + 1)
+
+
+def bulk_create_job_rows(model, rows, campaign):
+    """
+    Inserts the rows of a one to one child table of the jobs of a campaign in a single query
+    :param model: model of the child table
+    :param rows: list of unsaved model instances
+    :param campaign: instance of Campaign
+    :return: Dictionary of job id to the id of its row
+    """
+    model.objects.bulk_create(rows)
+
+    # not every database returns the primary keys of bulk inserted rows, so they are read back in one query
+    return dict(model.objects.filter(job__campaign=campaign).values_list('job_id', 'id'))
+
+
+def create_campaign(base_job, user, name, description, sweep, maximum_active_jobs):
+    """
+    Creates a campaign and generates its jobs from a draft job, replacing the injection parameters of the draft with
+    the swept values. Everything is created in one transaction, the tables of the job are filled with bulk inserts.
+    :param base_job: the draft Job the jobs are copied from
+    :param user: owner of the campaign
+    :param name: name of the campaign, the jobs are named after it
+    :param description: description of the campaign and its jobs
+    :param sweep: Dictionary of the sweep specification
+    :param maximum_active_jobs: number of jobs submitted to the cluster at the same time
+    :return: instance of Campaign
+    """
+    points = get_sweep_points(sweep)
+
+    base_data = Data.objects.filter(job=base_job).first()
+    base_data_parameters = list(DataParameter.objects.filter(data=base_data)) if base_data else []
+    base_signal = Signal.objects.filter(job=base_job).first()
+    base_signal_parameters = list(SignalParameter.objects.filter(signal=base_signal)) if base_signal else []
+    base_priors = list(Prior.objects.filter(job=base_job))
+    base_sampler = Sampler.objects.filter(job=base_job).first()
+    base_sampler_parameters = list(SamplerParameter.objects.filter(sampler=base_sampler)) if base_sampler else []
+
+    with transaction.atomic():
+        campaign = Campaign.objects.create(
+            user=user,
+            name=name,
+            description=description,
+            base_job=base_job,
+            sweep=json.dumps(sweep),
+            maximum_active_jobs=maximum_active_jobs,
+        )
+
+        # the job table inherits the hpc job table, which bulk inserts do not support, so jobs are created one by one
+        jobs = [
+            Job.objects.create(
+                user=user,
+                name=get_campaign_job_name(name, index),
+                description=description,
+                parent=base_job,
+                campaign=campaign,
+            )
+            for index in range(len(points))
+        ]
+
+        if base_data:
+            data_ids = bulk_create_job_rows(Data, [
+                Data(job=job, data_choice=base_data.data_choice) for job in jobs
+            ], campaign)
+
+            DataParameter.objects.bulk_create([
+                DataParameter(data_id=data_ids[job.id], name=parameter.name, value=parameter.value)
+                for job in jobs for parameter in base_data_parameters
+            ])
+
+        if base_signal:
+            signal_ids = bulk_create_job_rows(Signal, [
+                Signal(
+                    job=job,
+                    signal_choice=base_signal.signal_choice,
+                    signal_model=base_signal.signal_model,
+                    waveform_approximant=base_signal.waveform_approximant,
+                )
+                for job in jobs
+            ], campaign)
+
+            SignalParameter.objects.bulk_create([
+                SignalParameter(
+                    signal_id=signal_ids[job.id],
+                    name=parameter.name,
+                    value=point.get(parameter.name, parameter.value),
+                )
+                for job, point in zip(jobs, points) for parameter in base_signal_parameters
+            ])
+
+        # a parameter fixed in the draft stays fixed, at the injected value
+        Prior.objects.bulk_create([
+            Prior(
+                job=job,
+                name=prior.name,
+                prior_choice=prior.prior_choice,
+                fixed_value=point.get(prior.name, prior.fixed_value) if prior.prior_choice == FIXED else
+                prior.fixed_value,
+                uniform_min_value=prior.uniform_min_value,
+                uniform_max_value=prior.uniform_max_value,
+            )
+            for job, point in zip(jobs, points) for prior in base_priors
+        ])
+
+        if base_sampler:
+            sampler_ids = bulk_create_job_rows(Sampler, [
+                Sampler(
+                    job=job,
+                    sampler_choice=base_sampler.sampler_choice,
+                    fast_likelihood=base_sampler.fast_likelihood,
+                    compare_samplers=base_sampler.compare_samplers,
+                )
+                for job in jobs
+            ], campaign)
+
+            SamplerParameter.objects.bulk_create([
+                SamplerParameter(sampler_id=sampler_ids[job.id], name=parameter.name, value=parameter.value)
+                for job in jobs for parameter in base_sampler_parameters
+            ])
+
+    return campaign
+
+
+def get_resource_shape(job):
+    """
+    Finds the resources a prepared job needs on the cluster, jobs with the same shape can run in the same job array
+    :param job: instance of Job with its json representation set
+    :return: the number of samplers of the job, each runs on its own cpu
+    """
+    job_parameters = json.loads(job.json_representation)
+    return len(job_parameters.get('samplers', [job_parameters.get('sampler')]))
+
+
+def queue_campaign_jobs(campaign, jobs):
+    """
+    Queues prepared jobs of a campaign for submission, the jobs with the same resource shape as one job array
+    :param campaign: instance of Campaign
+    :param jobs: list of prepared Job instances
+    :return: Nothing
+    """
+    shapes = dict()
+    for job in jobs:
+        shapes.setdefault(get_resource_shape(job), []).append(job)
+
+    for shape_jobs in shapes.values():
+        # the cluster submits the whole array once, every job then takes the task of its index
+        key = 'campaign_{}_{}'.format(campaign.id, uuid.uuid4().hex[:12])
+
+        for index, job in enumerate(shape_jobs):
+            submission_parameters = None
+            if len(shape_jobs) >= MINIMUM_ARRAY_SIZE:
+                submission_parameters = {
+                    'array': {
+                        'key': key,
+                        'index': index,
+                        'size': len(shape_jobs),
+                    },
+                }
+
+            queue_job(job, submission_parameters)
+
+
+def release_campaign_jobs(campaign):
+    """
+    Submits the waiting jobs of a launched campaign in order, keeping no more than the maximum number of its jobs
+    active on the cluster
+    :param campaign: instance of Campaign
+    :return: Nothing
+    """
+    if not campaign.launched:
+        return
+
+    with transaction.atomic():
+        # locking the campaign, so that jobs finishing at the same time do not release the same waiting job twice
+        campaign = Campaign.objects.select_for_update().get(id=campaign.id)
+        jobs = Job.objects.filter(campaign=campaign)
+
+        # every waiting job is tried once, even if the cluster leaves it a draft
+        tried = set()
+
+        while True:
+            slots = campaign.maximum_active_jobs - jobs.filter(job_status__in=ACTIVE_JOB_STATUSES).count()
+            waiting = list(
+                jobs.filter(job_status=JobStatus.DRAFT).exclude(id__in=tried).order_by('id')[:max(slots, 0)]
+            )
+            if not waiting:
+                break
+
+            tried.update(job.id for job in waiting)
+
+            # jobs reusing a result finish straight away and free their slot for the next waiting job
+            prepared = []
+            for job in waiting:
+                try:
+                    if prepare_job(job, BilbyJob(job_id=job.id).as_json(), campaign.user):
+                        prepared.append(job)
+                except:
+                    logger.info("Unable to prepare job {} of campaign {}".format(job.id, campaign.id))
+                    Job.objects.filter(id=job.id).update(
+                        job_status=JobStatus.ERROR,
+                        status_version=F('status_version') + 1,
+                    )
+
+            queue_campaign_jobs(campaign, prepared)
+
+
+def get_campaign_status(campaign):
+    """
+    Counts the jobs of a campaign by status
+    :param campaign: instance of Campaign
+    :return: list of tuples of the status display and the number of jobs, the number of jobs and the number of
+             finished jobs
+    """
+    counts = dict()
+    for row in Job.objects.filter(campaign=campaign).values('job_status').annotate(count=Count('id')):
+        # jobs that have not been released are drafts
+        if row['job_status'] == JobStatus.DRAFT:
+            status = WAITING
+        else:
+            status = DISPLAY_NAME_MAP_HPC_JOB.get(row['job_status'], row['job_status'])
+        counts[status] = counts.get(status, 0) + row['count']
+
+    total = sum(counts.values())
+    finished = total - counts.get(WAITING, 0) - sum(
+        count for status, count in counts.items()
+        if status in [DISPLAY_NAME_MAP_HPC_JOB.get(job_status) for job_status in ACTIVE_JOB_STATUSES]
+    )
+
+    return [(DISPLAY_NAME_MAP.get(status, status), count) for status, count in sorted(counts.items())], total, finished
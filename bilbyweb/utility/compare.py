@@ -0,0 +1,155 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import io
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from django.core.cache import cache
+
+from .display_names import DISPLAY_NAME_MAP
+from .samples import (
+    DEFAULT_BINS,
+    fetch_posterior_samples,
+    get_parameter_names,
+    load_samples,
+)
+
+# Most jobs that can be compared at once
+MAXIMUM_COMPARED_JOBS = 5
+
+# Seconds a comparison is cached for, the samples of the finished jobs never change
+COMPARISON_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Percentiles of the lower bound, median and upper bound of the compared credible intervals
+INTERVAL_PERCENTILES = [5, 50, 95]
+
+
+def ks_statistics(samples):
+    """
+    Calculates the two sample Kolmogorov-Smirnov statistic between every pair of sample sets
+    :param samples: list of numpy arrays
+    :return: N x N numpy array of the statistics
+    """
+    # empirical distribution functions of all the sets evaluated at every sample of every set
+    grid = np.sort(np.concatenate(samples))
+    cdfs = np.array([np.searchsorted(np.sort(s), grid, side='right') / len(s) for s in samples])
+
+    return np.max(np.abs(cdfs[:, np.newaxis, :] - cdfs[np.newaxis, :, :]), axis=2)
+
+
+def js_divergences(densities):
+    """
+    Calculates the Jensen-Shannon divergence, in bits, between every pair of binned distributions
+    :param densities: N x bins numpy array of normalised histograms sharing the same bins
+    :return: N x N numpy array of the divergences
+    """
+    p = densities[:, np.newaxis, :]
+    q = densities[np.newaxis, :, :]
+    m = (p + q) / 2
+
+    # empty bins do not contribute to the divergence
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p_m = np.where(p > 0, p * np.log2(p / m), 0)
+        q_m = np.where(q > 0, q * np.log2(q / m), 0)
+
+    return (p_m.sum(axis=2) + q_m.sum(axis=2)) / 2
+
+
+def compare_parameter(samples, bins=DEFAULT_BINS):
+    """
+    Compares the posterior samples of a parameter across jobs
+    :param samples: list of numpy arrays, one per job
+    :param bins: number of bins of the marginal distributions
+    :return: Dictionary of the shared bin edges, marginal densities, intervals and pairwise statistics
+    """
+    # the same bins for every job, so that the marginals can be overlaid and compared bin by bin
+    edges = np.linspace(min(s.min() for s in samples), max(s.max() for s in samples), bins + 1)
+    counts = np.array([np.histogram(s, bins=edges)[0] for s in samples], dtype=float)
+    densities = counts / counts.sum(axis=1, keepdims=True)
+
+    intervals = np.array([np.percentile(s, INTERVAL_PERCENTILES) for s in samples])
+    widths = intervals[:, 2] - intervals[:, 0]
+
+    # a parameter fixed in a job has no width
+    with np.errstate(divide='ignore', invalid='ignore'):
+        width_ratios = widths[:, np.newaxis] / widths[np.newaxis, :]
+
+    return dict(
+        edges=edges.tolist(),
+        densities=densities.tolist(),
+        intervals=intervals.tolist(),
+        median_differences=(intervals[:, np.newaxis, 1] - intervals[np.newaxis, :, 1]).tolist(),
+        width_ratios=width_ratios.tolist(),
+        ks=ks_statistics(samples).tolist(),
+        js=js_divergences(densities).tolist(),
+    )
+
+
+def get_comparison(jobs):
+    """
+    Compares the posterior samples of the parameters shared by the jobs, fetching the samples if needed
+    :param jobs: list of finished Job instances
+    :return: Dictionary of the job ids and the comparison of every shared parameter
+    """
+    # the comparison does not depend on the order the jobs are requested in
+    jobs = sorted(jobs, key=lambda job: job.id)
+    cache_key = 'posterior_comparison_{}'.format('_'.join(str(job.id) for job in jobs))
+
+    comparison = cache.get(cache_key)
+    if comparison is None:
+        for job in jobs:
+            fetch_posterior_samples(job)
+
+        parameter_names = set(get_parameter_names(jobs[0]))
+        for job in jobs[1:]:
+            parameter_names &= set(get_parameter_names(job))
+
+        comparison = dict(
+            jobs=[job.id for job in jobs],
+            parameters=dict(),
+        )
+
+        for name in sorted(parameter_names):
+            samples = [np.asarray(load_samples(job, name), dtype=np.float64) for job in jobs]
+
+            # parameters fixed to the same value in every job have nothing to compare
+            if min(s.min() for s in samples) == max(s.max() for s in samples):
+                continue
+
+            comparison['parameters'][name] = compare_parameter(samples)
+
+        cache.set(cache_key, comparison, COMPARISON_CACHE_TIMEOUT)
+
+    return comparison
+
+
+def plot_comparison(comparison, name, labels):
+    """
+    Plots the overlaid marginal distributions of a parameter
+    :param comparison: Dictionary as returned by get_comparison
+    :param name: name of the parameter
+    :param labels: list of the legend labels, in the order of the compared jobs
+    :return: bytes of the png image
+    """
+    parameter = comparison['parameters'][name]
+    edges = np.array(parameter['edges'])
+
+    figure = Figure(figsize=(6, 4.5))
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot(1, 1, 1)
+
+    for density, label in zip(parameter['densities'], labels):
+        axes.hist(edges[:-1], bins=edges, weights=density, histtype='step', linewidth=1.5, label=label)
+
+    axes.set_xlabel(DISPLAY_NAME_MAP.get(name, name))
+    axes.set_ylabel('Probability')
+    axes.legend()
+    figure.tight_layout()
+
+    image = io.BytesIO()
+    figure.savefig(image, format='png')
+    return image.getvalue()
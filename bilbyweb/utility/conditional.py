@@ -0,0 +1,136 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import hashlib
+
+from django.contrib import messages
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .samples import has_posterior_samples
+from ..models import SubmissionAttempt, SubmissionRequest
+
+
+def get_validator(request, *parts):
+    """
+    Builds the validator (ETag) of a page, from the values the page is rendered from and the user viewing it, as the
+    actions shown depend on the permissions of the user
+    :param request: Django request object
+    :param parts: the values the page is rendered from
+    :return: the quoted ETag
+    """
+    user = request.user
+    value = '|'.join(str(part) for part in [request.get_full_path(), user.id, user.role] + list(parts))
+    return quote_etag(hashlib.md5(value.encode()).hexdigest())
+
+
+def get_jobs_validator(request, jobs, *parts):
+    """
+    Builds the validator of a page of a job list with a single aggregate query over all the jobs of the list, so that it
+    changes when a job is added, removed, updated or changes its status, and the list is ordered again
+    :param request: Django request object
+    :param jobs: QuerySet of the jobs of the list, before it is paginated
+    :param parts: other values the page is rendered from
+    :return: the quoted ETag
+    """
+    aggregate = jobs.aggregate(
+        count=Count('id'),
+        last_updated=Max('last_updated'),
+        status_versions=Sum('status_version'),
+    )
+    return get_validator(request, aggregate['count'], aggregate['last_updated'], aggregate['status_versions'], *parts)
+
+
+def get_submission_validator(job):
+    """
+    Summarises the request of a job waiting in the submission queue, as shown by the page of the job, a failed attempt
+    does not change the job itself
+    :param job: instance of Job
+    :return: tuple of the id, attempt count, next attempt time and error of the last attempt of the request, None if
+             the job is not waiting for submission
+    """
+    submission_request = SubmissionRequest.objects.filter(job=job, completion_time__isnull=True) \
+        .order_by('-creation_time') \
+        .values('id', 'attempt_count', 'next_attempt_time') \
+        .first()
+
+    if not submission_request:
+        return None
+
+    error = SubmissionAttempt.objects.filter(request_id=submission_request['id']) \
+        .order_by('-id') \
+        .values_list('error', flat=True) \
+        .first()
+
+    return (
+        submission_request['id'],
+        submission_request['attempt_count'],
+        submission_request['next_attempt_time'],
+        error,
+    )
+
+
+def get_job_validator(request, job):
+    """
+    Builds the validator of the page of a job. The outputs of a finished job do not change on the cluster, so only the
+    results fetched from the cluster once are part of it.
+    :param request: Django request object
+    :param job: instance of Job
+    :return: the quoted ETag
+    """
+    # the outputs of a job reusing the result of another job are those of that job, which may still be running
+    source = job.reused_from
+    source_parts = [source.id, source.name, source.job_status, source.last_updated] if source else [None]
+
+    return get_validator(
+        request,
+        job.id,
+        job.last_updated,
+        job.status_version,
+        job.posterior_summary is not None,
+        job.sampler_summaries is not None,
+        has_posterior_samples(job.result_job),
+        get_submission_validator(job),
+        *source_parts
+    )
+
+
+def get_queue_validator():
+    """
+    Summarises the submission queue, the positions of the waiting jobs change as the queue is drained
+    :return: tuple of the number of outstanding requests, the newest of them and the number claimed by the workers
+    """
+    aggregate = SubmissionRequest.objects.filter(completion_time__isnull=True).aggregate(
+        count=Count('id'),
+        newest=Max('id'),
+        claimed=Count('claim'),
+    )
+    return aggregate['count'], aggregate['newest'], aggregate['claimed']
+
+
+def get_not_modified_response(request, etag):
+    """
+    Answers a request with 304 Not Modified if the page cached by the browser is still valid
+    :param request: Django request object
+    :param etag: the quoted ETag of the page
+    :return: HttpResponseNotModified instance, None if the page has to be rendered
+    """
+    # the messages queued for the page would not be shown by the page cached by the browser
+    if len(messages.get_messages(request)):
+        return None
+
+    return get_conditional_response(request, etag=etag)
+
+
+def set_validator(response, etag):
+    """
+    Sets the validator of a rendered page, the browser asks for the page again with it every time it is shown
+    :param response: the rendered page
+    :param etag: the quoted ETag of the page
+    :return: the response
+    """
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,147 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from accounts.mailer.email import Email
+from accounts.models import User, OutboxEmail
+from accounts.utility import get_absolute_site_url
+
+from .campaign import ACTIVE_JOB_STATUSES
+from .display_names import DISPLAY_NAME_MAP
+from .email import templates
+from .email.email import email_notifications_jobs_done
+from ..models import Job, JobNotification
+
+# Seconds the notifications of a user are collected for before they are sent in a digest
+DIGEST_WINDOWS = {
+    User.HOURLY: 60 * 60,
+    User.DAILY: 60 * 60 * 24,
+}
+
+# Seconds the notifications of a campaign are held for at most, if some of its jobs never finish
+CAMPAIGN_DIGEST_WINDOW = 60 * 60 * 24
+
+
+def notify_jobs_done(jobs):
+    """
+    Notifies the owners of finished jobs as they prefer, by email straight away or by holding the notifications for a
+    digest
+    :param jobs: list of finished Job instances
+    :return: Nothing
+    """
+    immediate = []
+    held = []
+    for job in jobs:
+        preference = job.user.notification_preference
+
+        # jobs outside of a campaign are notified straight away for a user with a digest per campaign
+        if preference == User.IMMEDIATE or (preference == User.CAMPAIGN and not job.campaign_id):
+            immediate.append(job)
+        else:
+            held.append(JobNotification(user=job.user, job=job, campaign_id=job.campaign_id, status=job.status))
+
+    email_notifications_jobs_done(immediate)
+    JobNotification.objects.bulk_create(held)
+
+
+def get_due_digests(now):
+    """
+    Finds the digests whose window has ended, a digest holds the notifications of a user, or of a campaign of a user
+    :param now: the current time
+    :return: set of (user id, campaign id) tuples, the campaign id is None for a digest of all the jobs of the user
+    """
+    groups = JobNotification.objects.filter(sent_time__isnull=True) \
+        .values('user', 'user__notification_preference', 'campaign') \
+        .annotate(oldest=Min('creation_time'))
+
+    due = set()
+    campaign_groups = []
+    for group in groups:
+        preference = group['user__notification_preference']
+        age = (now - group['oldest']).total_seconds()
+
+        if preference in DIGEST_WINDOWS:
+            if age >= DIGEST_WINDOWS[preference]:
+                due.add((group['user'], None))
+        elif preference == User.CAMPAIGN and group['campaign'] and age < CAMPAIGN_DIGEST_WINDOW:
+            campaign_groups.append(group)
+        else:
+            # the user has changed their preference, or the campaign has been deleted or has been waiting too long
+            due.add((group['user'], group['campaign']))
+
+    # a campaign is finished once none of its jobs is waiting or active
+    unfinished = set(
+        Job.objects.filter(
+            campaign__in=[group['campaign'] for group in campaign_groups],
+            job_status__in=[JobStatus.DRAFT] + ACTIVE_JOB_STATUSES,
+        ).values_list('campaign', flat=True).distinct()
+    )
+    due.update((group['user'], group['campaign']) for group in campaign_groups if group['campaign'] not in unfinished)
+
+    return due
+
+
+def send_due_digests():
+    """
+    Queues a single email for every digest whose window has ended, listing the jobs finished since the last digest
+    :return: the number of digests queued
+    """
+    now = timezone.now()
+    due = get_due_digests(now)
+    if not due:
+        return 0
+
+    notifications = JobNotification.objects.filter(
+        sent_time__isnull=True,
+        user__in=list(set(user_id for user_id, _ in due)),
+    ).select_related('user', 'job', 'campaign').order_by('creation_time')
+
+    digests = dict()
+    for notification in notifications:
+        key = (notification.user_id, notification.campaign_id)
+        if key not in due:
+            key = (notification.user_id, None)
+            if key not in due:
+                continue
+        digests.setdefault(key, []).append(notification)
+
+    site_url = get_absolute_site_url()
+    messages = []
+    for (_, campaign_id), digest in digests.items():
+        user = digest[0].user
+        campaign = digest[0].campaign if campaign_id else None
+
+        if campaign:
+            subject = templates.JOB_DIGEST['campaign_subject'].format(campaign.name)
+        else:
+            subject = templates.JOB_DIGEST['subject'].format(len(digest))
+
+        messages.append((subject, [user.email], {
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'campaign': campaign.name if campaign else None,
+            'jobs': [
+                {
+                    'name': notification.job.name,
+                    'status': DISPLAY_NAME_MAP.get(notification.status, notification.status),
+                    'link': site_url + '/job/' + str(notification.job_id),
+                } for notification in digest
+            ],
+        }))
+
+    # the notifications are only marked as sent if their digests are queued
+    with transaction.atomic():
+        OutboxEmail.objects.bulk_create(
+            [email.as_outbox_email() for email in Email.from_contexts(templates.JOB_DIGEST['message'], messages)]
+        )
+        JobNotification.objects.filter(
+            id__in=[notification.id for digest in digests.values() for notification in digest],
+        ).update(sent_time=now)
+
+    return len(messages)
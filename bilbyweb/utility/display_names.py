@@ -106,6 +106,8 @@ SAMPLING_FREQUENCY = 'sampling_frequency'
 SAMPLING_FREQUENCY_DISPLAY = 'Sampling Frequency (Hz)'
 START_TIME = 'start_time'
 START_TIME_DISPLAY = 'Start Time'
+RANDOM_SEED = 'random_seed'
+RANDOM_SEED_DISPLAY = 'Noise Seed'
 
 HANFORD = 'hanford'
 HANFORD_DISPLAY = 'Hanford'
@@ -119,6 +121,7 @@ DISPLAY_NAME_MAP.update({
     SIGNAL_DURATION: SIGNAL_DURATION_DISPLAY,
     SAMPLING_FREQUENCY: SAMPLING_FREQUENCY_DISPLAY,
     START_TIME: START_TIME_DISPLAY,
+    RANDOM_SEED: RANDOM_SEED_DISPLAY,
     HANFORD: HANFORD_DISPLAY,
     LIVINGSTON: LIVINGSTON_DISPLAY,
     VIRGO: VIRGO_DISPLAY,
@@ -145,6 +148,24 @@ DISPLAY_NAME_MAP.update({
     BINARY_BLACK_HOLE: BINARY_BLACK_HOLE_DISPLAY,
 })
 
+# Waveform Approximant Choice
+# displays carry the relative cost so that users can pick a cheaper model for a quick look
+WAVEFORM_APPROXIMANT = 'waveform_approximant'
+WAVEFORM_APPROXIMANT_DISPLAY = 'Waveform Approximant'
+IMRPHENOMPV2 = 'IMRPhenomPv2'
+IMRPHENOMPV2_DISPLAY = 'IMRPhenomPv2 (precessing, highest cost)'
+IMRPHENOMD = 'IMRPhenomD'
+IMRPHENOMD_DISPLAY = 'IMRPhenomD (aligned spin, medium cost)'
+TAYLORF2 = 'TaylorF2'
+TAYLORF2_DISPLAY = 'TaylorF2 (inspiral only, lowest cost)'
+
+DISPLAY_NAME_MAP.update({
+    WAVEFORM_APPROXIMANT: WAVEFORM_APPROXIMANT_DISPLAY,
+    IMRPHENOMPV2: IMRPHENOMPV2_DISPLAY,
+    IMRPHENOMD: IMRPHENOMD_DISPLAY,
+    TAYLORF2: TAYLORF2_DISPLAY,
+})
+
 # Signal Parameter Choice
 MASS1 = 'mass_1'
 MASS1_DISPLAY = 'Mass 1 (M☉)'
@@ -165,6 +186,14 @@ RA_DISPLAY = 'Right Ascension (Radians)'
 DEC = 'dec'
 DEC_DISPLAY = 'Declination (Degrees)'
 
+# Parameters derived from the signal parameters
+CHIRP_MASS = 'chirp_mass'
+CHIRP_MASS_DISPLAY = 'Chirp Mass (M☉)'
+
+DISPLAY_NAME_MAP.update({
+    CHIRP_MASS: CHIRP_MASS_DISPLAY,
+})
+
 DISPLAY_NAME_MAP.update({
     MASS1: MASS1_DISPLAY,
     MASS2: MASS2_DISPLAY,
@@ -202,13 +231,101 @@ DISPLAY_NAME_MAP.update({
     EMCEE: EMCEE_DISPLAY,
 })
 
+# Samplers run alongside the sampler of the job, on the same data and likelihood
+COMPARE_SAMPLERS = 'compare_samplers'
+COMPARE_SAMPLERS_DISPLAY = 'Also Run With'
+
+DISPLAY_NAME_MAP.update({
+    COMPARE_SAMPLERS: COMPARE_SAMPLERS_DISPLAY,
+})
+
+# Likelihood Choice
+FAST_LIKELIHOOD = 'fast_likelihood'
+FAST_LIKELIHOOD_DISPLAY = 'Use Fast (ROQ) Likelihood if Available'
+LIKELIHOOD = 'likelihood'
+LIKELIHOOD_DISPLAY = 'Likelihood'
+STANDARD_LIKELIHOOD = 'standard'
+STANDARD_LIKELIHOOD_DISPLAY = 'Standard'
+ROQ_LIKELIHOOD = 'roq'
+ROQ_LIKELIHOOD_DISPLAY = 'Reduced Order Quadrature (ROQ)'
+
+DISPLAY_NAME_MAP.update({
+    FAST_LIKELIHOOD: FAST_LIKELIHOOD_DISPLAY,
+    LIKELIHOOD: LIKELIHOOD_DISPLAY,
+    STANDARD_LIKELIHOOD: STANDARD_LIKELIHOOD_DISPLAY,
+    ROQ_LIKELIHOOD: ROQ_LIKELIHOOD_DISPLAY,
+})
+
 # Sampler Parameter Choice
 NUMBER_OF_LIVE_POINTS = 'number_of_live_points'
 NUMBER_OF_LIVE_POINTS_DISPLAY = 'Number of Live Points'
 NUMBER_OF_STEPS = 'number_of_steps'
 NUMBER_OF_STEPS_DISPLAY = 'Number of Steps'
+DLOGZ = 'dlogz'
+DLOGZ_DISPLAY = 'Stopping Criterion (dlogz)'
+MAXIMUM_MCMC_STEPS = 'maximum_mcmc_steps'
+MAXIMUM_MCMC_STEPS_DISPLAY = 'Maximum MCMC Steps'
+WALK_LENGTH = 'walk_length'
+WALK_LENGTH_DISPLAY = 'Walk Length'
+NUMBER_OF_WALKERS = 'number_of_walkers'
+NUMBER_OF_WALKERS_DISPLAY = 'Number of Walkers'
+BURN_IN_AUTOCORRELATION_TIMES = 'burn_in_autocorrelation_times'
+BURN_IN_AUTOCORRELATION_TIMES_DISPLAY = 'Burn-in (Autocorrelation Times)'
 
 DISPLAY_NAME_MAP.update({
     NUMBER_OF_LIVE_POINTS: NUMBER_OF_LIVE_POINTS_DISPLAY,
     NUMBER_OF_STEPS: NUMBER_OF_STEPS_DISPLAY,
+    DLOGZ: DLOGZ_DISPLAY,
+    MAXIMUM_MCMC_STEPS: MAXIMUM_MCMC_STEPS_DISPLAY,
+    WALK_LENGTH: WALK_LENGTH_DISPLAY,
+    NUMBER_OF_WALKERS: NUMBER_OF_WALKERS_DISPLAY,
+    BURN_IN_AUTOCORRELATION_TIMES: BURN_IN_AUTOCORRELATION_TIMES_DISPLAY,
+})
+
+# Warm start of a copied job from the posterior of the job it was copied from
+WARM_START = 'warm_start'
+WARM_START_DISPLAY = 'Warm Start from the Copied Job'
+
+DISPLAY_NAME_MAP.update({
+    WARM_START: WARM_START_DISPLAY,
+})
+
+# Reuse of the result of an identical completed job
+REUSE_RESULT = 'reuse_result'
+REUSE_RESULT_DISPLAY = 'Reuse the Result of an Identical Completed Job'
+REUSED_FROM = 'reused_from'
+REUSED_FROM_DISPLAY = 'Result Reused From'
+
+DISPLAY_NAME_MAP.update({
+    REUSE_RESULT: REUSE_RESULT_DISPLAY,
+    REUSED_FROM: REUSED_FROM_DISPLAY,
+})
+
+# Parameter sweep campaigns
+GRID = 'grid'
+GRID_DISPLAY = 'Grid'
+WAITING = 'waiting'
+WAITING_DISPLAY = 'Waiting'
+
+DISPLAY_NAME_MAP.update({
+    GRID: GRID_DISPLAY,
+    WAITING: WAITING_DISPLAY,
+})
+
+# Sampler Presets
+# trade the accuracy of a run against its runtime
+SAMPLER_PRESET = 'sampler_preset'
+SAMPLER_PRESET_DISPLAY = 'Preset'
+QUICK_LOOK = 'quick_look'
+QUICK_LOOK_DISPLAY = 'Quick Look (fastest, approximate)'
+STANDARD_RUN = 'standard_run'
+STANDARD_RUN_DISPLAY = 'Standard'
+PUBLICATION = 'publication'
+PUBLICATION_DISPLAY = 'Publication (slowest, most accurate)'
+
+DISPLAY_NAME_MAP.update({
+    SAMPLER_PRESET: SAMPLER_PRESET_DISPLAY,
+    QUICK_LOOK: QUICK_LOOK_DISPLAY,
+    STANDARD_RUN: STANDARD_RUN_DISPLAY,
+    PUBLICATION: PUBLICATION_DISPLAY,
 })
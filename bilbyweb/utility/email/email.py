@@ -3,6 +3,7 @@ Distributed under the MIT License. See LICENSE.txt for more info.
 """
 
 from accounts.mailer import email
+from accounts.models import OutboxEmail
 from accounts.utility import get_absolute_site_url
 
 from ..display_names import (
@@ -17,11 +18,11 @@ from ..display_names import (
 from . import templates
 
 
-def email_notification_job_done(job):
+def get_notification_job_done(job):
     """
-    Sends out email notification to the Job owner
+    Finds the subject, the recipients and the template context of the email notification of a finished Job
     :param job: instance of a Job
-    :return: Nothing
+    :return: tuple of the subject, the list of email addresses and the context
     """
 
     job_completion_status = 'Success'
@@ -42,10 +43,33 @@ def email_notification_job_done(job):
         'job_status': job_completion_status,
     }
 
-    # sending email
+    return templates.JOB_COMPLETION['subject'].format(job_completion_status), [job.user.email], context
+
+
+def email_notification_job_done(job):
+    """
+    Queues the email notification to the Job owner
+    :param job: instance of a Job
+    :return: Nothing
+    """
+    subject, to_addresses, context = get_notification_job_done(job)
+
     email.Email(
-        subject=templates.JOB_COMPLETION['subject'].format(job_completion_status),
-        to_addresses=[job.user.email],
+        subject=subject,
+        to_addresses=to_addresses,
         template=templates.JOB_COMPLETION['message'],
         context=context,
-    ).send_email()
+    ).queue_email()
+
+
+def email_notifications_jobs_done(jobs):
+    """
+    Queues the email notifications of several finished Jobs with a single insert
+    :param jobs: list of Job instances
+    :return: Nothing
+    """
+    emails = email.Email.from_contexts(
+        templates.JOB_COMPLETION['message'],
+        [get_notification_job_done(job) for job in jobs],
+    )
+    OutboxEmail.objects.bulk_create([notification.as_outbox_email() for notification in emails])
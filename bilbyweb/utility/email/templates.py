@@ -15,3 +15,18 @@ JOB_COMPLETION['message'] = '<p>Dear {{first_name}} {{last_name}}</p>' \
                             '<p>&nbsp;</p>' \
                             '<p>Regards,</p>' \
                             '<p>BILBY Team</p>'
+
+# Digest email template that is sent to the job owner with the jobs finished since the previous digest
+JOB_DIGEST = dict()
+JOB_DIGEST['subject'] = '[BILBY-WEB] {} Job(s) Finished'
+JOB_DIGEST['campaign_subject'] = '[BILBY-WEB] Campaign {} Finished'
+JOB_DIGEST['message'] = '<p>Dear {{first_name}} {{last_name}}</p>' \
+                        '<p>{% if campaign %}The jobs of the campaign {{campaign}}{% else %}The jobs you launched' \
+                        '{% endif %} listed below have been finished processing.</p>' \
+                        '<ul>{% for job in jobs %}' \
+                        '<li><a href="{{job.link}}" target="_blank">{{job.name}}</a>: {{job.status}}</li>' \
+                        '{% endfor %}</ul>' \
+                        '<p>Thank you very much for using Bilby.</p>' \
+                        '<p>&nbsp;</p>' \
+                        '<p>Regards,</p>' \
+                        '<p>BILBY Team</p>'
@@ -6,6 +6,7 @@ import json
 import uuid
 
 from ..utility.display_names import (
+    NUMBER_OF_WALKERS,
     OPEN_DATA,
     SIMULATED_DATA,
     BINARY_BLACK_HOLE,
@@ -26,7 +27,15 @@ from ..utility.display_names import (
     WALL_TIME_EXCEEDED,
     OUT_OF_MEMORY,
     PUBLIC,
+    STANDARD_RUN,
+    STANDARD_LIKELIHOOD,
+    ROQ_LIKELIHOOD,
+    ROQ_LIKELIHOOD_DISPLAY,
+    STANDARD_LIKELIHOOD_DISPLAY,
 )
+from ..utility.likelihood import find_roq_basis_for_job
+from ..utility.submission import queue_job
+from ..utility.warm_start import get_warm_start_parent, get_warm_start_interval_multiple, narrow_prior_range
 
 from ..models import (
     Job,
@@ -37,6 +46,7 @@ from ..models import (
     Prior,
     Sampler,
     SamplerParameter,
+    SubmissionRequest,
 )
 
 from ..forms.signal.signal_parameter import BBH_FIELDS_PROPERTIES
@@ -45,6 +55,34 @@ from ..forms.data.data_simulated import DATA_FIELDS_PROPERTIES as SIMULATED_DATA
 from ..forms.sampler.sampler_dynesty import DYNESTY_FIELDS_PROPERTIES
 from ..forms.sampler.sampler_nestle import NESTLE_FIELDS_PROPERTIES
 from ..forms.sampler.sampler_emcee import EMCEE_FIELDS_PROPERTIES
+from ..forms.sampler.sampler_dynesty import DYNESTY_PRESETS
+from ..forms.sampler.sampler_nestle import NESTLE_PRESETS
+from ..forms.sampler.sampler_emcee import EMCEE_PRESETS
+
+# Walltime (in seconds) of the first submission of a job, same as the default of the cluster side scheduler
+DEFAULT_WALLTIME = 60 * 60 * 24
+
+# Maximum walltime (in seconds) that a resumed job can request
+MAXIMUM_WALLTIME = 60 * 60 * 24 * 7
+
+# Samplers that can resume from a checkpoint
+RESUMABLE_SAMPLERS = [DYNESTY, ]
+
+# Sampler parameters of the samplers run alongside the sampler of a job
+COMPARE_SAMPLER_PARAMETERS = {
+    DYNESTY: DYNESTY_PRESETS[STANDARD_RUN],
+    NESTLE: NESTLE_PRESETS[STANDARD_RUN],
+    EMCEE: EMCEE_PRESETS[STANDARD_RUN],
+}
+
+
+def get_resume_walltime(resume_count):
+    """
+    Finds the walltime for a resubmission, doubling the walltime for every resume
+    :param resume_count: number of times the job has been resumed including this one
+    :return: walltime in seconds
+    """
+    return min(DEFAULT_WALLTIME * 2 ** resume_count, MAXIMUM_WALLTIME)
 
 
 def clone_job_data(from_job, to_job):
@@ -81,6 +119,7 @@ def clone_job_data(from_job, to_job):
             job=to_job,
             signal_choice=from_signal.signal_choice,
             signal_model=from_signal.signal_model,
+            waveform_approximant=from_signal.waveform_approximant,
         )
     except Signal.DoesNotExist:
         pass
@@ -113,6 +152,8 @@ def clone_job_data(from_job, to_job):
         sampler_created = Sampler.objects.create(
             job=to_job,
             sampler_choice=from_sampler.sampler_choice,
+            fast_likelihood=from_sampler.fast_likelihood,
+            compare_samplers=from_sampler.compare_samplers,
         )
     except Sampler.DoesNotExist:
         pass
@@ -162,6 +203,9 @@ class BilbyJob(object):
     # what actions a user can perform on this job
     job_actions = None
 
+    # position of the job in the submission queue, None if the job is not waiting to be submitted
+    queue_position = None
+
     def clone_as_draft(self, user):
         """
         Clones the bilby job for the user as a Draft Job
@@ -189,6 +233,7 @@ class BilbyJob(object):
             name=name,
             user=user,
             description=self.job.description,
+            parent=self.job,
         )
 
         # copying other parameters of the job
@@ -196,6 +241,19 @@ class BilbyJob(object):
 
         return cloned
 
+    def resume(self):
+        """
+        Queues the job to continue from the checkpoint in its working directory with a longer walltime, the resume count
+        is only incremented once the worker has submitted it
+        :return: Nothing
+        """
+        # the stored json representation is kept as it was launched
+        queue_job(self.job, {
+            'resume': {
+                'walltime': get_resume_walltime(self.job.resume_count + 1),
+            },
+        })
+
     def list_actions(self, user):
         """
         List the actions a user can perform on this Job
@@ -220,14 +278,21 @@ class BilbyJob(object):
             if self.job.status in [DRAFT, COMPLETED, ERROR, CANCELLED, WALL_TIME_EXCEEDED, OUT_OF_MEMORY, PUBLIC]:
                 self.job_actions.append('delete')
 
-            # edit a job if it is a draft
-            if self.job.status in [DRAFT]:
+            # edit a job if it is a draft, the jobs of a campaign are generated from the draft of the campaign
+            # and can generate parameter sweeps themselves
+            if self.job.status in [DRAFT] and not self.job.campaign_id:
                 self.job_actions.append('edit')
+                self.job_actions.append('sweep')
 
             # cancel a job if it is not finished processing
             if self.job.status in [PENDING, SUBMITTED, QUEUED, IN_PROGRESS]:
                 self.job_actions.append('cancel')
 
+            # a job stopped before finishing can be resumed from its checkpoint if the sampler supports it
+            if self.job.status in [WALL_TIME_EXCEEDED, CANCELLED] and self.job.json_representation and \
+                    Sampler.objects.filter(job=self.job, sampler_choice__in=RESUMABLE_SAMPLERS).exists():
+                self.job_actions.append('resume')
+
             # completed job can be public and vice versa
             if self.job.status in [COMPLETED]:
                 self.job_actions.append('make_it_public')
@@ -266,7 +331,11 @@ class BilbyJob(object):
                     self.data_parameters.append(all_data_parameters.get(name=name))
             elif self.data.data_choice == SIMULATED_DATA:
                 for name in SIMULATED_DATA_FIELDS_PROPERTIES.keys():
-                    self.data_parameters.append(all_data_parameters.get(name=name))
+                    try:
+                        self.data_parameters.append(all_data_parameters.get(name=name))
+                    except DataParameter.DoesNotExist:
+                        # the seed is optional, it is not stored when it is left empty
+                        pass
 
         # populating signal tab information
         try:
@@ -302,15 +371,104 @@ class BilbyJob(object):
             # finding the correct sampler parameters for the sampler type
             all_sampler_parameters = SamplerParameter.objects.filter(sampler=self.sampler)
 
+            sampler_parameter_names = []
             if self.sampler.sampler_choice == DYNESTY:
-                for name in DYNESTY_FIELDS_PROPERTIES.keys():
-                    self.sampler_parameters.append(all_sampler_parameters.get(name=name))
+                sampler_parameter_names = DYNESTY_FIELDS_PROPERTIES.keys()
             elif self.sampler.sampler_choice == NESTLE:
-                for name in NESTLE_FIELDS_PROPERTIES.keys():
-                    self.sampler_parameters.append(all_sampler_parameters.get(name=name))
+                sampler_parameter_names = NESTLE_FIELDS_PROPERTIES.keys()
             elif self.sampler.sampler_choice == EMCEE:
-                for name in EMCEE_FIELDS_PROPERTIES.keys():
+                sampler_parameter_names = EMCEE_FIELDS_PROPERTIES.keys()
+
+            for name in sampler_parameter_names:
+                try:
                     self.sampler_parameters.append(all_sampler_parameters.get(name=name))
+                except SamplerParameter.DoesNotExist:
+                    # jobs saved before the convergence controls were introduced do not have them
+                    pass
+
+    @property
+    def roq_basis(self):
+        """
+        Finds the ROQ basis to be used for the job
+        :return: name of the basis, None if the job will use the standard likelihood
+        """
+        if not self.sampler or not self.sampler.fast_likelihood:
+            return None
+
+        return find_roq_basis_for_job(self)
+
+    @property
+    def warm_start_parent(self):
+        """
+        Finds the job the bilby job starts from the posterior of
+        :return: the parent Job, None if the job is not warm started
+        """
+        if not self.sampler or not self.sampler.warm_start:
+            return None
+
+        return get_warm_start_parent(self.job)
+
+    @property
+    def posterior_summary(self):
+        """
+        Finds the posterior summary of the job
+        :return: Dictionary of the summary, None if it has not been fetched from the cluster
+        """
+        if not self.job.posterior_summary:
+            return None
+
+        return json.loads(self.job.posterior_summary)
+
+    @property
+    def submission_request(self):
+        """
+        Finds the request of a job waiting in the submission queue
+        :return: instance of SubmissionRequest, None if the job is not waiting for submission
+        """
+        return SubmissionRequest.objects.filter(job=self.job, completion_time__isnull=True) \
+            .order_by('-creation_time') \
+            .first()
+
+    @property
+    def sampler_comparison(self):
+        """
+        Lines up the posterior summaries of the samplers of a job that ran several samplers
+        :return: Dictionary of the sampler names and rows of the parameters, log evidence and runtime with one entry
+                 per sampler, None if the job ran a single sampler or the summaries have not been fetched
+        """
+        if not self.sampler or not self.sampler.compare_sampler_list or not self.job.sampler_summaries:
+            return None
+
+        summary = self.posterior_summary
+        if not summary:
+            return None
+
+        summaries = json.loads(self.job.sampler_summaries)
+        samplers = [self.sampler.sampler_choice] + [s for s in self.sampler.compare_sampler_list if s in summaries]
+        summaries = [summary] + [summaries[s] for s in samplers[1:]]
+
+        parameter_names = sorted(set().union(*[s.get('parameters', dict()).keys() for s in summaries]))
+
+        return dict(
+            samplers=samplers,
+            parameters=[
+                (name, [s.get('parameters', dict()).get(name) for s in summaries]) for name in parameter_names
+            ],
+            log_evidence=[(s.get('log_evidence'), s.get('log_evidence_err')) for s in summaries],
+            runtime=[s.get('runtime') for s in summaries],
+        )
+
+    @property
+    def likelihood_display(self):
+        """
+        Finds the display of the likelihood the job will use
+        :return: String of likelihood display
+        """
+        roq_basis = self.roq_basis
+        if roq_basis:
+            return '{} ({} basis)'.format(ROQ_LIKELIHOOD_DISPLAY, roq_basis)
+
+        return STANDARD_LIKELIHOOD_DISPLAY
 
     def __new__(cls, *args, **kwargs):
         """
@@ -355,6 +513,18 @@ class BilbyJob(object):
                     signal_parameter.name: signal_parameter.value,
                 })
 
+        # the waveform approximant is used for the signal model even if no signal is injected
+        if self.signal:
+            signal_dict.update({
+                'waveform_approximant': self.signal.waveform_approximant,
+            })
+
+        # a warm started job narrows its uniform priors around the posterior of its parent
+        warm_start_parent = self.warm_start_parent
+        if warm_start_parent:
+            parent_parameters = json.loads(warm_start_parent.posterior_summary).get('parameters', dict())
+            interval_multiple = get_warm_start_interval_multiple()
+
         # processing prior dict
         priors_dict = dict()
         if self.priors:
@@ -368,9 +538,13 @@ class BilbyJob(object):
                         'value': prior.fixed_value,
                     })
                 elif prior.prior_choice == UNIFORM:
+                    minimum, maximum = prior.uniform_min_value, prior.uniform_max_value
+                    if warm_start_parent and prior.name in parent_parameters:
+                        minimum, maximum = narrow_prior_range(
+                            minimum, maximum, parent_parameters[prior.name], interval_multiple)
                     prior_dict.update({
-                        'min': prior.uniform_min_value,
-                        'max': prior.uniform_max_value,
+                        'min': minimum,
+                        'max': maximum,
                     })
                 priors_dict.update({
                     prior.name: prior_dict,
@@ -387,6 +561,37 @@ class BilbyJob(object):
                     sampler_parameter.name: sampler_parameter.value,
                 })
 
+            # the walkers of a warm started emcee job start from the parent's samples, so their number has to be known
+            # when the job is built, the form defaults an empty number of walkers to the standard preset
+            if warm_start_parent and self.sampler.sampler_choice == EMCEE and not sampler_dict.get(NUMBER_OF_WALKERS):
+                sampler_dict.update({
+                    NUMBER_OF_WALKERS: str(EMCEE_PRESETS[STANDARD_RUN][NUMBER_OF_WALKERS]),
+                })
+
+        # the samplers run alongside the sampler of the job use the standard preset, the first is the job sampler
+        samplers_list = None
+        if self.sampler and self.sampler.compare_sampler_list:
+            samplers_list = [sampler_dict]
+            for sampler in self.sampler.compare_sampler_list:
+                compare_sampler_dict = dict(type=sampler)
+                compare_sampler_dict.update({
+                    name: str(value) for name, value in COMPARE_SAMPLER_PARAMETERS[sampler].items()
+                })
+                samplers_list.append(compare_sampler_dict)
+
+        # processing likelihood dict
+        # falls back to the standard likelihood if no ROQ basis covers the job
+        roq_basis = self.roq_basis
+        if roq_basis:
+            likelihood_dict = {
+                'type': ROQ_LIKELIHOOD,
+                'roq_basis': roq_basis,
+            }
+        else:
+            likelihood_dict = {
+                'type': STANDARD_LIKELIHOOD,
+            }
+
         # accumulating all in one dict
         json_dict = dict(
             name=self.job.name,
@@ -395,7 +600,21 @@ class BilbyJob(object):
             signal=signal_dict,
             priors=priors_dict,
             sampler=sampler_dict,
+            likelihood=likelihood_dict,
         )
 
+        if samplers_list:
+            json_dict.update({
+                'samplers': samplers_list,
+            })
+
+        # the posterior samples of the parent are added on submission
+        if warm_start_parent:
+            json_dict.update({
+                'warm_start': {
+                    'parent': warm_start_parent.id,
+                },
+            })
+
         # returning json with correct indentation
         return json.dumps(json_dict, indent=4)
@@ -0,0 +1,146 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django.conf import settings
+
+from .display_names import (
+    FIXED,
+    UNIFORM,
+    MASS1,
+    MASS2,
+    SIGNAL_DURATION,
+    IMRPHENOMPV2,
+)
+
+# Reduced Order Quadrature bases available on the cluster, keyed by the name of their directory inside the
+# configured ROQ basis directory. A basis can only be used when the signal duration and the approximant match
+# and the chirp mass range of the priors falls inside the basis range.
+# This can be overridden using ROQ_BASES in the settings.
+ROQ_BASES = {
+    '4s': {
+        'duration': 4,
+        'chirp_mass_min': 12.3,
+        'chirp_mass_max': 45.0,
+        'approximant': IMRPHENOMPV2,
+    },
+    '8s': {
+        'duration': 8,
+        'chirp_mass_min': 7.9,
+        'chirp_mass_max': 14.8,
+        'approximant': IMRPHENOMPV2,
+    },
+    '16s': {
+        'duration': 16,
+        'chirp_mass_min': 5.2,
+        'chirp_mass_max': 9.5,
+        'approximant': IMRPHENOMPV2,
+    },
+    '32s': {
+        'duration': 32,
+        'chirp_mass_min': 3.4,
+        'chirp_mass_max': 6.2,
+        'approximant': IMRPHENOMPV2,
+    },
+    '64s': {
+        'duration': 64,
+        'chirp_mass_min': 2.1,
+        'chirp_mass_max': 4.0,
+        'approximant': IMRPHENOMPV2,
+    },
+    '128s': {
+        'duration': 128,
+        'chirp_mass_min': 1.4,
+        'chirp_mass_max': 2.6,
+        'approximant': IMRPHENOMPV2,
+    },
+}
+
+
+def get_roq_bases():
+    """
+    Finds the ROQ bases available on the cluster
+    :return: Dictionary of basis name and basis properties
+    """
+    try:
+        return settings.ROQ_BASES
+    except AttributeError:
+        return ROQ_BASES
+
+
+def chirp_mass(mass_1, mass_2):
+    """
+    Calculates the chirp mass of a binary
+    :param mass_1: mass of the heavier object
+    :param mass_2: mass of the lighter object
+    :return: chirp mass
+    """
+    return (mass_1 * mass_2) ** 0.6 / (mass_1 + mass_2) ** 0.2
+
+
+def get_prior_range(prior):
+    """
+    Finds the range of values a prior can take
+    :param prior: instance of Prior model
+    :return: minimum and maximum value, None if not determinable
+    """
+    if prior.prior_choice == FIXED:
+        return prior.fixed_value, prior.fixed_value
+    elif prior.prior_choice == UNIFORM:
+        return prior.uniform_min_value, prior.uniform_max_value
+
+    return None, None
+
+
+def find_roq_basis(duration, chirp_mass_min, chirp_mass_max, approximant):
+    """
+    Finds a ROQ basis that covers the signal duration and the chirp mass range
+    :param duration: signal duration in seconds
+    :param chirp_mass_min: minimum chirp mass allowed by the priors
+    :param chirp_mass_max: maximum chirp mass allowed by the priors
+    :param approximant: the waveform approximant of the signal model
+    :return: name of the basis, None if no basis is suitable
+    """
+    # sorting makes the choice deterministic when the bases overlap
+    for name, basis in sorted(get_roq_bases().items(), key=lambda item: item[1].get('duration')):
+        if float(basis.get('duration')) != float(duration):
+            continue
+        if basis.get('approximant') != approximant:
+            continue
+        if basis.get('chirp_mass_min') <= chirp_mass_min and chirp_mass_max <= basis.get('chirp_mass_max'):
+            return name
+
+    return None
+
+
+def find_roq_basis_for_job(bilby_job):
+    """
+    Finds a ROQ basis that can be used for a bilby job
+    :param bilby_job: instance of a BilbyJob
+    :return: name of the basis, None if no basis is suitable
+    """
+    if not (bilby_job.data_parameters and bilby_job.signal and bilby_job.priors):
+        return None
+
+    duration = None
+    for data_parameter in bilby_job.data_parameters:
+        if data_parameter.name == SIGNAL_DURATION:
+            duration = data_parameter.value
+
+    mass_ranges = dict()
+    for prior in bilby_job.priors:
+        if prior.name in [MASS1, MASS2]:
+            mass_ranges[prior.name] = get_prior_range(prior)
+
+    try:
+        duration = float(duration)
+        mass_1_min, mass_1_max = mass_ranges[MASS1]
+        mass_2_min, mass_2_max = mass_ranges[MASS2]
+
+        # chirp mass increases with both of the component masses
+        chirp_mass_min = chirp_mass(mass_1_min, mass_2_min)
+        chirp_mass_max = chirp_mass(mass_1_max, mass_2_max)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    return find_roq_basis(duration, chirp_mass_min, chirp_mass_max, bilby_job.signal.waveform_approximant)
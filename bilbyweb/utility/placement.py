@@ -0,0 +1,218 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+from django_hpc_job_controller.models import HpcCluster
+
+from ..models import Job, SubmissionRequest
+
+logger = logging.getLogger(__name__)
+
+# Seconds the loads of the clusters are cached for by a process, the cache is local to every process, so a web
+# process polls the loads itself once they expire.
+# This can be overridden using CLUSTER_LOAD_CACHE_TIMEOUT in the settings.
+CLUSTER_LOAD_CACHE_TIMEOUT = 60 * 5
+
+# Seconds between two polls of the loads of the clusters.
+# This can be overridden using CLUSTER_POLL_INTERVAL in the settings.
+CLUSTER_POLL_INTERVAL = 60
+
+# Most recent jobs of a cluster its start latency is averaged over
+START_LATENCY_HISTORY = 100
+
+# Seconds a job is expected to wait to start on a cluster that has not run any job yet
+DEFAULT_START_LATENCY = 60
+
+CLUSTER_LOAD_CACHE_KEY = 'cluster_loads'
+
+
+def get_placement_setting(name, default):
+    """
+    Finds a setting of the placement of jobs on the clusters
+    :param name: name of the setting
+    :param default: value if the setting is not set
+    :return: the value of the setting
+    """
+    try:
+        return getattr(settings, name)
+    except AttributeError:
+        return default
+
+
+def get_start_latency(cluster):
+    """
+    Averages the seconds the recent jobs of a cluster waited between being submitted and starting to run
+    :param cluster: instance of HpcCluster
+    :return: the mean latency in seconds, None if no job has run on the cluster yet
+    """
+    started = SubmissionRequest.objects.filter(
+        job__cluster=cluster,
+        failed=False,
+        completion_time__isnull=False,
+        job__job_running_time__isnull=False,
+    ).order_by('-completion_time').values_list('completion_time', 'job__job_running_time')[:START_LATENCY_HISTORY]
+
+    latencies = [max((running_time - submission_time).total_seconds(), 0) for submission_time, running_time in started]
+    if not latencies:
+        return None
+
+    return sum(latencies) / len(latencies)
+
+
+def poll_cluster_loads():
+    """
+    Gathers the queue depth, the number of running jobs and the start latency of every connected cluster, and caches
+    them for the placement of the jobs. The queue depth and the running jobs are counted from the jobs of this site
+    only, the jobs other users run on a shared cluster are not seen, so they are an approximation of the load.
+    :return: Dictionary of the loads keyed by cluster id
+    """
+    loads = dict()
+    for cluster in HpcCluster.objects.all():
+        # jobs can not be submitted to a cluster that is offline
+        if cluster.is_connected() is None:
+            continue
+
+        loads[cluster.id] = dict(
+            queued=0,
+            running=0,
+            start_latency=get_start_latency(cluster),
+        )
+
+    # the statuses of the jobs of this site are kept up to date by the job controller, so this is its own backlog on
+    # every cluster
+    for row in Job.objects.filter(
+            cluster__in=list(loads.keys()),
+            job_status__in=[JobStatus.SUBMITTING, JobStatus.SUBMITTED, JobStatus.QUEUED, JobStatus.RUNNING],
+    ).values('cluster', 'job_status').annotate(count=Count('id')):
+        if row['job_status'] == JobStatus.RUNNING:
+            loads[row['cluster']]['running'] += row['count']
+        else:
+            loads[row['cluster']]['queued'] += row['count']
+
+    cache.set(CLUSTER_LOAD_CACHE_KEY, loads,
+              get_placement_setting('CLUSTER_LOAD_CACHE_TIMEOUT', CLUSTER_LOAD_CACHE_TIMEOUT))
+
+    return loads
+
+
+def get_cluster_loads():
+    """
+    Finds the cached loads of the clusters, polling them if the poller has not run recently
+    :return: Dictionary of the loads keyed by cluster id
+    """
+    loads = cache.get(CLUSTER_LOAD_CACHE_KEY)
+    if loads is None:
+        loads = poll_cluster_loads()
+    return loads
+
+
+def get_expected_wait(load):
+    """
+    Estimates the seconds a new job waits to start on a cluster. The historical start latency is scaled by the number
+    of jobs queued ahead of it for every running job, as the running jobs are the ones that free the slots.
+    :param load: Dictionary of the load of the cluster, as polled by poll_cluster_loads
+    :return: the expected wait in seconds
+    """
+    start_latency = load['start_latency']
+    if start_latency is None:
+        start_latency = DEFAULT_START_LATENCY
+
+    return start_latency * (load['queued'] + 1) / (load['running'] + 1)
+
+
+def choose_cluster_id(loads):
+    """
+    Chooses the cluster with the shortest expected wait
+    :param loads: Dictionary of the loads keyed by cluster id
+    :return: id of the cluster, None if no cluster is connected
+    """
+    if not loads:
+        return None
+
+    return min(loads.keys(), key=lambda cluster_id: (get_expected_wait(loads[cluster_id]), cluster_id))
+
+
+def get_array_key(parameters):
+    """
+    Finds the job array a job is submitted in
+    :param parameters: json of the submission parameters of the job
+    :return: key of the job array, None if the job is submitted on its own
+    """
+    if not parameters:
+        return None
+    return json.loads(parameters).get('array', dict()).get('key')
+
+
+def get_array_cluster_id(array_key):
+    """
+    Finds the cluster a job array has been placed on, every job of an array runs on the same cluster
+    :param array_key: key of the job array
+    :return: id of the cluster, None if no job of the array has been placed yet
+    """
+    return SubmissionRequest.objects.filter(
+        submission_parameters__contains='"key": {}'.format(json.dumps(array_key)),
+        job__cluster__isnull=False,
+    ).values_list('job__cluster_id', flat=True).first()
+
+
+def choose_cluster(job, parameters=None):
+    """
+    Chooses the cluster a job is submitted to. A job that has run before stays on its cluster, so that it resumes from
+    the checkpoint in its working directory.
+    :param job: instance of Job
+    :param parameters: json of the submission parameters of the job
+    :return: instance of HpcCluster, None if no cluster is connected
+    """
+    if job.cluster:
+        return job.cluster
+
+    array_key = get_array_key(parameters)
+    cluster_id = get_array_cluster_id(array_key) if array_key else None
+    if cluster_id is None:
+        cluster_id = choose_cluster_id(get_cluster_loads())
+
+    if cluster_id is None:
+        return None
+
+    return HpcCluster.objects.get(id=cluster_id)
+
+
+def place_jobs(requests):
+    """
+    Places the jobs of a batch of submission requests on the clusters before they are submitted, counting every placed
+    job in the load of its cluster so that the batch is spread across the clusters
+    :param requests: list of SubmissionRequest instances with their jobs
+    :return: Nothing
+    """
+    loads = get_cluster_loads()
+    clusters = {cluster.id: cluster for cluster in HpcCluster.objects.filter(id__in=list(loads.keys()))}
+    array_cluster_ids = dict()
+
+    for request in requests:
+        job = request.job
+        if job.cluster_id:
+            continue
+
+        array_key = get_array_key(request.submission_parameters)
+        cluster_id = array_cluster_ids.get(array_key) if array_key else None
+        if cluster_id is None and array_key:
+            cluster_id = get_array_cluster_id(array_key)
+        if cluster_id is None:
+            cluster_id = choose_cluster_id(loads)
+
+        # no cluster is connected, the submission fails and is retried later
+        if cluster_id not in clusters:
+            continue
+
+        job.cluster = clusters[cluster_id]
+        loads[cluster_id]['queued'] += 1
+        if array_key:
+            array_cluster_ids[array_key] = cluster_id
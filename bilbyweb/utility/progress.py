@@ -0,0 +1,52 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import json
+
+from django.core.cache import cache
+
+# Path of the progress file written by the bilby json wrapper, relative to the job working directory
+PROGRESS_FILE_PATH = 'output/progress.txt'
+
+# Seconds the progress file is cached for, all the clients polling a job within this time share one remote fetch
+PROGRESS_CACHE_TIMEOUT = 15
+
+
+def get_progress_content(job):
+    """
+    Fetches the content of the progress file of a job, using the cached copy if there is one
+    :param job: instance of Job
+    :return: bytes of the progress file
+    """
+    cache_key = 'job_progress_{}'.format(job.id)
+
+    content = cache.get(cache_key)
+    if content is None:
+        response = job.fetch_remote_file(PROGRESS_FILE_PATH)
+        content = b''.join(response.streaming_content)
+        cache.set(cache_key, content, PROGRESS_CACHE_TIMEOUT)
+
+    return content
+
+
+def get_progress_records(content, offset=0):
+    """
+    Parses the progress records appended after an offset
+    :param content: bytes of the progress file
+    :param offset: number of bytes the client has already processed
+    :return: new offset, list of progress records
+    """
+    # a smaller file means it has been replaced, so everything is new to the client
+    if offset < 0 or offset > len(content):
+        offset = 0
+
+    # only complete lines are returned, a partially written record is returned in a later request
+    end = max(content.rfind(b'\n') + 1, offset)
+
+    records = []
+    for line in content[offset:end].decode('utf-8').splitlines():
+        if line:
+            records.append(json.loads(line))
+
+    return end, records
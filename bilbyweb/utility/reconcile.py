@@ -0,0 +1,114 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django.db import transaction
+from django.db.models import Case, When, Value, F
+from django.utils import timezone
+
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+from django_hpc_job_controller.models import HpcJob
+
+from .campaign import release_campaign_jobs
+from .display_names import (
+    COMPLETED,
+    ERROR,
+    WALL_TIME_EXCEEDED,
+    OUT_OF_MEMORY,
+    CANCELLED,
+)
+from .digest import notify_jobs_done
+from ..models import Job, Campaign
+
+# Statuses the owner of a job is notified of by email
+NOTIFICATION_STATUSES = [COMPLETED, ERROR, WALL_TIME_EXCEEDED, OUT_OF_MEMORY]
+
+# Statuses of the jobs that have stopped processing, their slot in a campaign is free again
+FINISHED_STATUSES = NOTIFICATION_STATUSES + [CANCELLED]
+
+# Job statuses that finish a job on the cluster, the finished time of the job is set when it reaches one of them
+FINISHED_JOB_STATUSES = [
+    JobStatus.COMPLETED,
+    JobStatus.ERROR,
+    JobStatus.WALL_TIME_EXCEEDED,
+    JobStatus.OUT_OF_MEMORY,
+    JobStatus.CANCELLED,
+]
+
+
+def get_time_update(field, job_ids, now):
+    """
+    Builds the expression setting a time field of the jobs in a list, leaving it as it is for the other jobs
+    :param field: name of the time field
+    :param job_ids: ids of the jobs whose field is set
+    :param now: the time to set
+    :return: Case expression for QuerySet.update
+    """
+    return Case(When(id__in=job_ids, then=Value(now)), default=F(field), output_field=HpcJob._meta.get_field(field))
+
+
+def apply_job_statuses(statuses):
+    """
+    Applies new statuses to a batch of jobs with one UPDATE. The statuses are compared in memory with a single read of
+    the jobs, and only the jobs whose status changes are written.
+    :param statuses: Dictionary of the new job status (one of JobStatus) keyed by job id
+    :return: list of the Job instances whose status changed, updated in memory
+    """
+    jobs = Job.objects.filter(id__in=list(statuses.keys())).select_related('user')
+    changed = [job for job in jobs if job.job_status != statuses[job.id]]
+    if not changed:
+        return []
+
+    now = timezone.now()
+    changed_ids = [job.id for job in changed]
+    running_ids = [job.id for job in changed if statuses[job.id] == JobStatus.RUNNING]
+    finished_ids = [job.id for job in changed if statuses[job.id] in FINISHED_JOB_STATUSES]
+
+    with transaction.atomic():
+        # the status and the times are fields of the HpcJob table, the last updated time of the Job table
+        HpcJob.objects.filter(id__in=changed_ids).update(
+            job_status=Case(
+                *[When(id=job.id, then=Value(statuses[job.id])) for job in changed],
+                output_field=HpcJob._meta.get_field('job_status')
+            ),
+            job_running_time=get_time_update('job_running_time', running_ids, now),
+            job_finished_time=get_time_update('job_finished_time', finished_ids, now),
+        )
+        Job.objects.filter(id__in=changed_ids).update(last_updated=now, status_version=F('status_version') + 1)
+
+    for job in changed:
+        job.job_status = statuses[job.id]
+        job.last_updated = now
+        job.status_version += 1
+        if job.id in running_ids:
+            job.job_running_time = now
+        if job.id in finished_ids:
+            job.job_finished_time = now
+
+        # the job is as stored now, saving it later does not notify the owner again
+        job.take_snapshot(['job_status', 'last_updated', 'status_version', 'job_running_time', 'job_finished_time'])
+
+    return changed
+
+
+def reconcile_job_statuses(statuses):
+    """
+    Applies new statuses to a batch of jobs, then queues the notifications to the owners of the jobs that finished and
+    releases the waiting jobs of their campaigns, as saving every job on its own would
+    :param statuses: Dictionary of the new job status (one of JobStatus) keyed by job id
+    :return: list of the Job instances whose status changed
+    """
+    # the notifications are queued in the same transaction as the statuses
+    with transaction.atomic():
+        changed = apply_job_statuses(statuses)
+        notify_jobs_done([job for job in changed if job.status in NOTIFICATION_STATUSES])
+
+    # every campaign is released once, however many of its jobs finished
+    campaign_ids = set(
+        job.campaign_id for job in changed
+        if job.campaign_id and not job.reused_from_id and job.status in FINISHED_STATUSES
+    )
+    for campaign in Campaign.objects.filter(id__in=campaign_ids):
+        release_campaign_jobs(campaign)
+
+    return changed
@@ -0,0 +1,108 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.db.models import Q
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from .display_names import PUBLIC, NONE
+from .summary import index_posterior_summary
+from ..models import Job
+
+logger = logging.getLogger(__name__)
+
+# Keys of the json representation that do not change the result of a job
+IGNORED_KEYS = [
+    'name',
+    'description',
+]
+
+
+def get_content_hash(json_representation):
+    """
+    Calculates the hash of the parameters of a job, identical for jobs that would produce the same result
+    :param json_representation: json representation of the job
+    :return: hex digest of the hash, None if the json is not valid
+    """
+    try:
+        job_parameters = json.loads(json_representation)
+    except ValueError:
+        return None
+
+    for key in IGNORED_KEYS:
+        job_parameters.pop(key, None)
+
+    # canonical form, so that the order of the keys and the formatting do not matter
+    canonical = json.dumps(job_parameters, sort_keys=True, separators=(',', ':'))
+
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def find_reusable_job(job, user):
+    """
+    Finds a completed job, owned by the user or public, with the same parameters as the job
+    :param job: instance of Job with its content hash set
+    :param user: the user submitting the job
+    :return: instance of Job, None if there is no such job
+    """
+    return Job.objects.filter(
+        content_hash=job.content_hash,
+        job_status=JobStatus.COMPLETED,
+        # the original job is the one that has the outputs on the cluster
+        reused_from__isnull=True,
+    ).filter(
+        Q(user=user) | Q(extra_status=PUBLIC),
+    ).exclude(
+        id=job.id,
+    ).order_by('-last_updated').first()
+
+
+def reuse_job(job, source):
+    """
+    Links a job to the result of a completed job instead of running it
+    :param job: instance of Job
+    :param source: the completed Job whose result is reused
+    :return: Nothing
+    """
+    job.reused_from = source
+    job.posterior_summary = source.posterior_summary
+    job.job_status = JobStatus.COMPLETED
+    job.save()
+
+    if job.posterior_summary:
+        index_posterior_summary(job, json.loads(job.posterior_summary))
+
+
+def delete_launched_job(job):
+    """
+    Deletes a job that has been launched. The working directory of a job is only deleted on the cluster if no other job
+    reuses its outputs, as these jobs, possibly of other users, show their results from it.
+    :param job: instance of Job
+    :return: Nothing
+    """
+    # cancelling the public status if deleted
+    job.extra_status = NONE
+
+    # a job reusing a result was never submitted, it has nothing on the cluster
+    # the outputs of a job reused by other jobs are kept on the cluster
+    if job.reused_from_id or job.reused_by.exclude(job_status=JobStatus.DELETED).exists():
+        job.job_status = JobStatus.DELETED
+        job.save()
+
+        # the outputs kept for the jobs reusing them are deleted with the last of these jobs
+        source = job.reused_from
+        if source and source.job_status == JobStatus.DELETED and \
+                not source.reused_by.exclude(job_status=JobStatus.DELETED).exists():
+            try:
+                source.delete_job()
+            except Exception as e:
+                logger.info("Unable to delete the outputs of job {}: {}".format(source.id, e))
+        return
+
+    # for other jobs, they are marked as deleting and control is handed over to the workflow.
+    job.delete_job()
+    job.save()
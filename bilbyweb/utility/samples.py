@@ -0,0 +1,165 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .display_names import DISPLAY_NAME_MAP
+
+# Path of the posterior samples written by the bilby json wrapper, relative to the job working directory
+SAMPLES_FILE_PATH = 'output/posterior_samples.npz'
+
+# Number of bins of the histograms if the client does not ask for any, and the most it can ask for
+DEFAULT_BINS = 50
+MAXIMUM_BINS = 200
+
+# Seconds a binned histogram is cached for, the samples of a job never change once fetched
+HISTOGRAM_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_samples_directory(job):
+    """
+    Finds the local directory of the posterior samples of a job
+    :param job: instance of Job
+    :return: path of the directory
+    """
+    return os.path.join(settings.POSTERIOR_SAMPLES_DIR, str(job.id))
+
+
+def has_posterior_samples(job):
+    """
+    Checks whether the posterior samples of a job have been fetched from the cluster
+    :param job: instance of Job
+    :return: True if the samples are stored locally, False otherwise
+    """
+    return os.path.isdir(get_samples_directory(job))
+
+
+def fetch_posterior_samples(job):
+    """
+    Fetches the posterior samples of a finished job from the cluster, only once. Every parameter is stored in its own
+    npy file, so that a histogram only maps the columns it needs in memory.
+    :param job: instance of Job
+    :return: Nothing
+    """
+    if has_posterior_samples(job):
+        return
+
+    response = job.fetch_remote_file(SAMPLES_FILE_PATH)
+    content = b''.join(response.streaming_content)
+
+    # the samples are written to a temporary directory first, so that a partially written store is never used
+    os.makedirs(settings.POSTERIOR_SAMPLES_DIR, exist_ok=True)
+    temporary_directory = tempfile.mkdtemp(dir=settings.POSTERIOR_SAMPLES_DIR)
+
+    # the file comes from the cluster, so pickled objects are never loaded from it
+    try:
+        with np.load(io.BytesIO(content), allow_pickle=False) as samples:
+            for name in samples.files:
+                # the names of the parameters are used as file names, they can not point outside the directory
+                if os.path.basename(name) != name or name.startswith('.'):
+                    continue
+                np.save(os.path.join(temporary_directory, name + '.npy'), samples[name].astype(np.float32))
+    except:
+        shutil.rmtree(temporary_directory)
+        raise
+
+    try:
+        os.rename(temporary_directory, get_samples_directory(job))
+    except OSError:
+        # another request has stored the samples in the meantime
+        shutil.rmtree(temporary_directory)
+
+
+def get_parameter_names(job):
+    """
+    Finds the parameters that have posterior samples stored for a job
+    :param job: instance of Job
+    :return: sorted list of parameter names
+    """
+    return sorted(
+        file_name[:-len('.npy')] for file_name in os.listdir(get_samples_directory(job)) if file_name.endswith('.npy')
+    )
+
+
+def load_samples(job, name):
+    """
+    Memory maps the posterior samples of a parameter
+    :param job: instance of Job
+    :param name: name of the parameter
+    :return: read only numpy array of the samples
+    """
+    return np.load(os.path.join(get_samples_directory(job), name + '.npy'), mmap_mode='r', allow_pickle=False)
+
+
+def get_histogram(job, x, y=None, bins=DEFAULT_BINS):
+    """
+    Bins the posterior samples of one parameter, or two parameters against each other, fetching the samples from the
+    cluster if needed
+    :param job: instance of Job
+    :param x: name of the first parameter
+    :param y: name of the second parameter, None for a one dimensional histogram
+    :param bins: number of bins along each dimension
+    :return: Dictionary of the parameter names, bin edges and counts
+    """
+    fetch_posterior_samples(job)
+
+    # parameter names are used for file paths and the cache key, they must be one of the stored parameters
+    parameter_names = get_parameter_names(job)
+    if x not in parameter_names or (y and y not in parameter_names):
+        raise KeyError('Unknown parameter')
+
+    bins = min(max(int(bins), 1), MAXIMUM_BINS)
+
+    cache_key = 'posterior_histogram_{}_{}_{}_{}'.format(job.id, x, y, bins)
+    histogram = cache.get(cache_key)
+
+    if histogram is None:
+        if y:
+            counts, x_edges, y_edges = np.histogram2d(load_samples(job, x), load_samples(job, y), bins=bins)
+            histogram = dict(x=x, y=y, x_edges=x_edges.tolist(), y_edges=y_edges.tolist(), counts=counts.tolist())
+        else:
+            counts, x_edges = np.histogram(load_samples(job, x), bins=bins)
+            histogram = dict(x=x, x_edges=x_edges.tolist(), counts=counts.tolist())
+
+        cache.set(cache_key, histogram, HISTOGRAM_CACHE_TIMEOUT)
+
+    return histogram
+
+
+def plot_histogram(histogram):
+    """
+    Plots a binned histogram as a marginal distribution or a two dimensional density
+    :param histogram: Dictionary as returned by get_histogram
+    :return: bytes of the png image
+    """
+    figure = Figure(figsize=(6, 4.5))
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot(1, 1, 1)
+
+    x_edges = np.array(histogram['x_edges'])
+    counts = np.array(histogram['counts'])
+
+    if histogram.get('y'):
+        axes.pcolormesh(x_edges, np.array(histogram['y_edges']), counts.T, cmap='Blues')
+        axes.set_ylabel(DISPLAY_NAME_MAP.get(histogram['y'], histogram['y']))
+    else:
+        axes.hist(x_edges[:-1], bins=x_edges, weights=counts, histtype='stepfilled', alpha=0.6)
+        axes.set_ylabel('Samples')
+
+    axes.set_xlabel(DISPLAY_NAME_MAP.get(histogram['x'], histogram['x']))
+    figure.tight_layout()
+
+    image = io.BytesIO()
+    figure.savefig(image, format='png')
+    return image.getvalue()
@@ -0,0 +1,74 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.formats import date_format
+
+from .display_names import PUBLIC
+from ..models import Job
+from ..templatetags.template_filters import status_color
+
+# Most jobs a page can watch, a page of the job lists shows fewer jobs than this
+MAXIMUM_WATCHED_JOBS = 100
+
+
+def parse_watched_versions(values):
+    """
+    Parses the jobs watched by a page, every value is the id of the job and the status version the page shows
+    :param values: list of strings formatted as <job id>:<status version>, invalid values are ignored
+    :return: Dictionary of the status version keyed by job id
+    """
+    versions = dict()
+    for value in values[:MAXIMUM_WATCHED_JOBS]:
+        try:
+            job_id, version = value.split(':')
+            versions[int(job_id)] = int(version)
+        except ValueError:
+            continue
+    return versions
+
+
+def get_visible_jobs(user):
+    """
+    Finds the jobs whose status a user can watch
+    :param user: the user watching the jobs
+    :return: QuerySet of the jobs
+    """
+    if user.is_admin():
+        return Job.objects.all()
+    return Job.objects.filter(Q(user=user) | Q(extra_status=PUBLIC))
+
+
+def get_changed_jobs(jobs, versions):
+    """
+    Finds the watched jobs whose status version differs from the one shown by the page, with a single read of the
+    status fields
+    :param jobs: QuerySet of the jobs the user can watch
+    :param versions: Dictionary of the status version shown by the page keyed by job id
+    :return: list of the changed Job instances
+    """
+    if not versions:
+        return []
+
+    watched = jobs.filter(id__in=list(versions.keys())) \
+        .only('id', 'job_status', 'extra_status', 'last_updated', 'status_version')
+
+    return [job for job in watched if job.status_version != versions[job.id]]
+
+
+def get_status_update(job):
+    """
+    Builds the status of a changed job as shown by the pages
+    :param job: instance of Job
+    :return: Dictionary of the status
+    """
+    return {
+        'id': job.id,
+        'version': job.status_version,
+        'status': job.status,
+        'status_display': job.status_display,
+        'status_color': status_color(job.status),
+        'last_updated': date_format(timezone.localtime(job.last_updated), 'DATETIME_FORMAT'),
+    }
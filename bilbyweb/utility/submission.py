@@ -0,0 +1,406 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import heapq
+import json
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from .placement import get_array_key, place_jobs
+from .reuse import get_content_hash, find_reusable_job, reuse_job
+from .warm_start import get_submission_json
+from ..models import Job, SubmissionRequest, SubmissionAttempt, SubmissionPriority
+
+logger = logging.getLogger(__name__)
+
+# Submission requests attempted by the worker in one pass.
+# This can be overridden using SUBMISSION_BATCH_SIZE in the settings.
+SUBMISSION_BATCH_SIZE = 50
+
+# Submissions sent to the same cluster at the same time.
+# This can be overridden using SUBMISSION_CLUSTER_CONCURRENCY in the settings.
+SUBMISSION_CLUSTER_CONCURRENCY = 4
+
+# Attempts at submitting a job before it is given up, and the seconds waited after the first failed attempt, doubled
+# after every further failed attempt up to the maximum.
+# These can be overridden using SUBMISSION_MAXIMUM_ATTEMPTS, SUBMISSION_RETRY_DELAY and SUBMISSION_MAXIMUM_RETRY_DELAY
+# in the settings.
+SUBMISSION_MAXIMUM_ATTEMPTS = 6
+SUBMISSION_RETRY_DELAY = 30
+SUBMISSION_MAXIMUM_RETRY_DELAY = 60 * 60
+
+# Jobs of a user submitted to the cluster at the same time, unless the admins set another maximum for the user.
+# This can be overridden using SUBMISSION_USER_MAXIMUM_ACTIVE_JOBS in the settings.
+SUBMISSION_USER_MAXIMUM_ACTIVE_JOBS = 50
+
+# Statuses of the jobs that the cluster has taken and not finished yet, the queued jobs are pending until submitted
+SUBMITTED_JOB_STATUSES = [
+    JobStatus.SUBMITTING,
+    JobStatus.SUBMITTED,
+    JobStatus.QUEUED,
+    JobStatus.RUNNING,
+]
+
+# Seconds a worker has to attempt the requests it has claimed before another worker can claim them
+SUBMISSION_CLAIM_TIMEOUT = 60 * 10
+
+
+def get_submission_setting(name, default):
+    """
+    Finds a setting of the submission queue
+    :param name: name of the setting
+    :param default: value if the setting is not set
+    :return: the value of the setting
+    """
+    try:
+        return getattr(settings, name)
+    except AttributeError:
+        return default
+
+
+def get_retry_delay(attempt_count):
+    """
+    Finds the seconds to wait before the next attempt, doubling after every failed attempt
+    :param attempt_count: number of failed attempts so far
+    :return: delay in seconds
+    """
+    delay = get_submission_setting('SUBMISSION_RETRY_DELAY', SUBMISSION_RETRY_DELAY) * 2 ** (attempt_count - 1)
+    return min(delay, get_submission_setting('SUBMISSION_MAXIMUM_RETRY_DELAY', SUBMISSION_MAXIMUM_RETRY_DELAY))
+
+
+def prepare_job(job, json_representation, user, reuse_result=True):
+    """
+    Sets the json representation of a job about to be submitted, and reuses the result of an identical completed job
+    if there is one
+    :param job: instance of Job to be submitted
+    :param json_representation: json representation of the job
+    :param user: the user submitting the job
+    :param reuse_result: whether the result of an identical completed job can be reused
+    :return: True if the job still has to be sent to the cluster, False if it has reused a result
+    """
+    # the json representation of the job is to be saved in the Job model
+    job.json_representation = json_representation
+    job.content_hash = get_content_hash(job.json_representation)
+
+    # a completed job with the same parameters already has the result, no need to run it again
+    reusable_job = None
+    if reuse_result and job.content_hash:
+        reusable_job = find_reusable_job(job, user)
+
+    if reusable_job:
+        reuse_job(job, reusable_job)
+        return False
+
+    return True
+
+
+def queue_job(job, submission_parameters=None):
+    """
+    Queues a prepared job for the submission worker, the job is pending until the worker submits it
+    :param job: instance of Job with its json representation set
+    :param submission_parameters: Dictionary of parameters for the cluster that are not part of the job itself
+    :return: Nothing
+    """
+    with transaction.atomic():
+        job.job_status = JobStatus.PENDING
+        job.job_pending_time = timezone.now()
+        job.save()
+
+        SubmissionRequest.objects.create(
+            job=job,
+            submission_parameters=json.dumps(submission_parameters) if submission_parameters else None,
+            next_attempt_time=timezone.now(),
+        )
+
+
+def send_job(job, submission_parameters=None):
+    """
+    Sends a prepared job to the cluster
+    :param job: instance of Job with its json representation set
+    :param submission_parameters: Dictionary of parameters for the cluster that are not part of the job itself
+    :return: Nothing
+    """
+    submission_json = get_submission_json(job, job.json_representation)
+
+    if submission_parameters:
+        job_parameters = json.loads(submission_json)
+        job_parameters.update(submission_parameters)
+        submission_json = json.dumps(job_parameters, indent=4)
+
+    # the job is only pending in the queue, it is still a draft for the cluster
+    job.job_status = JobStatus.DRAFT
+
+    try:
+        # Submit the job to HPC
+        job.submit(submission_json)
+    finally:
+        # a failed submission leaves the job pending in the queue, never a draft that could be edited or queued again
+        if job.job_status == JobStatus.DRAFT:
+            job.job_status = JobStatus.PENDING
+            Job.objects.filter(id=job.id, job_status=JobStatus.DRAFT).update(job_status=JobStatus.PENDING)
+
+
+def submit_job(job, json_representation, user, reuse_result=True):
+    """
+    Queues a job for submission to the cluster, or reuses the result of an identical completed job instead
+    :param job: instance of Job to be submitted
+    :param json_representation: json representation of the job
+    :param user: the user submitting the job
+    :param reuse_result: whether the result of an identical completed job can be reused
+    :return: Nothing
+    """
+    if prepare_job(job, json_representation, user, reuse_result):
+        queue_job(job)
+
+
+def get_user_shares(user_ids):
+    """
+    Finds the weight and the maximum number of active jobs of users
+    :param user_ids: collection of user ids
+    :return: Dictionary of (weight, maximum active jobs) keyed by user id
+    """
+    default_maximum = get_submission_setting('SUBMISSION_USER_MAXIMUM_ACTIVE_JOBS', SUBMISSION_USER_MAXIMUM_ACTIVE_JOBS)
+    shares = {user_id: (1, default_maximum) for user_id in user_ids}
+
+    for user_id, weight, maximum_active_jobs in SubmissionPriority.objects.filter(user_id__in=user_ids) \
+            .values_list('user_id', 'weight', 'maximum_active_jobs'):
+        shares[user_id] = (max(weight, 1), default_maximum if maximum_active_jobs is None else maximum_active_jobs)
+
+    return shares
+
+
+def get_active_job_counts(user_ids):
+    """
+    Counts the jobs of users that are on the cluster or being submitted to it
+    :param user_ids: collection of user ids
+    :return: Dictionary of the number of active jobs keyed by user id
+    """
+    counts = {user_id: 0 for user_id in user_ids}
+
+    for row in Job.objects.filter(user_id__in=user_ids, job_status__in=SUBMITTED_JOB_STATUSES) \
+            .values('user_id').annotate(count=Count('id')):
+        counts[row['user_id']] += row['count']
+
+    # requests claimed by a worker are about to be on the cluster, unless the claim has run out
+    for row in SubmissionRequest.objects.filter(job__user_id__in=user_ids, completion_time__isnull=True,
+                                                claim__isnull=False, next_attempt_time__gt=timezone.now()) \
+            .values('job__user_id').annotate(count=Count('id')):
+        counts[row['job__user_id']] += row['count']
+
+    return counts
+
+
+def order_submission_requests(requests, shares, active_counts, limit=None):
+    """
+    Orders submission requests by weighted fair share, the next request is always taken from the user with the fewest
+    active jobs for their weight. The jobs of a job array are taken together, so that the array is never split.
+    :param requests: list of Dictionaries of the id, user id and array key of the requests, in the order the requests of
+                     a user are to be submitted
+    :param shares: Dictionary of (weight, maximum active jobs) keyed by user id, as returned by get_user_shares
+    :param active_counts: Dictionary of the number of active jobs keyed by user id
+    :param limit: most requests to take, respecting the maximum active jobs of the users. None to order every request
+                  regardless of the maximums.
+    :return: list of request ids in the order they are to be submitted
+    """
+    active_counts = dict(active_counts)
+
+    # the requests of every user, grouped in the units that are submitted together
+    units = dict()
+    for position, request in enumerate(requests):
+        user_units = units.setdefault(request['user_id'], [])
+        key = request['array_key']
+        if key and user_units and user_units[-1]['key'] == key:
+            user_units[-1]['ids'].append(request['id'])
+        else:
+            user_units.append(dict(key=key, ids=[request['id']], position=position))
+
+    def is_capped(user_id):
+        return limit is not None and active_counts[user_id] >= shares[user_id][1]
+
+    # users with the same share are served in the order of their oldest request
+    heap = [
+        (active_counts[user_id] / shares[user_id][0], user_units[0]['position'], user_id)
+        for user_id, user_units in units.items() if not is_capped(user_id)
+    ]
+    heapq.heapify(heap)
+
+    ordered = []
+    while heap and (limit is None or len(ordered) < limit):
+        _, _, user_id = heapq.heappop(heap)
+        unit = units[user_id].pop(0)
+
+        ordered.extend(unit['ids'])
+        active_counts[user_id] += len(unit['ids'])
+
+        if units[user_id] and not is_capped(user_id):
+            heapq.heappush(
+                heap, (active_counts[user_id] / shares[user_id][0], units[user_id][0]['position'], user_id)
+            )
+
+    return ordered
+
+
+def get_request_rows(requests):
+    """
+    Reads the rows of submission requests needed to order them
+    :param requests: queryset of SubmissionRequest
+    :return: list of Dictionaries of the id, user id and array key of the requests
+    """
+    requests = requests.order_by('next_attempt_time', 'id').values('id', 'job__user_id', 'submission_parameters')
+    return [
+        dict(
+            id=request['id'],
+            user_id=request['job__user_id'],
+            array_key=get_array_key(request['submission_parameters']),
+        ) for request in requests
+    ]
+
+
+def claim_submission_requests():
+    """
+    Claims a batch of the submission requests that are due, so that no other worker attempts them. The batch is taken
+    by weighted fair share across the users, leaving out the users that already have their maximum of active jobs.
+    :return: list of the claimed SubmissionRequest instances, in the order they are to be submitted
+    """
+    now = timezone.now()
+    claim = uuid.uuid4().hex
+
+    due = get_request_rows(
+        SubmissionRequest.objects.filter(completion_time__isnull=True, next_attempt_time__lte=now)
+    )
+
+    user_ids = set(request['user_id'] for request in due)
+    scheduled = order_submission_requests(
+        due,
+        get_user_shares(user_ids),
+        get_active_job_counts(user_ids),
+        get_submission_setting('SUBMISSION_BATCH_SIZE', SUBMISSION_BATCH_SIZE),
+    )
+
+    # the attempt time is pushed back, so that the requests are claimed again if this worker dies while attempting them
+    SubmissionRequest.objects.filter(
+        id__in=scheduled,
+        completion_time__isnull=True,
+        next_attempt_time__lte=now,
+    ).update(
+        claim=claim,
+        next_attempt_time=now + timedelta(seconds=SUBMISSION_CLAIM_TIMEOUT),
+    )
+
+    order = {request_id: position for position, request_id in enumerate(scheduled)}
+    claimed = SubmissionRequest.objects.filter(claim=claim, completion_time__isnull=True).select_related('job')
+    return sorted(claimed, key=lambda request: order[request.id])
+
+
+def get_queue_positions():
+    """
+    Finds the positions of the jobs waiting in the submission queue, in the order they would be submitted by weighted
+    fair share if no user had a maximum of active jobs
+    :return: Dictionary of the positions, starting at 1, keyed by job id
+    """
+    outstanding = SubmissionRequest.objects.filter(completion_time__isnull=True)
+    requests = get_request_rows(outstanding)
+
+    user_ids = set(request['user_id'] for request in requests)
+    ordered = order_submission_requests(requests, get_user_shares(user_ids), get_active_job_counts(user_ids))
+
+    jobs = dict(outstanding.values_list('id', 'job_id'))
+    return {jobs[request_id]: position for position, request_id in enumerate(ordered, start=1)}
+
+
+def attempt_submission(request):
+    """
+    Attempts a submission request once, and records how long it took. A failed request is retried later, unless it has
+    run out of attempts in which case its job is set to error.
+    :param request: instance of SubmissionRequest
+    :return: Nothing
+    """
+    job = request.job
+    start_time = time.monotonic()
+    error = None
+
+    try:
+        submission_parameters = json.loads(request.submission_parameters) if request.submission_parameters else None
+        send_job(job, submission_parameters)
+    except Exception as e:
+        logger.info("Unable to submit job {}: {}".format(job.id, e))
+        error = str(e) or e.__class__.__name__
+
+    SubmissionAttempt.objects.create(
+        request=request,
+        latency=time.monotonic() - start_time,
+        error=error,
+    )
+
+    request.attempt_count += 1
+    request.claim = None
+
+    if not error:
+        request.completion_time = timezone.now()
+
+        # a resumed job has only used up a longer walltime once it is on the cluster
+        if submission_parameters and 'resume' in submission_parameters:
+            Job.objects.filter(id=job.id).update(resume_count=F('resume_count') + 1)
+            job.resume_count += 1
+            job.take_snapshot(['resume_count'])
+    elif request.attempt_count >= get_submission_setting('SUBMISSION_MAXIMUM_ATTEMPTS', SUBMISSION_MAXIMUM_ATTEMPTS):
+        request.completion_time = timezone.now()
+        request.failed = True
+
+        # saved, so that the owner is notified of the error
+        job.job_status = JobStatus.ERROR
+        job.save()
+    else:
+        request.next_attempt_time = timezone.now() + timedelta(seconds=get_retry_delay(request.attempt_count))
+
+    request.save()
+
+
+def attempt_cluster_submissions(requests):
+    """
+    Attempts the submission requests of a cluster one after the other, in a thread of the worker
+    :param requests: list of SubmissionRequest instances
+    :return: Nothing
+    """
+    try:
+        for request in requests:
+            attempt_submission(request)
+    finally:
+        # every thread has its own database connection
+        connection.close()
+
+
+def drain_submission_queue():
+    """
+    Attempts the submission requests that are due, concurrently across clusters and no more than the concurrency of a
+    cluster at the same time on the same cluster
+    :return: the number of requests attempted
+    """
+    requests = claim_submission_requests()
+
+    # the jobs are placed on the clusters before they are submitted, so that every cluster gets its own lanes
+    place_jobs(requests)
+
+    concurrency = get_submission_setting('SUBMISSION_CLUSTER_CONCURRENCY', SUBMISSION_CLUSTER_CONCURRENCY)
+    lanes = []
+    for cluster_id in set(request.job.cluster_id for request in requests):
+        cluster_requests = [request for request in requests if request.job.cluster_id == cluster_id]
+        lanes.extend(cluster_requests[index::concurrency] for index in range(concurrency))
+
+    lanes = [lane for lane in lanes if lane]
+    if lanes:
+        with ThreadPoolExecutor(max_workers=len(lanes)) as executor:
+            list(executor.map(attempt_cluster_submissions, lanes))
+
+    return len(requests)
@@ -0,0 +1,129 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import json
+import logging
+
+from django.conf import settings
+from django.db.models import F, Q
+
+from django_hpc_job_controller.client.scheduler.status import JobStatus
+
+from .placement import get_cluster_loads
+from ..models import Job, ResultIndex
+
+logger = logging.getLogger(__name__)
+
+# Path of the posterior summary written by the bilby json wrapper, relative to the job working directory
+SUMMARY_FILE_PATH = 'output/summary.json'
+
+# Completed jobs whose posterior summary is fetched in one pass of the worker.
+# This can be overridden using SUMMARY_BATCH_SIZE in the settings.
+SUMMARY_BATCH_SIZE = 20
+
+# Attempts at fetching the posterior summary of a completed job before it is given up, a job whose sampler did not
+# write a summary never has one
+SUMMARY_MAXIMUM_ATTEMPTS = 5
+
+
+def get_sampler_summary_path(sampler):
+    """
+    Finds the path of the posterior summary of a sampler run alongside the sampler of a job
+    :param sampler: name of the sampler
+    :return: path relative to the job working directory
+    """
+    return 'output/{}/summary.json'.format(sampler)
+
+
+def fetch_posterior_summary(job):
+    """
+    Fetches the posterior summary of a finished job from the cluster and stores it in the job
+    :param job: instance of Job
+    :return: Nothing
+    """
+    response = job.result_job.fetch_remote_file(SUMMARY_FILE_PATH)
+    summary = json.loads(b''.join(response.streaming_content).decode('utf-8'))
+
+    job.posterior_summary = json.dumps(summary)
+
+    # updating the field only, the summary is not a change to the job itself, so the last updated stays the same
+    Job.objects.filter(id=job.id).update(posterior_summary=job.posterior_summary)
+
+    index_posterior_summary(job, summary)
+
+
+def fetch_sampler_summaries(job, samplers):
+    """
+    Fetches the posterior summaries of the samplers run alongside the sampler of a finished job and stores them in the
+    job
+    :param job: instance of Job
+    :param samplers: list of the sampler names
+    :return: Nothing
+    """
+    summaries = dict()
+    for sampler in samplers:
+        response = job.result_job.fetch_remote_file(get_sampler_summary_path(sampler))
+        summaries[sampler] = json.loads(b''.join(response.streaming_content).decode('utf-8'))
+
+    job.sampler_summaries = json.dumps(summaries)
+
+    Job.objects.filter(id=job.id).update(sampler_summaries=job.sampler_summaries)
+
+
+def index_posterior_summary(job, summary):
+    """
+    Replaces the result index entries of a job with the parameters of its posterior summary
+    :param job: instance of Job
+    :param summary: Dictionary of the posterior summary
+    :return: Nothing
+    """
+    ResultIndex.objects.filter(job=job).delete()
+
+    ResultIndex.objects.bulk_create([
+        ResultIndex(
+            job=job,
+            parameter=name,
+            median=values.get('median'),
+            lower=values.get('lower'),
+            upper=values.get('upper'),
+            log_evidence=summary.get('log_evidence'),
+        )
+        for name, values in summary.get('parameters', dict()).items()
+        if values.get('median') is not None
+    ])
+
+
+def index_completed_jobs():
+    """
+    Fetches the posterior summaries of the completed jobs that do not have one yet, and indexes them, so that every
+    completed job is found by the result filters whether its page has been viewed or not. Only the jobs whose outputs
+    are on a connected cluster are attempted.
+    :return: the number of jobs indexed
+    """
+    try:
+        batch_size = settings.SUMMARY_BATCH_SIZE
+    except AttributeError:
+        batch_size = SUMMARY_BATCH_SIZE
+
+    cluster_ids = list(get_cluster_loads().keys())
+    if not cluster_ids:
+        return 0
+
+    jobs = Job.objects.filter(
+        Q(reused_from__isnull=True, cluster__in=cluster_ids) | Q(reused_from__cluster__in=cluster_ids),
+        job_status=JobStatus.COMPLETED,
+        posterior_summary__isnull=True,
+        summary_attempt_count__lt=SUMMARY_MAXIMUM_ATTEMPTS,
+    ).select_related('reused_from').order_by('summary_attempt_count', 'id')[:batch_size]
+
+    indexed = 0
+    for job in jobs:
+        try:
+            fetch_posterior_summary(job)
+            indexed += 1
+        except Exception as e:
+            logger.info("Unable to fetch the posterior summary of job {}: {}".format(job.id, e))
+            Job.objects.filter(id=job.id).update(summary_attempt_count=F('summary_attempt_count') + 1)
+
+    return indexed
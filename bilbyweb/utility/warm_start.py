@@ -0,0 +1,111 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+import json
+
+import numpy as np
+
+from django.conf import settings
+
+from .display_names import COMPLETED, PUBLIC
+from .samples import fetch_posterior_samples, get_parameter_names, load_samples
+
+# The narrowed uniform priors span this many times the parent's credible interval around the parent's median.
+# This can be overridden using WARM_START_INTERVAL_MULTIPLE in the settings.
+WARM_START_INTERVAL_MULTIPLE = 3
+
+# Most parent posterior samples shipped with a warm started job
+WARM_START_SAMPLES = 1000
+
+
+def get_warm_start_interval_multiple():
+    """
+    Finds the multiple of the parent's credible interval the narrowed priors span
+    :return: the multiple
+    """
+    try:
+        return settings.WARM_START_INTERVAL_MULTIPLE
+    except AttributeError:
+        return WARM_START_INTERVAL_MULTIPLE
+
+
+def get_warm_start_parent(job):
+    """
+    Finds the job a job can be warm started from, that is the finished job it was copied from
+    :param job: instance of Job
+    :return: the parent Job, None if the job cannot be warm started
+    """
+    parent = job.parent
+    if parent and parent.status in [COMPLETED, PUBLIC] and parent.posterior_summary:
+        return parent
+
+    return None
+
+
+def narrow_prior_range(minimum, maximum, values, multiple):
+    """
+    Narrows a uniform prior range around the parent's posterior, never extending it
+    :param minimum: minimum of the uniform prior
+    :param maximum: maximum of the uniform prior
+    :param values: Dictionary of the parent's posterior summary of the parameter
+    :param multiple: multiple of the parent's credible interval the narrowed range spans
+    :return: narrowed minimum and maximum
+    """
+    try:
+        half_width = multiple * (values['upper'] - values['lower']) / 2
+        narrowed_minimum = max(minimum, values['median'] - half_width)
+        narrowed_maximum = min(maximum, values['median'] + half_width)
+    except (KeyError, TypeError):
+        return minimum, maximum
+
+    # the parent posterior lies outside the prior, or has no width, so there is nothing to narrow to
+    if narrowed_minimum >= narrowed_maximum:
+        return minimum, maximum
+
+    return narrowed_minimum, narrowed_maximum
+
+
+def get_warm_start_samples(parent, maximum=WARM_START_SAMPLES):
+    """
+    Thins the posterior samples of the parent job, fetching them from the cluster if needed
+    :param parent: instance of Job
+    :param maximum: most samples to return
+    :return: Dictionary of parameter names and lists of samples
+    """
+    fetch_posterior_samples(parent)
+
+    samples = dict()
+    for name in get_parameter_names(parent):
+        column = load_samples(parent, name)
+        if len(column) > maximum:
+            column = column[np.linspace(0, len(column) - 1, maximum).astype(int)]
+        samples[name] = column.tolist()
+
+    return samples
+
+
+def get_submission_json(job, json_representation):
+    """
+    Adds the parent posterior samples to the json of a warm started job. The samples are too large to be shown in the
+    json representation of the job, so they are only added to what is submitted.
+    :param job: instance of Job
+    :param json_representation: json representation of the job
+    :return: json to be submitted
+    """
+    try:
+        job_parameters = json.loads(json_representation)
+    except ValueError:
+        return json_representation
+
+    # the parent is taken from the job, not from the json that the user could have edited
+    parent = get_warm_start_parent(job)
+    if 'warm_start' not in job_parameters or not parent:
+        return json_representation
+
+    job_parameters['warm_start'] = {
+        'parent': parent.id,
+        'samples': get_warm_start_samples(parent.result_job),
+    }
+
+    return json.dumps(job_parameters)
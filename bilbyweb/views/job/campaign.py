@@ -0,0 +1,207 @@
+"""
+Distributed under the MIT License. See LICENSE.txt for more info.
+"""
+
+from django.http import Http404
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render, redirect, get_object_or_404
+from django.core.paginator import Paginator
+
+from ...forms.campaign import CampaignForm, SweepParameterFormSet
+from ...utility.constants import JOBS_PER_PAGE
+from ...utility.campaign import (
+    MAXIMUM_CAMPAIGN_JOBS,
+    count_sweep_points,
+    create_campaign,
+    get_campaign_maximum_active_jobs,
+    get_campaign_status,
+    get_campaign_sweep,
+    release_campaign_jobs,
+)
+from ...utility.display_names import SKIP
+from ...models import Campaign, Job, Signal, SignalParameter
+
+
+def get_campaign(request, campaign_id):
+    """
+    Finds a campaign the user can see, that is a campaign of the user or any campaign for admins
+    :param request: Django request object.
+    :param campaign_id: id of the campaign
+    :return: instance of Campaign
+    """
+    campaign = get_object_or_404(Campaign, id=campaign_id)
+
+    if campaign.user != request.user and not request.user.is_admin():
+        raise Http404
+
+    return campaign
+
+
+@login_required
+def new_campaign(request, job_id):
+    """
+    Generates the jobs of a parameter sweep campaign from a draft job
+    :param request: Django request object.
+    :param job_id: id of the draft job the campaign is generated from
+    :return: Rendered template or redirect to the campaign
+    """
+    base_job = get_object_or_404(Job, id=job_id)
+
+    bilby_job = base_job.bilby_job
+    bilby_job.list_actions(request.user)
+
+    # only the owner of a draft can sweep it, and only its injected signal is swept
+    if 'sweep' not in bilby_job.job_actions or base_job.user != request.user:
+        raise Http404
+
+    if not Signal.objects.filter(job=base_job).exclude(signal_choice=SKIP).exists():
+        messages.error(request, 'A parameter sweep needs a draft with an injected signal')
+        return redirect('drafts')
+
+    if request.method == 'POST':
+        campaign_form = CampaignForm(request.POST, user=request.user)
+        sweep_formset = SweepParameterFormSet(request.POST, prefix='sweep')
+
+        if campaign_form.is_valid() and sweep_formset.is_valid():
+            data = campaign_form.cleaned_data
+            parameters = [form.as_sweep_parameter() for form in sweep_formset if form.as_sweep_parameter()]
+
+            sweep = dict(
+                parameters=parameters,
+                draws=data.get('draws'),
+                seed=data.get('seed'),
+            )
+
+            names = [parameter['name'] for parameter in parameters]
+            if not parameters:
+                campaign_form.add_error(None, 'At least one parameter must be swept')
+            elif len(set(names)) != len(names):
+                campaign_form.add_error(None, 'A parameter can only be swept once')
+            elif count_sweep_points(sweep) > MAXIMUM_CAMPAIGN_JOBS:
+                campaign_form.add_error(None, 'The sweep generates {} jobs, a campaign can have at most {}'.format(
+                    count_sweep_points(sweep), MAXIMUM_CAMPAIGN_JOBS))
+            else:
+                campaign = create_campaign(
+                    base_job=base_job,
+                    user=request.user,
+                    name=data.get('name'),
+                    description=data.get('description'),
+                    sweep=sweep,
+                    maximum_active_jobs=data.get('maximum_active_jobs'),
+                )
+
+                messages.success(request, 'Campaign has been <strong>created</strong> with {} jobs'.format(
+                    count_sweep_points(sweep)), extra_tags='safe')
+
+                return redirect('campaign', campaign_id=campaign.id)
+    else:
+        campaign_form = CampaignForm(user=request.user, initial={
+            'maximum_active_jobs': get_campaign_maximum_active_jobs(),
+        })
+        sweep_formset = SweepParameterFormSet(prefix='sweep')
+
+    return render(
+        request,
+        "bilbyweb/job/new_campaign.html",
+        {
+            'base_job': base_job,
+            'campaign_form': campaign_form,
+            'sweep_formset': sweep_formset,
+            'maximum_campaign_jobs': MAXIMUM_CAMPAIGN_JOBS,
+        }
+    )
+
+
+@login_required
+def campaigns(request):
+    """
+    Collects all campaigns of the user and renders them in template.
+    :param request: Django request object.
+    :return: Rendered template.
+    """
+    my_campaigns = Campaign.objects.filter(user=request.user).order_by('-creation_time')
+
+    paginator = Paginator(my_campaigns, JOBS_PER_PAGE)
+
+    page = request.GET.get('page')
+    campaign_list = paginator.get_page(page)
+
+    return render(
+        request,
+        "bilbyweb/job/campaigns.html",
+        {
+            'campaigns': campaign_list,
+        }
+    )
+
+
+@login_required
+def view_campaign(request, campaign_id):
+    """
+    Collects the status of the jobs of a campaign and renders them in template.
+    :param request: Django request object.
+    :param campaign_id: id of the campaign.
+    :return: Rendered template.
+    """
+    campaign = get_campaign(request, campaign_id)
+
+    status_counts, total, finished = get_campaign_status(campaign)
+
+    paginator = Paginator(Job.objects.filter(campaign=campaign).order_by('id'), JOBS_PER_PAGE)
+
+    page = request.GET.get('page')
+    job_list = paginator.get_page(page)
+
+    # the swept injection parameters of the jobs of the page, read in one query
+    swept_names = [parameter['name'] for parameter in get_campaign_sweep(campaign)['parameters']]
+    swept_parameters = SignalParameter.objects.filter(
+        signal__job__in=[job.id for job in job_list],
+        name__in=swept_names,
+    ).values_list('signal__job_id', 'name', 'value')
+
+    swept_values = dict()
+    for job_id, name, value in swept_parameters:
+        swept_values.setdefault(job_id, dict())[name] = value
+
+    return render(
+        request,
+        "bilbyweb/job/view_campaign.html",
+        {
+            'campaign': campaign,
+            'status_counts': status_counts,
+            'total': total,
+            'finished': finished,
+            'jobs': job_list,
+            'swept_names': swept_names,
+            'job_rows': [
+                (job, [swept_values.get(job.id, dict()).get(name) for name in swept_names])
+                for job in job_list
+            ],
+        }
+    )
+
+
+@login_required
+def launch_campaign(request, campaign_id):
+    """
+    Launches a campaign, submitting its first jobs. The other jobs are submitted as the submitted jobs finish.
+    :param request: Django request object.
+    :param campaign_id: id of the campaign.
+    :return: Redirects to the campaign view.
+    """
+    campaign = get_campaign(request, campaign_id)
+
+    if campaign.user != request.user:
+        raise Http404
+
+    if not campaign.launched:
+        campaign.launched = True
+        campaign.save()
+
+        release_campaign_jobs(campaign)
+
+        messages.success(request, 'Campaign has been <strong>launched</strong>', extra_tags='safe')
+
+    return redirect('campaign', campaign_id=campaign.id)
+
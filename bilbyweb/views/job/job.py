@@ -233,7 +233,8 @@ def save_tab(request, active_tab):
             # saving the job here again will call signal to update the last updated
             # it is left to the signal because of potential change of Job model to
             # extend the HpcJob model.
-            job.save()
+            # only the changed fields are written, the forms have saved the rest already
+            job.save_changes()
 
         # get the active tab
         active_tab, submitted = get_to_be_active_tab(active_tab, previous=previous)
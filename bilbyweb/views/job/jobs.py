@@ -4,7 +4,7 @@ Distributed under the MIT License. See LICENSE.txt for more info.
 
 import logging
 
-from django.http import Http404
+from django.http import Http404, HttpResponse, JsonResponse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q
@@ -13,19 +13,62 @@ from django.core.paginator import Paginator
 
 from accounts.decorators import admin_or_system_admin_required
 
+from ...forms.result_filter import ResultFilterFormSet
 from ...utility.constants import JOBS_PER_PAGE
 from ...utility.utils import get_readable_size
+from ...utility.progress import get_progress_content, get_progress_records
+from ...utility.summary import (
+    SUMMARY_FILE_PATH,
+    fetch_posterior_summary,
+    fetch_sampler_summaries,
+    get_sampler_summary_path,
+)
+from ...utility.samples import (
+    SAMPLES_FILE_PATH,
+    DEFAULT_BINS,
+    has_posterior_samples,
+    get_histogram,
+    plot_histogram,
+)
+from ...utility.compare import MAXIMUM_COMPARED_JOBS, get_comparison, plot_comparison
 from ...utility.job import BilbyJob
+from ...utility.reuse import delete_launched_job
+from ...utility.submission import get_queue_positions
+from ...utility.conditional import (
+    get_job_validator,
+    get_jobs_validator,
+    get_queue_validator,
+    get_not_modified_response,
+    set_validator,
+)
+from ...utility.status_updates import (
+    parse_watched_versions,
+    get_visible_jobs,
+    get_changed_jobs,
+    get_status_update,
+)
 from ...utility.display_names import (
     DRAFT,
+    PENDING,
+    SUBMITTING,
+    SUBMITTED,
+    QUEUED,
+    DELETING,
+    DELETED,
     PUBLIC,
     NONE,
+    IN_PROGRESS,
+    COMPLETED,
+    DLOGZ,
 )
 from ...models import Job, JobStatus
 
 
 logger = logging.getLogger(__name__)
 
+# Statuses of the jobs that have no outputs to list on the cluster, yet or anymore
+NO_OUTPUT_STATUSES = [DRAFT, PENDING, SUBMITTING, SUBMITTED, QUEUED, IN_PROGRESS, DELETING, DELETED]
+
 
 @login_required
 def public_jobs(request):
@@ -38,6 +81,25 @@ def public_jobs(request):
     my_jobs = Job.objects.filter(Q(extra_status__in=[PUBLIC, ])) \
         .order_by('-last_updated', '-job_pending_time')
 
+    # filtering the jobs on their posterior results, only if the filters have been submitted
+    if 'filter-TOTAL_FORMS' in request.GET:
+        filter_formset = ResultFilterFormSet(request.GET, prefix='filter')
+        if filter_formset.is_valid():
+            for filter_form in filter_formset:
+                my_jobs = filter_form.filter(my_jobs)
+    else:
+        filter_formset = ResultFilterFormSet(prefix='filter')
+
+    # the filters are kept while moving across the pages
+    query = request.GET.copy()
+    query.pop('page', None)
+
+    # the page is not rendered again if none of its jobs has changed since the browser cached it
+    etag = get_jobs_validator(request, my_jobs)
+    not_modified = get_not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+
     paginator = Paginator(my_jobs, JOBS_PER_PAGE)
 
     page = request.GET.get('page')
@@ -51,15 +113,19 @@ def public_jobs(request):
         bilby_job.list_actions(request.user)
         bilby_jobs.append(bilby_job)
 
-    return render(
+    response = render(
         request,
         "bilbyweb/job/all-jobs.html",
         {
             'jobs': bilby_jobs,
             'public': True,
+            'filter_formset': filter_formset,
+            'page_query': '&' + query.urlencode() if query else '',
         }
     )
 
+    return set_validator(response, etag)
+
 
 @login_required
 def jobs(request):
@@ -73,27 +139,40 @@ def jobs(request):
         .exclude(job_status__in=[JobStatus.DRAFT, JobStatus.DELETED]) \
         .order_by('-last_updated', '-job_pending_time')
 
+    # the page is not rendered again if none of its jobs has changed since the browser cached it
+    etag = get_jobs_validator(request, my_jobs, *get_queue_validator())
+    not_modified = get_not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+
     paginator = Paginator(my_jobs, JOBS_PER_PAGE)
 
     page = request.GET.get('page')
     job_list = paginator.get_page(page)
 
+    # positions of the jobs of every user waiting to be submitted, shown for the pending jobs of this user
+    queue_positions = get_queue_positions()
+
     # creating bilby jobs from jobs
     # it will create a light job with list of actions this user can do based on the job status
     bilby_jobs = []
     for job in job_list:
         bilby_job = job.bilby_job
         bilby_job.list_actions(request.user)
+        bilby_job.queue_position = queue_positions.get(job.id)
         bilby_jobs.append(bilby_job)
 
-    return render(
+    response = render(
         request,
         "bilbyweb/job/all-jobs.html",
         {
             'jobs': bilby_jobs,
+            'queue_length': len(queue_positions),
         }
     )
 
+    return set_validator(response, etag)
+
 
 @login_required
 @admin_or_system_admin_required
@@ -108,6 +187,12 @@ def all_jobs(request):
         .exclude(job_status__in=[JobStatus.DRAFT, JobStatus.DELETED]) \
         .order_by('-last_updated', '-job_pending_time')
 
+    # the page is not rendered again if none of its jobs has changed since the browser cached it
+    etag = get_jobs_validator(request, my_jobs)
+    not_modified = get_not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+
     paginator = Paginator(my_jobs, JOBS_PER_PAGE)
 
     page = request.GET.get('page')
@@ -121,7 +206,7 @@ def all_jobs(request):
         bilby_job.list_actions(request.user)
         bilby_jobs.append(bilby_job)
 
-    return render(
+    response = render(
         request,
         "bilbyweb/job/all-jobs.html",
         {
@@ -130,6 +215,8 @@ def all_jobs(request):
         }
     )
 
+    return set_validator(response, etag)
+
 
 @login_required
 def drafts(request):
@@ -139,10 +226,18 @@ def drafts(request):
     :return: Rendered template.
     """
 
+    # the jobs of a campaign waiting to be submitted are shown with the campaign
     my_jobs = Job.objects.filter(Q(user=request.user), Q(job_status__in=[JobStatus.DRAFT, ])) \
+        .filter(campaign__isnull=True) \
         .exclude(job_status__in=[JobStatus.DELETED, ]) \
         .order_by('-last_updated', '-creation_time')
 
+    # the page is not rendered again if none of its jobs has changed since the browser cached it
+    etag = get_jobs_validator(request, my_jobs)
+    not_modified = get_not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+
     paginator = Paginator(my_jobs, JOBS_PER_PAGE)
 
     page = request.GET.get('page')
@@ -156,7 +251,7 @@ def drafts(request):
         bilby_job.list_actions(request.user)
         bilby_jobs.append(bilby_job)
 
-    return render(
+    response = render(
         request,
         "bilbyweb/job/all-jobs.html",
         {
@@ -165,6 +260,8 @@ def drafts(request):
         }
     )
 
+    return set_validator(response, etag)
+
 
 @login_required
 @admin_or_system_admin_required
@@ -179,6 +276,12 @@ def all_drafts(request):
         .exclude(job_status__in=[JobStatus.DELETED, ]) \
         .order_by('-last_updated', '-creation_time')
 
+    # the page is not rendered again if none of its jobs has changed since the browser cached it
+    etag = get_jobs_validator(request, my_jobs)
+    not_modified = get_not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+
     paginator = Paginator(my_jobs, JOBS_PER_PAGE)
 
     page = request.GET.get('page')
@@ -192,7 +295,7 @@ def all_drafts(request):
         bilby_job.list_actions(request.user)
         bilby_jobs.append(bilby_job)
 
-    return render(
+    response = render(
         request,
         "bilbyweb/job/all-jobs.html",
         {
@@ -202,6 +305,8 @@ def all_drafts(request):
         }
     )
 
+    return set_validator(response, etag)
+
 
 @login_required
 def deleted_jobs(request):
@@ -214,6 +319,12 @@ def deleted_jobs(request):
     my_jobs = Job.objects.filter(Q(user=request.user), Q(job_status__in=[JobStatus.DELETED, ])) \
         .order_by('-last_updated', '-creation_time')
 
+    # the page is not rendered again if none of its jobs has changed since the browser cached it
+    etag = get_jobs_validator(request, my_jobs)
+    not_modified = get_not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+
     paginator = Paginator(my_jobs, JOBS_PER_PAGE)
 
     page = request.GET.get('page')
@@ -227,7 +338,7 @@ def deleted_jobs(request):
         bilby_job.list_actions(request.user)
         bilby_jobs.append(bilby_job)
 
-    return render(
+    response = render(
         request,
         "bilbyweb/job/all-jobs.html",
         {
@@ -236,6 +347,8 @@ def deleted_jobs(request):
         }
     )
 
+    return set_validator(response, etag)
+
 
 @login_required
 @admin_or_system_admin_required
@@ -249,6 +362,12 @@ def all_deleted_jobs(request):
     my_jobs = Job.objects.filter(Q(job_status__in=[JobStatus.DELETED, ])) \
         .order_by('-last_updated', '-creation_time')
 
+    # the page is not rendered again if none of its jobs has changed since the browser cached it
+    etag = get_jobs_validator(request, my_jobs)
+    not_modified = get_not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+
     paginator = Paginator(my_jobs, JOBS_PER_PAGE)
 
     page = request.GET.get('page')
@@ -262,7 +381,7 @@ def all_deleted_jobs(request):
         bilby_job.list_actions(request.user)
         bilby_jobs.append(bilby_job)
 
-    return render(
+    response = render(
         request,
         "bilbyweb/job/all-jobs.html",
         {
@@ -272,6 +391,8 @@ def all_deleted_jobs(request):
         }
     )
 
+    return set_validator(response, etag)
+
 
 @login_required
 def download_asset(request, job_id, download, file_path):
@@ -299,10 +420,227 @@ def download_asset(request, job_id, download, file_path):
 
     # Get the requested file from the server
     try:
-        return job.fetch_remote_file(file_path, force_download=download == 1)
+        return job.result_job.fetch_remote_file(file_path, force_download=download == 1)
+    except:
+        raise Http404
+
+
+@login_required
+def job_progress(request, job_id):
+    """
+    Returns the progress records of a running job appended after the offset supplied by the client
+
+    :param request: The django request object
+    :param job_id: int: The job id
+
+    :return: A JsonResponse with the new offset and the new progress records
+    """
+    # Get the job
+    job = get_object_or_404(Job, id=job_id)
+
+    # Check that this user has access to this job
+    # it can see the progress if there is a copy access
+    bilby_job = job.bilby_job
+    bilby_job.list_actions(request.user)
+
+    if 'copy' not in bilby_job.job_actions:
+        # Nothing to see here
+        raise Http404
+
+    try:
+        offset = int(request.GET.get('offset', 0))
+    except ValueError:
+        offset = 0
+
+    # progress is only written while the job is running
+    if job.status != IN_PROGRESS:
+        return JsonResponse({'status': job.status, 'offset': offset, 'records': []})
+
+    try:
+        offset, records = get_progress_records(get_progress_content(job), offset)
+    except:
+        # the progress file may not exist yet or the cluster is offline
+        records = []
+
+    return JsonResponse({'status': job.status, 'offset': offset, 'records': records})
+
+
+@login_required
+def job_statuses(request):
+    """
+    Returns the statuses of the jobs watched by a page that have changed since the page was rendered, straight away,
+    so that a page polls this instead of reloading
+
+    :param request: The django request object, with a job=<job id>:<status version> parameter for every watched job
+
+    :return: A JsonResponse with the statuses of the changed jobs
+    """
+    versions = parse_watched_versions(request.GET.getlist('job'))
+    changed = get_changed_jobs(get_visible_jobs(request.user), versions)
+
+    return JsonResponse({'jobs': [get_status_update(job) for job in changed]})
+
+
+def get_posterior_histogram(request, job_id):
+    """
+    Bins the posterior samples of a finished job for the parameters requested by the client
+
+    :param request: The django request object
+    :param job_id: int: The job id
+
+    :return: Dictionary of the binned histogram
+    """
+    # Get the job
+    job = get_object_or_404(Job, id=job_id)
+
+    # Check that this user has access to this job
+    # it can see the posterior if there is a copy access
+    bilby_job = job.bilby_job
+    bilby_job.list_actions(request.user)
+
+    if 'copy' not in bilby_job.job_actions or job.status not in [COMPLETED, PUBLIC]:
+        # Nothing to see here
+        raise Http404
+
+    try:
+        bins = int(request.GET.get('bins', DEFAULT_BINS))
+    except ValueError:
+        bins = DEFAULT_BINS
+
+    try:
+        return get_histogram(job.result_job, request.GET.get('x'), request.GET.get('y') or None, bins)
+    except:
+        # the samples are not available or the parameters are not known
+        raise Http404
+
+
+@login_required
+def posterior_histogram(request, job_id):
+    """
+    Returns the binned posterior samples of one or two parameters of a finished job
+
+    :param request: The django request object
+    :param job_id: int: The job id
+
+    :return: A JsonResponse with the bin edges and counts
+    """
+    return JsonResponse(get_posterior_histogram(request, job_id))
+
+
+@login_required
+def posterior_plot(request, job_id):
+    """
+    Returns the marginal distribution of one parameter or the density of two parameters of a finished job
+
+    :param request: The django request object
+    :param job_id: int: The job id
+
+    :return: A HttpResponse with the png image
+    """
+    return HttpResponse(plot_histogram(get_posterior_histogram(request, job_id)), content_type='image/png')
+
+
+def get_compared_jobs(request):
+    """
+    Finds the finished jobs requested to be compared, checking the user has access to all of them
+
+    :param request: The django request object
+
+    :return: list of Job instances
+    """
+    try:
+        job_ids = sorted(set(int(job_id) for job_id in request.GET.getlist('job')))
+    except ValueError:
+        raise Http404
+
+    if not 2 <= len(job_ids) <= MAXIMUM_COMPARED_JOBS:
+        raise Http404
+
+    jobs = []
+    for job_id in job_ids:
+        job = get_object_or_404(Job, id=job_id)
+
+        # Check that this user has access to this job
+        # it can compare the posterior if there is a copy access
+        bilby_job = job.bilby_job
+        bilby_job.list_actions(request.user)
+
+        if 'copy' not in bilby_job.job_actions or job.status not in [COMPLETED, PUBLIC]:
+            # Nothing to see here
+            raise Http404
+
+        jobs.append(job)
+
+    # in the order of the jobs holding the results, as the comparison lists them
+    return sorted(jobs, key=lambda job: job.result_job.id)
+
+
+@login_required
+def compare_jobs(request):
+    """
+    Compares the posterior distributions of finished jobs
+
+    :param request: The django request object
+
+    :return: Rendered template
+    """
+    jobs = get_compared_jobs(request)
+
+    try:
+        comparison = get_comparison([job.result_job for job in jobs])
+    except:
+        # the samples of a job are not available
+        raise Http404
+
+    # the comparison is symmetric, every pair of jobs is displayed once
+    parameters = []
+    for name, parameter in comparison['parameters'].items():
+        parameters.append({
+            'name': name,
+            'intervals': list(zip(jobs, parameter['intervals'])),
+            'pairs': [
+                {
+                    'first': jobs[i],
+                    'second': jobs[j],
+                    'ks': parameter['ks'][i][j],
+                    'js': parameter['js'][i][j],
+                    'median_difference': parameter['median_differences'][i][j],
+                    'width_ratio': parameter['width_ratios'][i][j],
+                }
+                for i in range(len(jobs)) for j in range(i + 1, len(jobs))
+            ],
+        })
+
+    return render(
+        request,
+        "bilbyweb/job/compare_jobs.html",
+        {
+            'jobs': jobs,
+            'parameters': parameters,
+            'job_query': '&'.join('job={}'.format(job.id) for job in jobs),
+        }
+    )
+
+
+@login_required
+def compare_plot(request):
+    """
+    Returns the overlaid marginal distributions of a parameter of the compared jobs
+
+    :param request: The django request object
+
+    :return: A HttpResponse with the png image
+    """
+    jobs = get_compared_jobs(request)
+
+    try:
+        comparison = get_comparison([job.result_job for job in jobs])
+        image = plot_comparison(comparison, request.GET.get('parameter'), [job.name for job in jobs])
     except:
         raise Http404
 
+    return HttpResponse(image, content_type='image/png')
+
 
 @login_required
 def view_job(request, job_id):
@@ -329,10 +667,19 @@ def view_job(request, job_id):
             if 'copy' not in bilby_job.job_actions:
                 job = None
             else:
+                # the page is not rendered again, and the cluster is not asked for the outputs again, if the job has
+                # not changed since the browser cached the page
+                not_modified = get_not_modified_response(request, get_job_validator(request, job))
+                if not_modified:
+                    return not_modified
+
                 # create a bilby_job instance of the job
                 bilby_job = BilbyJob(job_id=job.id)
                 bilby_job.list_actions(request.user)
 
+                # a job reusing the result of another job has its outputs in the working directory of that job
+                result_job = bilby_job.job.result_job
+
                 # Empty parameter dict to pass to template
                 job_data = {
                     'L1': None,
@@ -341,14 +688,29 @@ def view_job(request, job_id):
                     'corner': None,
                     'archive': None,
                     # for drafts there are no clusters assigned, so bilby_job.job.custer is None for them
-                    'is_online': bilby_job.job.cluster is not None and bilby_job.job.cluster.is_connected() is not None
+                    'is_online': result_job.cluster is not None and result_job.cluster.is_connected() is not None
                 }
 
+                # samplers run alongside the sampler of the job write their outputs in sub directories
+                compare_samplers = bilby_job.sampler.compare_sampler_list if bilby_job.sampler else []
+                job_data['sampler_corners'] = []
+                sampler_summaries = []
+
+                # the sampler stops once the remaining dlogz reaches this, used for the progress of a running job
+                target_dlogz = 0.1
+                for sampler_parameter in bilby_job.sampler_parameters or []:
+                    if sampler_parameter.name == DLOGZ and sampler_parameter.value:
+                        target_dlogz = sampler_parameter.value
+
+                # the output files of every finished job are listed, the logs and the partial outputs of a failed
+                # or stopped job are what its owner needs most
+                job_data['has_outputs'] = bilby_job.job.status not in NO_OUTPUT_STATUSES
+
                 # Check if the cluster is online
-                if job_data['is_online']:
+                if job_data['is_online'] and job_data['has_outputs']:
                     try:
                         # Get the output file list for this job
-                        result = bilby_job.job.fetch_remote_file_list(path="/", recursive=True)
+                        result = result_job.fetch_remote_file_list(path="/", recursive=True)
                         # Waste the message id
                         result.pop_uint()
                         # Iterate over each file
@@ -369,19 +731,54 @@ def view_job(request, job_id):
                                 job_data['H1'] = {'path': path, 'size': size}
                             if 'output/bilby_corner.png' in path:
                                 job_data['corner'] = {'path': path, 'size': size}
-                            if 'bilby_job_{}.tar.gz'.format(bilby_job.job.id) in path:
+                            if 'bilby_job_{}.tar.gz'.format(result_job.id) in path:
                                 job_data['archive'] = {'path': path, 'size': size}
+                            if SUMMARY_FILE_PATH in path:
+                                job_data['summary'] = {'path': path, 'size': size}
+                            if SAMPLES_FILE_PATH in path:
+                                job_data['samples'] = {'path': path, 'size': size}
+                            for sampler in compare_samplers:
+                                if 'output/{}/bilby_corner.png'.format(sampler) in path:
+                                    job_data['sampler_corners'].append({'sampler': sampler, 'path': path, 'size': size})
+                                if get_sampler_summary_path(sampler) in path:
+                                    sampler_summaries.append(sampler)
                     except:
                         job_data['is_online'] = False
 
-                return render(
+                # the posterior summary is only fetched once, afterwards it is displayed from the database
+                if job_data['is_online'] and job_data.get('summary') and not bilby_job.job.posterior_summary:
+                    try:
+                        fetch_posterior_summary(bilby_job.job)
+                    except:
+                        logger.info("Unable to fetch the posterior summary of job {}".format(bilby_job.job.id))
+
+                # likewise for the summaries of the other samplers, once all of them are available
+                if job_data['is_online'] and compare_samplers and len(sampler_summaries) == len(compare_samplers) \
+                        and not bilby_job.job.sampler_summaries:
+                    try:
+                        fetch_sampler_summaries(bilby_job.job, compare_samplers)
+                    except:
+                        logger.info("Unable to fetch the sampler summaries of job {}".format(bilby_job.job.id))
+
+                # the posterior samples are fetched by the first plot request, after that the cluster is not needed
+                if has_posterior_samples(result_job):
+                    job_data['samples'] = True
+
+                response = render(
                     request,
                     "bilbyweb/job/view_job.html",
                     {
                         'bilby_job': bilby_job,
-                        'job_data': job_data
+                        'job_data': job_data,
+                        'target_dlogz': target_dlogz,
                     }
                 )
+
+                # a page rendered while the cluster was offline is incomplete, it is rendered again next time
+                if job_data['is_online'] or result_job.cluster is None:
+                    set_validator(response, get_job_validator(request, bilby_job.job))
+
+                return response
         except Job.DoesNotExist:
             pass
 
@@ -535,6 +932,48 @@ def cancel_job(request, job_id):
     return response
 
 
+@login_required
+def resume_job(request, job_id):
+    """
+    Resumes a job that was stopped before finishing from its last checkpoint.
+    :param request: Django request object.
+    :param job_id: id of the job.
+    :return: Redirects to the job view.
+    """
+
+    should_redirect = False
+
+    # checking:
+    # 1. Job ID and job exists
+    if job_id:
+        try:
+            job = Job.objects.get(id=job_id)
+
+            bilby_job = job.bilby_job
+            bilby_job.list_actions(request.user)
+
+            # Checks that user has resume permission
+            if 'resume' in bilby_job.job_actions:
+                bilby_job.resume()
+
+                should_redirect = True
+                messages.success(request, 'Job has been <strong>queued</strong> to resume from its last '
+                                          'checkpoint', extra_tags='safe')
+
+        except Job.DoesNotExist:
+            pass
+
+    # this should be the last line before redirect
+    if not should_redirect:
+        # should return to a page notifying that
+        # 1. no permission to resume the job or
+        # 2. no job or
+        # 3. job does not have correct status
+        raise Http404
+
+    return redirect('job', job_id=job_id)
+
+
 @login_required
 def delete_job(request, job_id):
     """
@@ -572,12 +1011,8 @@ def delete_job(request, job_id):
 
                 else:
 
-                    # for other jobs, they are marked as deleting and control is handed over to the workflow.
-                    job.delete_job()
-
-                    # cancelling the public status if deleted
-                    job.extra_status = NONE
-                    job.save()
+                    # the outputs of the job are kept on the cluster while other jobs reuse them
+                    delete_launched_job(job)
 
                     to_page = 'jobs'
 
@@ -646,7 +1081,7 @@ def make_job_private(request, job_id):
             # Checks that user has make_it_private permission
             if 'make_it_private' in bilby_job.job_actions:
                 job.extra_status = NONE
-                job.save()
+                job.save_changes()
 
                 should_redirect = True
                 messages.success(request, 'Job has been changed to <strong>private!</strong>', extra_tags='safe')
@@ -693,7 +1128,11 @@ def make_job_public(request, job_id):
             # Checks that user has make_it_public permission
             if 'make_it_public' in bilby_job.job_actions:
                 job.extra_status = PUBLIC
-                job.save()
+
+                # a public job is found by the result filters, its summary is attempted again if it was given up
+                if not job.posterior_summary:
+                    job.summary_attempt_count = 0
+                job.save_changes()
 
                 should_redirect = True
                 messages.success(request, 'Job has been changed to <strong>public!</strong>', extra_tags='safe')
@@ -3,8 +3,39 @@
 """
 from __future__ import division, print_function
 import bilby
+import hashlib
 import json
+import math
+import multiprocessing
+import numpy as np
+import os
+import shutil
+import signal
 import sys
+import tempfile
+import time
+
+# Seconds between two checkpoints of the sampler state
+CHECK_POINT_DELTA_T = 600
+
+# Minimum seconds between two records in the progress file, keeps the file small for the UI to poll
+PROGRESS_INTERVAL = 30
+
+# Probability contained in the credible intervals of the posterior summary
+SUMMARY_CREDIBLE_LEVEL = 0.9
+
+# Most posterior samples exported for the UI, the posterior is thinned evenly above this
+MAXIMUM_EXPORTED_SAMPLES = int(os.environ.get('BILBY_MAXIMUM_EXPORTED_SAMPLES', 10000))
+
+# The directory containing the ROQ bases, one sub directory per basis
+ROQ_BASIS_DIRECTORY = os.environ.get('BILBY_ROQ_BASIS_DIRECTORY', '/fred/oz006/bilby/roq')
+
+
+# The directory of the simulated data shared by the jobs with the same data settings, one sub directory per data set
+DATA_CACHE_DIRECTORY = os.environ.get('BILBY_DATA_CACHE_DIRECTORY', '/fred/oz006/bilby/data_cache')
+
+# Most data sets kept in the cache, the least recently used ones are removed above this
+DATA_CACHE_SIZE = int(os.environ.get('BILBY_DATA_CACHE_SIZE', 200))
 
 
 def create_prior(name, prior):
@@ -15,6 +46,280 @@ def create_prior(name, prior):
         return bilby.prior.Uniform(prior['min'], prior['max'], name)
 
 
+def get_sampler_kwargs(sampler):
+    """ Conversion tool from dictionary-sampler to bilby run_sampler keyword arguments """
+    # maps the name used by the UI to the run_sampler keyword argument and its type
+    if sampler['type'] in ['dynesty', 'nestle']:
+        names = dict(number_of_live_points=('npoints', int), dlogz=('dlogz', float),
+                     walk_length=('walks', int), maximum_mcmc_steps=('maxmcmc', int))
+    elif sampler['type'] == 'emcee':
+        names = dict(number_of_steps=('nsteps', int), number_of_walkers=('nwalkers', int),
+                     burn_in_autocorrelation_times=('burn_in_act', float))
+    else:
+        names = dict()
+
+    # parameters left empty use the bilby defaults
+    kwargs = dict()
+    for name, (kwarg, kwarg_type) in names.items():
+        if sampler.get(name) not in [None, '']:
+            kwargs[kwarg] = kwarg_type(float(sampler[name]))
+
+    # dynesty periodically checkpoints in the output directory and continues from there if the job is resumed
+    if sampler['type'] == 'dynesty':
+        kwargs.update(resume=True, check_point_delta_t=CHECK_POINT_DELTA_T)
+
+    return kwargs
+
+
+class ProgressWriter(object):
+    """ Appends compact json progress records, one per line, to a progress file """
+
+    def __init__(self, path, interval=PROGRESS_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.start = time.time()
+        self.last_write = 0
+
+    @staticmethod
+    def compact(value):
+        # json has no representation for infinity, dlogz is infinite for the first iterations
+        if value is None or not math.isfinite(value):
+            return None
+        return round(float(value), 3)
+
+    def write(self, iteration, dlogz=None, logz=None, acceptance=None):
+        now = time.time()
+        if now - self.last_write < self.interval:
+            return
+        self.last_write = now
+
+        record = dict(it=int(iteration), dlogz=self.compact(dlogz), logz=self.compact(logz),
+                      eff=self.compact(acceptance), t=round(now - self.start, 1))
+        with open(self.path, 'a') as progress_file:
+            progress_file.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def dynesty_print_func(self, results, niter, ncall, *args, **kwargs):
+        # results carry logz at index 6, and the sampling efficiency and remaining dlogz as the last two items
+        self.write(niter, dlogz=results[-1], logz=results[6], acceptance=results[-2])
+
+    def nestle_callback(self, info):
+        self.write(info['it'], logz=info['logz'])
+
+
+def get_progress_kwargs(sampler, progress):
+    """ Hooks the progress writer in to the samplers that report their progress """
+    if sampler['type'] == 'dynesty':
+        return dict(print_func=progress.dynesty_print_func)
+    elif sampler['type'] == 'nestle':
+        # bilby replaces the callback with its own printing unless verbose is off
+        return dict(callback=progress.nestle_callback, verbose=False)
+    return dict()
+
+
+def get_warm_start_kwargs(sampler, warm_start, priors):
+    """ Starts the emcee walkers from the posterior samples of the parent job """
+    # nested samplers have to start from the prior, they only benefit from the narrowed priors
+    samples = (warm_start or dict()).get('samples')
+    if sampler['type'] != 'emcee' or not samples:
+        return dict()
+
+    # the UI sets the number of walkers of a warm started job, the positions have to match the walkers emcee runs
+    number_of_walkers = get_sampler_kwargs(sampler).get('nwalkers')
+    if not number_of_walkers:
+        return dict()
+
+    # every walker starts from a whole parent sample, so that the correlations between the parameters are kept
+    indices = np.random.randint(len(next(iter(samples.values()))), size=number_of_walkers)
+
+    # one position per walker, in the order bilby samples the parameters
+    positions = []
+    for key in priors:
+        prior = priors[key]
+        if not isinstance(prior, bilby.core.prior.Prior) or isinstance(prior, bilby.core.prior.DeltaFunction):
+            continue
+        if key in samples:
+            positions.append(np.clip(np.asarray(samples[key])[indices], prior.minimum, prior.maximum))
+        else:
+            positions.append(prior.sample(number_of_walkers))
+
+    return dict(pos0=np.array(positions).T)
+
+
+def finite_or_none(value):
+    """ Converts a number for json, which has no representation for nan and infinity """
+    if value is None or not math.isfinite(value):
+        return None
+    return float(value)
+
+
+def get_posterior(result):
+    """ Numeric posterior parameters, including the derived parameters the UI searches results on """
+    posterior = result.posterior.select_dtypes(include=[np.number])
+    posterior = posterior.drop(columns=[c for c in ['log_likelihood', 'log_prior'] if c in posterior.columns])
+
+    if 'chirp_mass' not in posterior.columns and 'mass_1' in posterior.columns and 'mass_2' in posterior.columns:
+        posterior = posterior.assign(chirp_mass=bilby.gw.conversion.component_masses_to_chirp_mass(
+            posterior['mass_1'], posterior['mass_2']))
+
+    return posterior
+
+
+def write_summary(result, path, runtime):
+    """ Writes a small json summary of the posterior so the UI does not need the full result """
+    posterior = get_posterior(result)
+    samples = posterior.values
+
+    # every parameter in a single pass over the samples
+    tail = 100 * (1 - SUMMARY_CREDIBLE_LEVEL) / 2
+    lower, median, upper = np.percentile(samples, [tail, 50, 100 - tail], axis=0)
+    mean = samples.mean(axis=0)
+    std = samples.std(axis=0)
+
+    parameters = dict()
+    for index, name in enumerate(posterior.columns):
+        parameters[name] = dict(median=finite_or_none(median[index]), lower=finite_or_none(lower[index]),
+                                upper=finite_or_none(upper[index]), mean=finite_or_none(mean[index]),
+                                std=finite_or_none(std[index]))
+
+    summary = dict(
+        parameters=parameters,
+        credible_level=SUMMARY_CREDIBLE_LEVEL,
+        log_evidence=finite_or_none(getattr(result, 'log_evidence', None)),
+        log_evidence_err=finite_or_none(getattr(result, 'log_evidence_err', None)),
+        log_bayes_factor=finite_or_none(getattr(result, 'log_bayes_factor', None)),
+        number_of_samples=len(samples),
+        runtime=round(runtime, 1),
+    )
+    with open(path, 'w') as summary_file:
+        json.dump(summary, summary_file)
+
+
+def write_samples(result, path, maximum=MAXIMUM_EXPORTED_SAMPLES):
+    """ Exports the posterior samples as one float32 column per parameter for the UI to plot """
+    posterior = get_posterior(result)
+
+    # the posterior samples are independent, so evenly spaced samples are a fair thinning
+    if len(posterior) > maximum:
+        posterior = posterior.iloc[np.linspace(0, len(posterior) - 1, maximum).astype(int)]
+
+    np.savez_compressed(path, **{name: posterior[name].values.astype(np.float32) for name in posterior.columns})
+
+
+def get_data_cache_key(detectors, duration, sampling_frequency, injection_parameters, waveform_arguments, seed):
+    """ Hash of everything the simulated data depends on """
+    settings = dict(detectors=sorted(detectors), duration=duration, sampling_frequency=sampling_frequency,
+                    injection_parameters=injection_parameters, waveform_arguments=waveform_arguments, seed=seed,
+                    bilby_version=bilby.__version__)
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def load_cached_data(key, detectors):
+    """ Loads the memory mapped strain and PSDs of a cached data set, None if it is not cached """
+    directory = os.path.join(DATA_CACHE_DIRECTORY, key)
+    if not os.path.isdir(directory):
+        return None
+
+    # the modification time of the directory orders the data sets for the LRU cleanup
+    os.utime(directory)
+
+    data = dict()
+    for det in detectors:
+        data[det] = {name: np.load(os.path.join(directory, '{}_{}.npy'.format(det, name)), mmap_mode='r')
+                     for name in ['strain', 'psd_frequencies', 'psd']}
+    with open(os.path.join(directory, 'start_time.json'), 'r') as start_time_file:
+        data['start_time'] = json.load(start_time_file)
+
+    return data
+
+
+def store_cached_data(key, interferometers):
+    """ Stores the strain and PSDs of generated interferometers and removes the least recently used data sets """
+    try:
+        os.makedirs(DATA_CACHE_DIRECTORY, exist_ok=True)
+
+        # written to a temporary directory first, so that another job never loads a partially written data set
+        temporary_directory = tempfile.mkdtemp(prefix='.', dir=DATA_CACHE_DIRECTORY)
+        for ifo in interferometers:
+            np.save(os.path.join(temporary_directory, '{}_strain.npy'.format(ifo.name)),
+                    ifo.strain_data.frequency_domain_strain)
+            np.save(os.path.join(temporary_directory, '{}_psd_frequencies.npy'.format(ifo.name)),
+                    ifo.power_spectral_density.frequency_array)
+            np.save(os.path.join(temporary_directory, '{}_psd.npy'.format(ifo.name)),
+                    ifo.power_spectral_density.psd_array)
+        with open(os.path.join(temporary_directory, 'start_time.json'), 'w') as start_time_file:
+            json.dump(interferometers[0].strain_data.start_time, start_time_file)
+
+        try:
+            os.rename(temporary_directory, os.path.join(DATA_CACHE_DIRECTORY, key))
+        except OSError:
+            # another job has stored the same data set in the meantime
+            shutil.rmtree(temporary_directory)
+
+        # hidden directories are being written by other jobs
+        entries = [os.path.join(DATA_CACHE_DIRECTORY, entry) for entry in os.listdir(DATA_CACHE_DIRECTORY)
+                   if not entry.startswith('.')]
+        entries = sorted((entry for entry in entries if os.path.isdir(entry)), key=os.path.getmtime)
+        for entry in entries[:-DATA_CACHE_SIZE]:
+            shutil.rmtree(entry, ignore_errors=True)
+    except OSError as e:
+        # the cache only saves time, the job does not depend on it
+        print('Unable to cache the simulated data: {}'.format(e))
+
+
+def set_injection_meta_data(ifo, signal, injection_parameters):
+    """ Records the SNRs of the injection in the meta data of an interferometer, as injecting the signal does """
+    ifo.meta_data['optimal_SNR'] = np.sqrt(ifo.optimal_snr_squared(signal=signal).real)
+    ifo.meta_data['matched_filter_SNR'] = ifo.matched_filter_snr(signal=signal)
+    ifo.meta_data['parameters'] = injection_parameters
+
+
+def get_interferometers_from_cache(data, detectors, injection_polarizations, injection_parameters, duration,
+                                   sampling_frequency, outdir):
+    """ Builds the interferometers from a cached data set, with the same outputs as generating them """
+    interferometers = []
+    for det in detectors:
+        ifo = bilby.gw.detector.get_empty_interferometer(det)
+        ifo.power_spectral_density = bilby.gw.detector.PowerSpectralDensity(
+            frequency_array=np.array(data[det]['psd_frequencies']), psd_array=np.array(data[det]['psd']))
+        ifo.set_strain_data_from_frequency_domain_strain(
+            np.array(data[det]['strain']), sampling_frequency=sampling_frequency, duration=duration,
+            start_time=data['start_time'])
+
+        # the injection is already in the cached strain, only its response is needed for the meta data and the plots
+        detector_response = ifo.get_detector_response(injection_polarizations, injection_parameters)
+        set_injection_meta_data(ifo, detector_response, injection_parameters)
+        ifo.plot_data(signal=detector_response, outdir=outdir)
+        ifo.save_data(outdir)
+        interferometers.append(ifo)
+
+    return interferometers
+
+
+def run_job_sampler(sampler, likelihood, priors, injection_parameters, warm_start, outdir, label):
+    """ Runs a sampler of the job and writes the outputs the UI reads in to the output directory """
+    # forked samplers would otherwise share the same random state
+    np.random.seed()
+
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+
+    sampler_kwargs = get_sampler_kwargs(sampler)
+    sampler_kwargs.update(get_progress_kwargs(sampler, ProgressWriter(os.path.join(outdir, 'progress.txt'))))
+    sampler_kwargs.update(get_warm_start_kwargs(sampler, warm_start, priors))
+
+    start_time = time.time()
+
+    result = bilby.run_sampler(
+        likelihood=likelihood, priors=priors,
+        injection_parameters=injection_parameters, outdir=outdir, label=label,
+        sampler=sampler['type'], **sampler_kwargs)
+
+    write_summary(result, os.path.join(outdir, 'summary.json'), time.time() - start_time)
+    write_samples(result, os.path.join(outdir, 'posterior_samples.npz'))
+
+    result.plot_corner()
+
+
 with open(sys.argv[1], 'r') as file:
     job = json.load(file)
 
@@ -32,10 +337,13 @@ injection_parameters = dict(
     phi_12=1.7, phi_jl=0.3, luminosity_distance=2000., iota=0.4, psi=2.659,
     phase=1.3, geocent_time=1126259642.413, ra=1.375, dec=-1.2108)
 
+# The waveform approximant is not an injection parameter, older jobs do not specify one
+waveform_approximant = job['signal'].pop('waveform_approximant', 'IMRPhenomPv2')
+
 # Overwrite the defaults with those from the job (eventually should just use the input)
 injection_parameters.update(job['signal'])
 
-waveform_arguments = dict(waveform_approximant='IMRPhenomPv2',
+waveform_arguments = dict(waveform_approximant=waveform_approximant,
                           reference_frequency=50.)
 
 waveform_generator = bilby.gw.WaveformGenerator(
@@ -44,15 +352,37 @@ waveform_generator = bilby.gw.WaveformGenerator(
     parameters=injection_parameters, waveform_arguments=waveform_arguments)
 hf_signal = waveform_generator.frequency_domain_strain()
 
-IFOs = []
 detector_map = dict(hanford='H1', livingston='L1', virgo='V1')
-for name in eval(job['data']['detector_choice']):
-    det = detector_map[name]
-    IFOs.append(
-        bilby.gw.detector.get_interferometer_with_fake_noise_and_injection(
-            det, injection_polarizations=hf_signal,
-            injection_parameters=injection_parameters, duration=duration,
-            sampling_frequency=sampling_frequency, outdir=outdir))
+detectors = [detector_map[name] for name in eval(job['data']['detector_choice'])]
+
+# only a job that asks for a seed gets the same noise realisation as the other jobs with the same data settings, so
+# only its data set is shared in the cache, every other job gets a noise realisation of its own
+seed = job['data'].get('random_seed')
+data_cache_key = None
+cached_data = None
+if seed is not None:
+    data_cache_key = get_data_cache_key(detectors, duration, sampling_frequency, injection_parameters,
+                                        waveform_arguments, seed)
+    cached_data = load_cached_data(data_cache_key, detectors)
+
+if cached_data:
+    IFOs = get_interferometers_from_cache(cached_data, detectors, hf_signal, injection_parameters, duration,
+                                          sampling_frequency, outdir)
+else:
+    if seed is not None:
+        np.random.seed(int(seed))
+    IFOs = []
+    for det in detectors:
+        IFOs.append(
+            bilby.gw.detector.get_interferometer_with_fake_noise_and_injection(
+                det, injection_polarizations=hf_signal,
+                injection_parameters=injection_parameters, duration=duration,
+                sampling_frequency=sampling_frequency, outdir=outdir))
+    if data_cache_key:
+        store_cached_data(data_cache_key, IFOs)
+
+        # the sampler should not depend on the data seed
+        np.random.seed()
 
 # Set up some default priors
 priors = bilby.gw.prior.BBHPriorSet()
@@ -66,15 +396,62 @@ for key in ['a_1', 'a_2', 'tilt_1', 'tilt_2', 'phi_12', 'phi_jl']:
 for key in job['priors']:
     priors[key] = create_prior(key, job['priors'][key])
 
-likelihood = bilby.gw.GravitationalWaveTransient(
-    interferometers=IFOs, waveform_generator=waveform_generator,
-    time_marginalization=False, phase_marginalization=False,
-    distance_marginalization=False, prior=priors)
+# Use the ROQ likelihood if the UI found a suitable basis and it exists on this cluster,
+# otherwise fall back to the standard likelihood
+likelihood_settings = job.get('likelihood', dict(type='standard'))
+roq_directory = None
+if likelihood_settings['type'] == 'roq':
+    roq_directory = os.path.join(ROQ_BASIS_DIRECTORY, likelihood_settings['roq_basis'])
+    if not os.path.isdir(roq_directory):
+        print('ROQ basis {} not found, using the standard likelihood'.format(roq_directory))
+        roq_directory = None
+
+if roq_directory:
+    frequency_nodes_linear = np.load(os.path.join(roq_directory, 'fnodes_linear.npy'))
+    frequency_nodes_quadratic = np.load(os.path.join(roq_directory, 'fnodes_quadratic.npy'))
+    basis_matrix_linear = np.load(os.path.join(roq_directory, 'B_linear.npy')).T
+    basis_matrix_quadratic = np.load(os.path.join(roq_directory, 'B_quadratic.npy')).T
+
+    search_waveform_generator = bilby.gw.WaveformGenerator(
+        duration=duration, sampling_frequency=sampling_frequency,
+        frequency_domain_source_model=bilby.gw.source.roq,
+        waveform_arguments=dict(frequency_nodes_linear=frequency_nodes_linear,
+                                frequency_nodes_quadratic=frequency_nodes_quadratic,
+                                reference_frequency=20., minimum_frequency=20.,
+                                approximant=waveform_approximant),
+        parameter_conversion=bilby.gw.conversion.convert_to_lal_binary_black_hole_parameters)
+
+    likelihood = bilby.gw.likelihood.ROQGravitationalWaveTransient(
+        interferometers=IFOs, waveform_generator=search_waveform_generator,
+        linear_matrix=basis_matrix_linear, quadratic_matrix=basis_matrix_quadratic,
+        prior=priors)
+else:
+    likelihood = bilby.gw.GravitationalWaveTransient(
+        interferometers=IFOs, waveform_generator=waveform_generator,
+        time_marginalization=False, phase_marginalization=False,
+        distance_marginalization=False, prior=priors)
+
+# A job can run several samplers on the same likelihood, the first one is the sampler of a single sampler job
+samplers = job.get('samplers', [job['sampler']])
+
+if len(samplers) == 1:
+    run_job_sampler(samplers[0], likelihood, priors, injection_parameters, job.get('warm_start'), outdir, label)
+else:
+    # every sampler runs on its own core, the data and likelihood are built once and shared with the forked processes
+    processes = []
+    for index, sampler in enumerate(samplers):
+        sampler_outdir = outdir if index == 0 else os.path.join(outdir, sampler['type'])
+        process = multiprocessing.Process(
+            target=run_job_sampler,
+            args=(sampler, likelihood, priors, injection_parameters, job.get('warm_start'), sampler_outdir, label))
+        process.start()
+        processes.append(process)
+
+    # the scheduler only signals this process, forwarded so that every sampler writes its checkpoint
+    signal.signal(signal.SIGTERM, lambda signum, frame: [process.terminate() for process in processes])
 
-result = bilby.run_sampler(
-    likelihood=likelihood, priors=priors,
-    injection_parameters=injection_parameters, outdir=outdir, label=label,
-    sampler=job['sampler']['type'],
-    npoints=int(float(job['sampler']['number_of_live_points'])))
+    for process in processes:
+        process.join()
 
-result.plot_corner()
+    if any(process.exitcode != 0 for process in processes):
+        sys.exit(1)
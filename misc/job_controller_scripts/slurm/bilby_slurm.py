@@ -1,10 +1,17 @@
+import fcntl
 import json
 import os
+import re
 import shutil
+import subprocess
 import uuid
 
 from scheduler.slurm import Slurm
 
+# Seconds a task of a job array waits for its job to be registered before giving up, a job registering later runs on
+# its own
+ARRAY_TASK_WAIT = 60 * 10
+
 
 class Bilby(Slurm):
     def __init__(self, settings, ui_id, job_id):
@@ -20,10 +27,14 @@ class Bilby(Slurm):
 
         # Set the slurm template
         self.slurm_template = 'settings/bilby_slurm.sh'
+        # Set the slurm template of the job arrays
+        self.slurm_array_template = 'settings/bilby_slurm_array.sh'
         # Set the number of nodes
         self.nodes = 1
         # Set the number of tasks per node
         self.tasks_per_node = 1
+        # Set the number of cpus of the task, one per sampler of the job
+        self.cpus_per_task = 1
         # Set the amount of ram in Mb per cpu
         self.memory = 4096  # 4Gb
         # Set the walltime in seconds
@@ -49,6 +60,7 @@ class Bilby(Slurm):
         # Add our custom parameters
         params['job_parameter_file'] = self.job_parameter_file
         params['job_output_directory'] = self.job_output_directory
+        params['cpus_per_task'] = self.cpus_per_task
 
         # Return the updated params
         return params
@@ -65,8 +77,115 @@ class Bilby(Slurm):
         job_parameters = json.loads(job_parameters)
         job_parameters['name'] = 'bilby'
 
+        # A resumed job continues from the checkpoint in the same working directory with a longer walltime
+        if 'resume' in job_parameters:
+            self.walltime = job_parameters['resume']['walltime']
+
+        # A job running several samplers runs them at the same time, each on its own cpu
+        self.cpus_per_task = len(job_parameters.get('samplers', [job_parameters.get('sampler')]))
+
+        # The jobs released together by a campaign run as the tasks of one job array
+        array = job_parameters.pop('array', None)
+
         # Write the job parameters to a file
         json.dump(job_parameters, open(self.job_parameter_file, 'w'))
 
+        if array:
+            array_job_id = self.submit_array_task(array)
+            if array_job_id:
+                return array_job_id
+
         # Run the job
-        return super().submit(job_parameters)
\ No newline at end of file
+        return super().submit(job_parameters)
+
+    def get_array_directory(self, key):
+        """
+        Finds the directory of a job array, shared by the jobs of the array
+
+        :param key: The key of the array, unique to the jobs released together
+        :return: The path of the directory
+        """
+        return os.path.join(os.path.dirname(os.path.normpath(self.get_working_directory())), 'arrays', key)
+
+    def submit_array(self, array_directory, size):
+        """
+        Submits a job array with a task for each job of the array, the jobs are registered with the tasks afterwards
+
+        :param array_directory: The directory of the array
+        :param size: The number of tasks
+        :return: The slurm id of the array, None if it could not be submitted
+        """
+        # The resources of the array are those of its first job, the jobs of an array have the same resource shape
+        params = self.generate_template_dict()
+        params['array_directory'] = array_directory
+        params['last_task_index'] = size - 1
+        params['task_wait_polls'] = ARRAY_TASK_WAIT // 10
+
+        script = os.path.join(array_directory, 'bilby_array.sh')
+        with open(self.slurm_array_template) as template, open(script, 'w') as file:
+            file.write(template.read() % params)
+
+        result = subprocess.run(['sbatch', script], cwd=array_directory, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, universal_newlines=True)
+
+        match = re.search(r'Submitted batch job (\d+)', result.stdout)
+        return match.group(1) if match else None
+
+    def submit_array_task(self, array):
+        """
+        Runs the job as a task of a job array. The first job of the array to be submitted submits the whole array,
+        every job then registers its working directory with the task of its index.
+
+        :param array: The key, size and index of the array
+        :return: The slurm id of the task (<array id>_<index>), None if the array could not be submitted or the task
+                 has stopped waiting for the job
+        """
+        array_directory = self.get_array_directory(array['key'])
+        tasks_directory = os.path.join(array_directory, 'tasks')
+        os.makedirs(tasks_directory, exist_ok=True)
+
+        # The jobs of an array are submitted concurrently, only one of them submits the array
+        with open(os.path.join(array_directory, 'lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            array_id_file = os.path.join(array_directory, 'array_id')
+            if os.path.exists(array_id_file):
+                with open(array_id_file) as file:
+                    array_job_id = file.read().strip()
+            else:
+                array_job_id = self.submit_array(array_directory, array['size'])
+                if not array_job_id:
+                    # The job falls back to running on its own, so the task of its index exits straight away if
+                    # another job of the array submits the array later
+                    self.register_task(tasks_directory, array['index'], '')
+                    return None
+
+                with open(array_id_file, 'w') as file:
+                    file.write(array_job_id)
+
+            # A job whose submission was retried for longer than the task waits runs on its own, the task marks itself
+            # gone under the same lock, so it either sees the registration or the job sees the marker
+            if os.path.exists(os.path.join(tasks_directory, '{}.gone'.format(array['index']))):
+                return None
+
+            self.register_task(tasks_directory, array['index'],
+                               '{} {}\n'.format(self.get_working_directory(), self.ui_id))
+
+        # Slurm accepts the id of a task wherever a job id is expected, so the status of every job is still reported
+        # and it can be cancelled on its own
+        return '{}_{}'.format(array_job_id, array['index'])
+
+    def register_task(self, tasks_directory, index, registration):
+        """
+        Registers a job with the task of its index in a job array
+
+        :param tasks_directory: The directory of the registrations of the array
+        :param index: The index of the task
+        :param registration: The working directory and the UI id of the job, empty if the task runs no job
+        :return: Nothing
+        """
+        # Written to a temporary file and renamed, so that a task never reads a partially written registration
+        task_file = os.path.join(tasks_directory, str(index))
+        with open(task_file + '.tmp', 'w') as file:
+            file.write(registration)
+        os.rename(task_file + '.tmp', task_file)
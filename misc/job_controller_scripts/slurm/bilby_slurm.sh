@@ -3,9 +3,12 @@
 #SBATCH -e slurm-%%j.err
 #SBATCH --nodes=%(nodes)d
 #SBATCH --ntasks-per-node=%(tasks_per_node)d
+#SBATCH --cpus-per-task=%(cpus_per_task)d
 #SBATCH --mem-per-cpu=%(mem)dM
 #SBATCH --time=%(wt_hours)02d:%(wt_minutes)02d:%(wt_seconds)02d
 #SBATCH --job-name=%(job_name)s
+# Ask slurm to signal the batch script 5 minutes before the walltime so a final checkpoint can be written
+#SBATCH --signal=B:USR1@300
 
 # Source the bilby environment
 . /fred/oz006/bilby/bin/environment
@@ -14,7 +17,12 @@
 mkdir -p %(job_output_directory)s
 
 # Start bilby with the specified parameter file and output location
-python /fred/oz006/bilby/bin/json_interface.py %(job_parameter_file)s %(job_output_directory)s
+# bilby runs in the background so that the pre-timeout signal can be forwarded to it, bilby writes a checkpoint
+# on SIGTERM which is used when the job is resumed
+python /fred/oz006/bilby/bin/json_interface.py %(job_parameter_file)s %(job_output_directory)s &
+BILBY_PID=$!
+trap 'kill -TERM $BILBY_PID; wait $BILBY_PID' USR1
+wait $BILBY_PID
 
 # Finally tar up all output in to one file
 tar cf bilby_job_%(ui_job_id)d.tar.gz *
\ No newline at end of file
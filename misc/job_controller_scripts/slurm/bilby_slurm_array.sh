@@ -0,0 +1,50 @@
+#!/bin/bash
+#SBATCH -o %(array_directory)s/slurm-%%A_%%a.out
+#SBATCH -e %(array_directory)s/slurm-%%A_%%a.err
+#SBATCH --nodes=%(nodes)d
+#SBATCH --ntasks-per-node=%(tasks_per_node)d
+#SBATCH --cpus-per-task=%(cpus_per_task)d
+#SBATCH --mem-per-cpu=%(mem)dM
+#SBATCH --time=%(wt_hours)02d:%(wt_minutes)02d:%(wt_seconds)02d
+#SBATCH --job-name=%(job_name)s
+#SBATCH --array=0-%(last_task_index)d
+# Ask slurm to signal the batch script 5 minutes before the walltime so a final checkpoint can be written
+#SBATCH --signal=B:USR1@300
+
+# Source the bilby environment
+. /fred/oz006/bilby/bin/environment
+
+# Every task of the array runs the job registered under its index. The jobs are registered one after the other once
+# the array is submitted, so a task that starts before its job is registered waits for it
+TASK_FILE=%(array_directory)s/tasks/${SLURM_ARRAY_TASK_ID}
+for i in $(seq %(task_wait_polls)d); do
+    [ -f ${TASK_FILE} ] && break
+    sleep 10
+done
+
+# A task that gives up marks itself gone under the lock of the array, so that a job registering later, after a
+# retried submission, runs on its own instead of waiting for a task that has already exited
+if [ ! -f ${TASK_FILE} ]; then
+    exec 9>%(array_directory)s/lock
+    flock -x 9
+    [ -f ${TASK_FILE} ] || { touch ${TASK_FILE}.gone; exit 1; }
+    flock -u 9
+fi
+
+# An empty registration is left by a job that runs on its own, as the array could not be submitted when it was
+[ -s ${TASK_FILE} ] || exit 0
+
+read WORKING_DIRECTORY UI_JOB_ID < ${TASK_FILE}
+cd ${WORKING_DIRECTORY}
+
+# Make sure the output directory exists
+mkdir -p output
+
+# Start bilby with the parameter file and output location of the job, see bilby_slurm.sh
+python /fred/oz006/bilby/bin/json_interface.py json_params.json output &
+BILBY_PID=$!
+trap 'kill -TERM $BILBY_PID; wait $BILBY_PID' USR1
+wait $BILBY_PID
+
+# Finally tar up all output in to one file
+tar cf bilby_job_${UI_JOB_ID}.tar.gz *